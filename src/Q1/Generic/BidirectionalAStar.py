@@ -0,0 +1,223 @@
+"""
+BidirectionalAStar.py
+========================
+This module contains the BidirectionalAStar class which runs an A* search
+forwards from the initial board and backwards from the goal at the same time.
+"""
+
+import heapq
+from itertools import count
+
+from Board import Board
+from HeuristicFunc import HeuristicFunc
+from LinearConflict import LinearConflict
+from PatternDatabase import PatternDatabase
+from DistanceTable import DistanceTable
+from Puzzel import Puzzel
+from SearchStats import SearchStats
+
+class BidirectionalAStar(Puzzel):
+    """
+    This class runs a front to end bidirectional A* algorithm to complete the
+    puzzel. One search runs forwards from the initial board using the heuristic
+    towards the goal and the other runs backwards from the goal using a heuristic
+    towards the initial board. Both searches share one table of states, so when
+    a search reaches a state the other has already reached the two halves make
+    a path. The search stops once no path through either open list can be
+    shorter than the best path found, so the path is only optimal if neither
+    heuristic overestimates.
+
+    The searches work on packed states rather than Board objects, and
+    the solution is returned as a move string.
+    """
+
+    """
+    The index of the forward search in the lists used by both searches.
+    """
+    forward = 0
+
+    """
+    The index of the backward search in the lists used by both searches.
+    """
+    backward = 1
+
+    """
+    The heuristic function used by the backward search, which
+    estimates the distance to the initial board.
+    """
+    backwardHeuristic = None
+
+    """
+    The table shared by both searches. It maps each state reached to
+    [forward level, backward level, forward parent, backward parent, empty tile position]
+    where a level and parent are None if that search has not reached the state.
+    """
+    table = {}
+
+    def __init__(self, board : Board, heuristic : HeuristicFunc, stats : SearchStats = None, backwardHeuristic : HeuristicFunc = None) -> None:
+        """
+        This is the initaliser for the BidirectionalAStar. If no backward heuristic
+        is given then one of the same class as the forward heuristic is made with
+        the initial board as its goal. Pattern databases and distance tables are
+        built and cached on disk for each goal, so for those a LinearConflict is
+        used instead, rather than building new tables for every initial board.
+
+        :param board: The starting board (state).
+        :type board: Board
+        :param heuristic: The heuristic function used by the forward search.
+        :type heuristic: HeuristicFunc
+        :param stats: The stats to record the search in, if any.
+        :type stats: SearchStats
+        :param backwardHeuristic: The heuristic function used by the backward search.
+        :type backwardHeuristic: HeuristicFunc
+        """
+        super().__init__(board, heuristic, stats)
+        if backwardHeuristic == None:
+            if isinstance(heuristic, (PatternDatabase, DistanceTable)):
+                backwardHeuristic = LinearConflict(board.board)
+            else:
+                backwardHeuristic = type(heuristic)(board.board)
+        self.backwardHeuristic = backwardHeuristic
+        self.table = {}
+
+    def dropStale(self, open : list, direction : int) -> None:
+        """
+        This function pops entries off the top of an open heap which are out of
+        date, because a shorter path to their state has since been found.
+
+        :param open: The open heap of the search.
+        :type open: list
+        :param direction: The index of the search.
+        :type direction: int
+        """
+        while open and open[0][1] != self.table[open[0][3]][direction]:
+            heapq.heappop(open)
+            if self.stats != None:
+                self.stats.stale += 1
+
+    def getPath(self, meet : int) -> list:
+        """
+        This function joins the two half paths which meet at a state into the
+        list of states from the initial board to the goal.
+
+        :param meet: The state the two searches met at.
+        :type meet: int
+
+        :return : The states from the initial board to the goal.
+        :rtype: list
+        """
+        path = []
+        state = meet
+        while state != None:
+            path.append(state)
+            state = self.table[state][2 + self.forward]
+        path.reverse()
+
+        state = self.table[meet][2 + self.backward]
+        while state != None:
+            path.append(state)
+            state = self.table[state][2 + self.backward]
+
+        return path
+
+    def solve(self) -> str:
+        """
+        This function carries out the bidirectional A* search and solves
+        the board to reach the end goal.
+
+        :return : The moves of the empty tile (U, D, L or R) to reach the goal, or None if it can not be reached.
+        :rtype: str
+        """
+        layout = self.initial.layout
+        goalState, goalBlank = layout.pack(self.initial.goal)
+
+        if self.initial.state == goalState:
+            return ""
+
+        heuristics = [self.heuristic, self.backwardHeuristic]
+        opens = [[], []]
+        order = count()
+
+        # a scratch board the heuristics are given, so no board is made per state.
+        scratch = Board(self.initial.board, 0, self.initial.goal)
+
+        self.table = {
+            self.initial.state: [0, None, None, None, self.initial.blank],
+            goalState: [None, 0, None, None, goalBlank]
+        }
+
+        for direction, state, blank in [(self.forward, self.initial.state, self.initial.blank), (self.backward, goalState, goalBlank)]:
+            scratch.state, scratch.blank = state, blank
+            hScore = heuristics[direction].calculateHScore(scratch)
+            heapq.heappush(opens[direction], (hScore, 0, next(order), state))
+
+        bestLength = None
+        meet = None
+
+        if self.stats != None:
+            self.stats.start()
+            self.stats.iterations += 1
+
+        while True:
+            self.dropStale(opens[self.forward], self.forward)
+            self.dropStale(opens[self.backward], self.backward)
+
+            if not opens[self.forward] or not opens[self.backward]:
+                break
+
+            if bestLength != None and bestLength <= max(opens[self.forward][0][0], opens[self.backward][0][0]):
+                break
+
+            # expand the search with the smaller open list.
+            if len(opens[self.forward]) <= len(opens[self.backward]):
+                direction = self.forward
+            else:
+                direction = self.backward
+
+            score, level, _, state = heapq.heappop(opens[direction])
+            blank = self.table[state][4]
+            self.expanded += 1
+
+            scratch.state, scratch.blank = state, blank
+            scratch.hScore = score - level
+
+            if self.stats != None:
+                self.stats.expanded += 1
+                self.stats.generated += len(layout.neighbours[blank])
+                openSize = len(opens[self.forward]) + len(opens[self.backward])
+                if openSize > self.stats.peakOpen:
+                    self.stats.peakOpen = openSize
+
+            for move in layout.neighbours[blank]:
+                child = layout.move(state, blank, move)
+                childLevel = level + 1
+
+                childRecord = self.table.get(child)
+                if childRecord == None:
+                    childRecord = [None, None, None, None, move]
+                    self.table[child] = childRecord
+                elif childRecord[direction] != None and childRecord[direction] <= childLevel:
+                    if self.stats != None:
+                        self.stats.duplicates += 1
+                    continue
+
+                childRecord[direction] = childLevel
+                childRecord[2 + direction] = state
+
+                childHScore = scratch.hScore + heuristics[direction].delta(scratch, move)
+                heapq.heappush(opens[direction], (childLevel + childHScore, childLevel, next(order), child))
+
+                otherLevel = childRecord[1 - direction]
+                if otherLevel != None and (bestLength == None or childLevel + otherLevel < bestLength):
+                    bestLength = childLevel + otherLevel
+                    meet = child
+
+        if self.stats != None:
+            self.stats.stop()
+
+        if meet == None:
+            return None
+
+        path = self.getPath(meet)
+
+        return layout.getMoveString(self.initial.blank, [self.table[state][4] for state in path[1:]])
@@ -5,6 +5,8 @@ This module contains the class used to define a Board and
 all the operation which can be applied to a Board object.
 """
 
+from Layout import Layout
+
 class Board:
     """
     This class defines a board and 
@@ -13,9 +15,20 @@ class Board:
     """
 
     """
-    The actual data on the board.
+    The data on the board packed into a single integer,
+    see Layout.py for further details.
     """
-    board = []
+    state = 0
+
+    """
+    The position of the empty tile in the board.
+    """
+    blank = None
+
+    """
+    The layout (size and move tables) of the board.
+    """
+    layout = None
 
     """
     The data representation of the goal
@@ -24,6 +37,11 @@ class Board:
     """
     goal = []
 
+    """
+    The goal state packed into a single integer.
+    """
+    goalState = 0
+
     """
     The level (depth) of the board.
     """
@@ -34,11 +52,22 @@ class Board:
     """
     hValue = None
 
+    """
+    The heuristic score (not including the level) of the board.
+    """
+    hScore = None
+
     """
     The parent node (grid) of the child.
     """
     parent = None
 
+    """
+    The position the empty tile moved to from the
+    parent to reach this board.
+    """
+    move = None
+
     def __init__(self, board : list,level : int, goal : list, parent = None) -> None:
         """
         This function is the initaliser for the class
@@ -55,11 +84,21 @@ class Board:
         :return: Nothing is returned
         :rtype: None
         """
-        self.board = board
+        self.layout = Layout.get(len(board), len(board[0]))
+        self.state, self.blank = self.layout.pack(board)
         self.level = level
         self.goal = goal
+        self.goalState = self.layout.pack(goal)[0]
         self.parent = parent
 
+    @property
+    def board(self) -> list:
+        """
+        The data on the board as a list of rows, unpacked
+        from the packed state.
+        """
+        return self.layout.unpack(self.state)
+
     def isSolved(self) -> bool:
         """
         This method checks if the board has reached
@@ -68,10 +107,7 @@ class Board:
         :return : If the goal is reached.
         :rtype: bool
         """
-        solved = False
-        if self.board == self.goal:
-            solved = True
-        return solved
+        return self.state == self.goalState
 
     def getChildrenBoards(self) -> list:
         """
@@ -84,14 +120,8 @@ class Board:
         """
         children = []
 
-        x, y = self.find()
-
-        posMoves = [[x, y-1], [x, y+1], [x-1, y], [x+1, y]]
-
-        for move in posMoves:
-            childBoard = self.makeMoves(self.board, x, y, move[0], move[1])
-            if childBoard != None:
-                children.append(Board(childBoard, self.level+1, self.goal, self))
+        for move in self.layout.neighbours[self.blank]:
+            children.append(self.makeMove(move))
         
         return children
 
@@ -104,74 +134,102 @@ class Board:
         :return : The x and y coordinates.
         :rtype: tuple
         """
-        for row in self.board:
-            if "*" in row:
-                return row.index("*"), self.board.index(row)
+        return self.blank % self.layout.cols, self.blank // self.layout.cols
 
-    def makeMoves(self, puzzel : list, x : int, y : int, xToSwap : int, yToSwap : int) -> list:
+    def makeMove(self, move : int):
         """
-        This function carries out a move, and swaps te values in two coordinates
-        where one of those values is the empty tile (*).
+        This function carries out a move, swapping the empty tile
+        with the tile in the given position, and returns the resulting
+        child board. The child shares the layout and goal of this board
+        so only the packed state needs to be worked out.
 
-        :param puzzel: This is the data in the board.
-        :type puzzel: list
-        :param x: This is the x co-ordinate of the empty tile.
-        :type x: int
-        :param y: This is the y co-ordinate of the empty tile.
-        :type y: int
-        :param xToSwap: This is the x co-ordinate where the empty tile is moving to.
-        :type xToSwap: int
-        :param yToSwap: This is the y co-ordinate where the empty tile is moving to.
-        :type y: int
+        :param move: The position the empty tile is moving to.
+        :type move: int
 
         :return : The board after the move is made
-        :rtype: list
+        :rtype: Board
         """
-        #Check that the move fits into the board.
-        if xToSwap >= 0 and xToSwap <= 2 and yToSwap >= 0 and yToSwap <= 2:
-            tempBoard = []
-            tempBoard = self.copy(puzzel)
-            tempValue = tempBoard[yToSwap][xToSwap]
-            tempBoard[yToSwap][xToSwap] = tempBoard[y][x]
-            tempBoard[y][x] = tempValue
-        else:
-            tempBoard = None
+        child = Board.__new__(Board)
+        child.layout = self.layout
+        child.state = self.layout.move(self.state, self.blank, move)
+        child.blank = move
+        child.level = self.level + 1
+        child.goal = self.goal
+        child.goalState = self.goalState
+        child.parent = self
+        child.move = move
+        return child
 
-        return tempBoard
+    def moveBlank(self, move : int) -> None:
+        """
+        This function carries out a move on this board in place, rather
+        than making a child board. A move is undone by moving the empty
+        tile back to where it was.
 
-    def copy(self, puzzel : list) -> list:
+        :param move: The position the empty tile is moving to.
+        :type move: int
         """
-        This function copies the data from one list into
-        a new list which is returned.#
+        self.state = self.layout.move(self.state, self.blank, move)
+        self.blank = move
 
-        :param puzzel: This is the data to be copied.
-        :type puzzel: list
+    def getKey(self) -> int:
+        """
+        This function returns the packed state of the board, which
+        can be hashed and so used to store the board in a set or as
+        a key in a dict.
 
-        :return : The copy of the list.
-        :rtype: list
+        :return : The packed state of the board.
+        :rtype: int
         """
-        copy = []
-        for row in puzzel:
-            newRow = []
-            for item in row:
-                newRow.append(item)
-            copy.append(newRow)
-        return copy
+        return self.state
 
-    
     def getParents(self) -> list:
         """
-        This function recursively returns all the parent nodes
-        which have come before this current one. It is used to get
-        all the moves to reach the solved puzzle.
+        This function returns all the parent nodes which have come
+        before this current one, from the first board onwards. The
+        parents are followed in a loop rather than recursively, so
+        long paths do not hit the recursion limit.
         
         :return : The list of how to solve the board.
         :rtype: list
         """
-        if self.parent == None:
-            return []
-        else:
-            return self.parent.getParents() + [self.parent]
+        parents = []
+        board = self.parent
+        while board != None:
+            parents.append(board)
+            board = board.parent
+        parents.reverse()
+        return parents
+
+    def getMoves(self) -> str:
+        """
+        This function returns the moves made from the first board
+        to reach this one as a move string, read from the parents.
+
+        :return : The move string (one of U, D, L or R for each move).
+        :rtype: str
+        """
+        boards = self.getParents() + [self]
+        return self.layout.getMoveString(boards[0].blank, [board.blank for board in boards[1:]])
+
+    def replay(self, moves : str):
+        """
+        This generator makes the moves of a move string from this board,
+        yielding this board and then the board after each move. Boards are
+        only made as they are asked for, so a solution can be kept as its
+        move string and only turned into boards when it is shown.
+
+        :param moves: The move string.
+        :type moves: str
+
+        :return : This board and the board after each move.
+        :rtype: generator
+        """
+        board = self
+        yield board
+        for name in moves:
+            board = board.makeMove(self.layout.getPosition(board.blank, name))
+            yield board
 
     def toString(self) -> str:
         """
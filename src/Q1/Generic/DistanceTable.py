@@ -0,0 +1,183 @@
+"""
+DistanceTable.py
+=============================
+This module contains the code for a DistanceTable class which is a child
+of the HeuristicFunc class. It holds the exact distance to the goal (and
+the best next move) of every state of a small board, built once with a
+breadth first search and then cached on disk.
+"""
+
+import mmap
+import os
+from collections import deque
+
+from Board import Board
+from HeuristicFunc import HeuristicFunc
+
+
+class DistanceTable(HeuristicFunc):
+    """
+    This class defines a complete distance table for boards with at most
+    nine positions (such as 3x3). Every arrangement of the tiles is given
+    a rank (its position in the lexicographic order of all arrangements),
+    and the table holds one byte per rank: the number of moves to the goal
+    shifted left by two, plus the direction (see Layout.steps) the empty
+    tile moves in to get one move closer. As the distance is exact it is
+    also the best possible heuristic.
+    """
+
+    """
+    The largest number of positions a board may have, as the table
+    has one byte for each of the size! arrangements of the tiles.
+    """
+    maxSize = 9
+
+    """
+    The directory the tables are cached in.
+    """
+    cacheDir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+
+    """
+    The value used in the table for arrangements which can
+    not reach the goal.
+    """
+    unreached = 255
+
+    """
+    The table (a memory mapped file).
+    """
+    table = None
+
+    """
+    The factorial of (size - 1 - pos) for each position, which
+    is the weight of each position in a rank.
+    """
+    weights = []
+
+    def __init__(self, goal : list, cacheDir : str = None) -> None:
+        """
+        This is the initialiser for a DistanceTable and loads the table from the
+        cache, building and caching it if it has not been built before.
+
+        :param goal: The goal state.
+        :type goal: list
+        :param cacheDir: The directory the tables are cached in.
+        :type cacheDir: str
+        """
+        super().__init__(goal)
+
+        if self.layout.size > self.maxSize:
+            raise Exception(f"Error : A distance table can only be built for boards with at most {self.maxSize} positions.")
+
+        if cacheDir != None:
+            self.cacheDir = cacheDir
+
+        size = self.layout.size
+        self.weights = [1] * size
+        for pos in range(size - 2, -1, -1):
+            self.weights[pos] = self.weights[pos + 1] * (size - 1 - pos)
+
+        self.table = self.load()
+
+    def getRank(self, state : int) -> int:
+        """
+        This function returns the rank of a packed state, found from its
+        Lehmer code: the tile in each position is counted by how many of the
+        tiles smaller than it are still left to place.
+
+        :param state: The packed state.
+        :type state: int
+
+        :return : The rank of the state.
+        :rtype: int
+        """
+        layout = self.layout
+        rank = 0
+        seen = 0
+        for pos in range(layout.size):
+            tile = (state >> layout.shifts[pos]) & layout.mask
+            rank += (tile - (seen & ((1 << tile) - 1)).bit_count()) * self.weights[pos]
+            seen |= 1 << tile
+        return rank
+
+    def getCachePath(self) -> str:
+        """
+        This function returns the path of the cache file for the table.
+        The file name holds the board size and goal.
+
+        :return : The path of the cache file.
+        :rtype: str
+        """
+        goal = "-".join(str(self.layout.tileAt(self.layout.pack(self.goal)[0], pos)) for pos in range(self.layout.size))
+        return os.path.join(self.cacheDir, f"dist_{self.layout.rows}x{self.layout.cols}_{goal}.bin")
+
+    def load(self) -> mmap.mmap:
+        """
+        This function memory maps the table from its cache file, building the
+        table and writing the file first if it does not exist.
+
+        :return : The table.
+        :rtype: mmap.mmap
+        """
+        path = self.getCachePath()
+
+        if not os.path.exists(path):
+            table = self.build()
+            os.makedirs(self.cacheDir, exist_ok=True)
+            tempPath = f"{path}.{os.getpid()}.tmp"
+            with open(tempPath, "wb") as file:
+                file.write(table)
+            os.replace(tempPath, path)
+
+        with open(path, "rb") as file:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def build(self) -> bytearray:
+        """
+        This function builds the table using a backwards breadth first search from
+        the goal. When a state is first reached from a state one move closer to the
+        goal, the direction back to that state is its best next move.
+
+        :return : The table.
+        :rtype: bytearray
+        """
+        layout = self.layout
+        table = bytearray([self.unreached]) * self.weights[0] * layout.size
+
+        goalState, goalBlank = layout.pack(self.goal)
+        table[self.getRank(goalState)] = 0
+        queue = deque([(goalState, goalBlank, 0)])
+
+        while queue:
+            state, blank, distance = queue.popleft()
+            for pos in layout.neighbours[blank]:
+                child = layout.move(state, blank, pos)
+                rank = self.getRank(child)
+                if table[rank] == self.unreached:
+                    table[rank] = ((distance + 1) << 2) | layout.getDirection(pos, blank)
+                    queue.append((child, pos, distance + 1))
+
+        return table
+
+    def lookup(self, state : int) -> tuple:
+        """
+        This function returns the distance to the goal and best next move of a state.
+
+        :param state: The packed state.
+        :type state: int
+
+        :return : The number of moves to the goal and the direction the empty tile moves in next, or None if the goal can not be reached.
+        :rtype: tuple
+        """
+        value = self.table[self.getRank(state)]
+        if value == self.unreached:
+            return None
+        return value >> 2, value & 3
+
+    def calculateHScore(self, board : Board) -> int:
+        #Docstrings inherited from HeuristicFunc
+        #See HeuristicFunc.py for further details
+        value = self.table[self.getRank(board.state)]
+        if value == self.unreached:
+            return self.unreached
+        return value >> 2
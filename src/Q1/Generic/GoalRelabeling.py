@@ -0,0 +1,204 @@
+"""
+GoalRelabeling.py
+========================
+This module contains the GoalRelabeling class which renames the tiles of a
+puzzle so that any goal becomes one of a few canonical goals, so heuristic
+tables and solutions can be shared between every goal with the same shape.
+"""
+
+from Board import Board
+from Layout import Layout
+from HeuristicFunc import HeuristicFunc
+from SearchStats import SearchStats
+
+class GoalRelabeling:
+    """
+    This class renames the tiles of the initial and goal boards of a puzzle
+    so the goal has its tiles in order (1, 2, 3, ... left to right, top to
+    bottom), which does not change which moves solve the puzzle. The empty
+    tile can not be renamed, so there is one canonical goal for each position
+    of the empty tile (9 for 3x3 boards) rather than one for every goal.
+
+    Heuristics (and so their pattern databases and distance tables) are made
+    for the canonical goal and kept, so they are only built once for every
+    goal which shares it, and solutions are kept so the same puzzle is only
+    solved once.
+    """
+
+    """
+    The heuristics which have been made, keyed by the heuristic
+    class and the canonical goal. This is deliberately shared by
+    every GoalRelabeling in the process, as the key holds the goal.
+    """
+    heuristics = {}
+
+    """
+    The solutions which have been found, as move strings, along with the
+    stats of the search which found them (or None if none were recorded),
+    keyed by the solver class, heuristic class, canonical initial state
+    and canonical goal.
+    Like heuristics, this is deliberately shared by every GoalRelabeling
+    in the process.
+    """
+    results = {}
+
+    """
+    The largest number of solutions kept, after which the oldest is dropped.
+    """
+    maxResults = 10000
+
+    """
+    The goal the puzzle is trying to reach.
+    """
+    goal = None
+
+    """
+    The layout of the boards.
+    """
+    layout = None
+
+    """
+    The canonical goal, as a list of rows.
+    """
+    canonicalGoal = None
+
+    """
+    The canonical name of each tile, indexed by tile (0 for the empty tile).
+    """
+    toCanonical = []
+
+    """
+    The tile of each canonical name, indexed by canonical name.
+    """
+    fromCanonical = []
+
+    def __init__(self, goal : list) -> None:
+        """
+        This is the initialiser for a GoalRelabeling and works out the canonical
+        goal and the names of the tiles from the goal.
+
+        :param goal: The goal board / state.
+        :type goal: list
+        """
+        self.goal = goal
+        self.layout = Layout.get(len(goal), len(goal[0]))
+        goalState, goalBlank = self.layout.pack(goal)
+
+        self.canonicalGoal = self.getCanonicalGoal(self.layout, goalBlank)
+        canonicalState = self.layout.pack(self.canonicalGoal)[0]
+
+        self.toCanonical = [0] * self.layout.size
+        self.fromCanonical = [0] * self.layout.size
+        for pos in range(self.layout.size):
+            tile = self.layout.tileAt(goalState, pos)
+            name = self.layout.tileAt(canonicalState, pos)
+            self.toCanonical[tile] = name
+            self.fromCanonical[name] = tile
+
+    @staticmethod
+    def getCanonicalGoal(layout : Layout, blank : int) -> list:
+        """
+        This function returns the canonical goal for a position of the empty
+        tile, which has the tiles in order around it.
+
+        :param layout: The layout of the board.
+        :type layout: Layout
+        :param blank: The position of the empty tile.
+        :type blank: int
+
+        :return : The canonical goal as a list of rows.
+        :rtype: list
+        """
+        tiles = [str(tile) for tile in range(1, layout.size)]
+        tiles.insert(blank, "*")
+        return [tiles[row * layout.cols: (row + 1) * layout.cols] for row in range(layout.rows)]
+
+    def relabel(self, board : list) -> list:
+        """
+        This function renames the tiles of a board to their canonical names.
+
+        :param board: The board as a list of rows.
+        :type board: list
+
+        :return : The renamed board as a list of rows.
+        :rtype: list
+        """
+        return [["*" if item == "*" else str(self.toCanonical[int(item)]) for item in row] for row in board]
+
+    def getBoard(self, board : Board) -> Board:
+        """
+        This function returns the canonical version of a board, which has the
+        canonical goal.
+
+        :param board: The board to rename.
+        :type board: Board
+
+        :return : The renamed board.
+        :rtype: Board
+        """
+        return Board(self.relabel(board.board), board.level, self.canonicalGoal)
+
+    def getHeuristic(self, heuristicType : type) -> HeuristicFunc:
+        """
+        This function returns a heuristic for the canonical goal, making it the
+        first time it is asked for and reusing it after that.
+
+        :param heuristicType: The class of the heuristic.
+        :type heuristicType: type
+
+        :return : The heuristic.
+        :rtype: HeuristicFunc
+        """
+        key = (heuristicType, tuple(tuple(row) for row in self.canonicalGoal))
+        if key not in self.heuristics:
+            self.heuristics[key] = heuristicType(self.canonicalGoal)
+        return self.heuristics[key]
+
+    def solve(self, solverType : type, initial : Board, heuristicType : type, stats = None, options : dict = None) -> str:
+        """
+        This function solves a board on the canonical goal with the shared heuristic,
+        reusing the solution if the same canonical board has already been solved. The
+        moves of the empty tile are the same whatever the tiles are called, so the move
+        string solves the original board too. A reused solution adds the stats of the
+        search which found it to stats.
+
+        :param solverType: The class of the search algorithm.
+        :type solverType: type
+        :param initial: The initial board.
+        :type initial: Board
+        :param heuristicType: The class of the heuristic.
+        :type heuristicType: type
+        :param stats: The stats to record the search in, if any.
+        :type stats: SearchStats
+        :param options: Any other arguments for the search algorithm, such as the number of workers.
+        :type options: dict
+
+        :return : The moves of the empty tile (U, D, L or R) to reach the goal, or None if it can not be reached.
+        :rtype: str
+        """
+        board = self.getBoard(initial)
+        key = (solverType, heuristicType, board.state, board.goalState)
+
+        # a solution found without stats is solved again if stats are wanted.
+        if key in self.results and (stats == None or self.results[key][1] != None):
+            solution, searchStats = self.results[key]
+            if stats != None:
+                stats.add(searchStats)
+            return solution
+
+        searchStats = None
+        if stats != None:
+            searchStats = SearchStats(stats.timed)
+
+        try:
+            solution = solverType(board, self.getHeuristic(heuristicType), stats=searchStats, **(options or {})).solve()
+        finally:
+            # the stats of a search which was stopped (such as by a timeout) are still given back.
+            if stats != None:
+                stats.add(searchStats)
+
+        if key not in self.results and len(self.results) >= self.maxResults:
+            del self.results[next(iter(self.results))]
+        self.results[key] = (solution, searchStats)
+
+        return solution
@@ -7,6 +7,7 @@ by both the ManhattanDistance and MisplacedTiles classes.
 """
 
 from Board import Board
+from Layout import Layout
 
 
 class HeuristicFunc:
@@ -24,11 +25,24 @@ class HeuristicFunc:
     """
     goal = None
 
+    """
+    The layout of the goal board.
+    """
+    layout = None
+
+    """
+    The position of each tile in the goal, indexed
+    by tile (0 for the empty tile).
+    """
+    goalPositions = []
+
     def __init__(self, goal : list) -> None:
         """
         This is the initialiser for a heuristif function
         and sets the given goal to the goal attribute
-        of the object.
+        of the object. The position of every tile in the
+        goal is worked out once here so child classes can
+        build their lookup tables from it.
 
         :param goal: The goal state.
         :type goal: list
@@ -37,6 +51,11 @@ class HeuristicFunc:
         :rtype: None
         """
         self.goal = goal
+        self.layout = Layout.get(len(goal), len(goal[0]))
+        goalState = self.layout.pack(goal)[0]
+        self.goalPositions = [0] * self.layout.size
+        for pos in range(self.layout.size):
+            self.goalPositions[self.layout.tileAt(goalState, pos)] = pos
 
     def calculateHScore(self, board : Board) -> int:
         """
@@ -51,18 +70,48 @@ class HeuristicFunc:
         """
         pass
 
+    def delta(self, parent : Board, move : int) -> int:
+        """
+        This function calculates the change in the heuristic score
+        when the empty tile in the parent board moves to the given
+        position. By default both boards are scored in full, child
+        classes override this to work out the change from the one
+        tile which moved.
+
+        :param parent: The board the move is made from.
+        :type parent: Board
+        :param move: The position the empty tile is moving to.
+        :type move: int
+
+        :return: The heuristic score of the child minus that of the parent.
+        :rtype: int
+        """
+        parentScore = parent.hScore
+        if parentScore == None:
+            parentScore = self.calculateHScore(parent)
+        return self.calculateHScore(parent.makeMove(move)) - parentScore
+
     def calculate(self, board):
         """
         This function returns the sum of the heuristic score
         and the level (depth) the current board (state) is on.
 
+        If the parent of the board has already been scored, the
+        heuristic score is found from the parent's score using delta
+        rather than being calculated in full. The heuristic score is
+        stored on the board so its own children can do the same.
+
         :param board: The current board / state.
         :type goal: Board
 
         :return: The total heuristic score
         :rtype: int
         """
-        return self.calculateHScore(board) + self.calculateGScore(board)
+        if board.parent != None and board.parent.hScore != None:
+            board.hScore = board.parent.hScore + self.delta(board.parent, board.move)
+        else:
+            board.hScore = self.calculateHScore(board)
+        return board.hScore + self.calculateGScore(board)
 
     def calculateGScore(self, board : Board) -> int:
         """
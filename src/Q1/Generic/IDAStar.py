@@ -0,0 +1,136 @@
+"""
+IDAStar.py
+========================
+This module contains the IDAStar class which runs an iterative deepening
+A* search and finds the solution to the given Board and to reach the given goal.
+"""
+
+from Board import Board
+from Puzzel import Puzzel
+from SearchStats import SearchStats
+
+class IDAStar(Puzzel):
+    """
+    This class runs the iterative deepening A* (IDA*) algorithm to
+    complete the puzzel. Instead of keeping every board in open and
+    closed, it runs depth first searches which are cut off once the
+    heuristic score of a board goes above a bound, raising the bound
+    to the smallest score which was cut off after each search. Only
+    the moves on the current path are stored, so memory use stays
+    constant however many boards are searched.
+    """
+
+    """
+    The value returned by a search when the goal has been found.
+    """
+    found = -1
+
+    """
+    The single board which moves are made on and undone.
+    """
+    board = None
+
+    """
+    The positions the empty tile has moved to on the current path.
+    """
+    moves = []
+
+    def __init__(self, board : Board, heuristic, stats : SearchStats = None) -> None:
+        #Docstrings inherited from Puzzel
+        #See Puzzel.py for further details
+        super().__init__(board, heuristic, stats)
+        self.moves = []
+
+    def search(self, gScore : int, hScore : int, bound : int, previous : int) -> int:
+        """
+        This function carries out a depth first search from the current board,
+        making each move in place on the board and undoing it afterwards. Moves
+        which put the empty tile back where it just came from are skipped.
+
+        :param gScore: The number of moves made to reach the current board.
+        :type gScore: int
+        :param hScore: The heuristic score of the current board.
+        :type hScore: int
+        :param bound: The largest total score of a board which is searched.
+        :type bound: int
+        :param previous: The position the empty tile was in before the last move.
+        :type previous: int
+
+        :return : found if the goal was reached, else the smallest score over the bound.
+        :rtype: int
+        """
+        score = gScore + hScore
+        if score > bound:
+            return score
+
+        if self.board.isSolved():
+            return self.found
+
+        minScore = None
+        blank = self.board.blank
+        self.expanded += 1
+
+        if self.stats != None:
+            self.stats.expanded += 1
+            self.stats.generated += len(self.board.layout.neighbours[blank])
+            if gScore > self.stats.peakOpen:
+                self.stats.peakOpen = gScore
+
+        for move in self.board.layout.neighbours[blank]:
+            if move == previous:
+                continue
+
+            self.board.hScore = hScore
+            childHScore = hScore + self.heuristic.delta(self.board, move)
+
+            self.board.moveBlank(move)
+            self.moves.append(move)
+
+            result = self.search(gScore + 1, childHScore, bound, blank)
+
+            if result == self.found:
+                return self.found
+
+            self.moves.pop()
+            self.board.moveBlank(blank)
+
+            if minScore == None or result < minScore:
+                minScore = result
+
+        return minScore
+
+    def solve(self) -> str:
+        """
+        This function carries out the IDA* search and solves the
+        board to reach the end goal.
+
+        :return : The moves of the empty tile (U, D, L or R) to reach the goal, or None if it can not be reached.
+        :rtype: str
+        """
+        self.board = Board(self.initial.board, 0, self.initial.goal)
+        self.moves = []
+
+        hScore = self.heuristic.calculateHScore(self.board)
+        bound = hScore
+
+        if self.stats != None:
+            self.stats.start()
+
+        while True:
+            if self.stats != None:
+                self.stats.iterations += 1
+
+            result = self.search(0, hScore, bound, None)
+
+            if result == self.found or result == None:
+                break
+
+            bound = result
+
+        if self.stats != None:
+            self.stats.stop()
+
+        if result == None:
+            return None
+
+        return self.initial.layout.getMoveString(self.initial.blank, self.moves)
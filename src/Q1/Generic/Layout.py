@@ -0,0 +1,251 @@
+"""
+Layout.py
+====================
+This module contains the Layout class which holds the precomputed tables
+used to store a board as a single packed integer and to make moves on it.
+"""
+
+class Layout:
+    """
+    This class defines the layout of a board of a given size (up to 5x5, so
+    that a packed board fits in 125 bits). A board is
+    stored as one integer with a fixed number of bits per tile, where the
+    tile in position p (counted left to right, top to bottom) is held in
+    bits [p * bits, (p + 1) * bits). The empty tile is stored as 0.
+    """
+
+    """
+    The layouts which have already been built, keyed by (rows, cols).
+    """
+    layouts = {}
+
+    """
+    The number of rows in the board.
+    """
+    rows = 0
+
+    """
+    The number of columns in the board.
+    """
+    cols = 0
+
+    """
+    The number of tiles (including the empty tile) in the board.
+    """
+    size = 0
+
+    """
+    The number of bits used to store each tile.
+    """
+    bits = 4
+
+    """
+    The mask used to read a single tile once it has been shifted down.
+    """
+    mask = 15
+
+    """
+    The bit shift of each position in the board.
+    """
+    shifts = []
+
+    """
+    The positions the empty tile can move to from each position, in the
+    order up, down, left, right.
+    """
+    neighbours = []
+
+    """
+    The position the empty tile moves to from each position in each
+    direction (0 up, 1 down, 2 left, 3 right), or None if it would
+    leave the board.
+    """
+    steps = []
+
+    """
+    The letter of each direction (see steps) used
+    in a move string, such as "UURDL".
+    """
+    directionNames = "UDLR"
+
+    def __init__(self, rows : int, cols : int) -> None:
+        """
+        This is the initialiser for a Layout and builds the shift and
+        neighbour tables for a board with the given number of rows and columns.
+
+        :param rows: The number of rows in the board.
+        :type rows: int
+        :param cols: The number of columns in the board.
+        :type cols: int
+        """
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.bits = max(4, (self.size - 1).bit_length())
+        self.mask = (1 << self.bits) - 1
+        self.shifts = [pos * self.bits for pos in range(self.size)]
+
+        self.neighbours = []
+        self.steps = []
+        for pos in range(self.size):
+            x, y = pos % cols, pos // cols
+            posMoves = []
+            posSteps = []
+            for moveX, moveY in [[x, y-1], [x, y+1], [x-1, y], [x+1, y]]:
+                if moveX >= 0 and moveX < cols and moveY >= 0 and moveY < rows:
+                    posMoves.append(moveY * cols + moveX)
+                    posSteps.append(moveY * cols + moveX)
+                else:
+                    posSteps.append(None)
+            self.neighbours.append(tuple(posMoves))
+            self.steps.append(tuple(posSteps))
+
+    @classmethod
+    def get(cls, rows : int, cols : int):
+        """
+        This classmethod returns the layout for a board of the given size,
+        building it the first time it is requested.
+
+        :param rows: The number of rows in the board.
+        :type rows: int
+        :param cols: The number of columns in the board.
+        :type cols: int
+
+        :return : The layout for the board size.
+        :rtype: Layout
+        """
+        if (rows, cols) not in cls.layouts:
+            cls.layouts[(rows, cols)] = cls(rows, cols)
+        return cls.layouts[(rows, cols)]
+
+    def pack(self, board : list) -> tuple:
+        """
+        This function packs a board given as a list of rows of tile labels
+        (with the empty tile as "*") into a single integer.
+
+        :param board: The board as a list of rows.
+        :type board: list
+
+        :return : The packed board and the position of the empty tile.
+        :rtype: tuple
+        """
+        state = 0
+        blank = None
+        pos = 0
+        for row in board:
+            for item in row:
+                if item == "*":
+                    blank = pos
+                else:
+                    tile = int(item)
+                    if tile <= 0 or tile >= self.size:
+                        raise Exception(f"Error : Tiles must be numbered from 1 to {self.size - 1}.")
+                    state |= tile << self.shifts[pos]
+                pos += 1
+        return state, blank
+
+    def unpack(self, state : int) -> list:
+        """
+        This function unpacks a packed board back into a list of rows
+        of tile labels, with the empty tile as "*".
+
+        :param state: The packed board.
+        :type state: int
+
+        :return : The board as a list of rows.
+        :rtype: list
+        """
+        board = []
+        for y in range(self.rows):
+            row = []
+            for x in range(self.cols):
+                tile = self.tileAt(state, y * self.cols + x)
+                if tile == 0:
+                    row.append("*")
+                else:
+                    row.append(str(tile))
+            board.append(row)
+        return board
+
+    def tileAt(self, state : int, pos : int) -> int:
+        """
+        This function returns the tile in a given position of a packed board.
+
+        :param state: The packed board.
+        :type state: int
+        :param pos: The position of the tile.
+        :type pos: int
+
+        :return : The tile in the position (0 for the empty tile).
+        :rtype: int
+        """
+        return (state >> self.shifts[pos]) & self.mask
+
+    def move(self, state : int, blank : int, pos : int) -> int:
+        """
+        This function moves the empty tile from its position into the given
+        position, by moving the tile in that position into the empty tile's place.
+
+        :param state: The packed board.
+        :type state: int
+        :param blank: The position of the empty tile.
+        :type blank: int
+        :param pos: The position the empty tile is moving to.
+        :type pos: int
+
+        :return : The packed board after the move.
+        :rtype: int
+        """
+        tile = (state >> self.shifts[pos]) & self.mask
+        return state - (tile << self.shifts[pos]) + (tile << self.shifts[blank])
+
+    def getDirection(self, blank : int, pos : int) -> int:
+        """
+        This function returns the direction of a move of the empty tile.
+
+        :param blank: The position of the empty tile.
+        :type blank: int
+        :param pos: The position the empty tile is moving to.
+        :type pos: int
+
+        :return : The direction (0 up, 1 down, 2 left, 3 right).
+        :rtype: int
+        """
+        return self.steps[blank].index(pos)
+
+    def getMoveString(self, blank : int, positions : list) -> str:
+        """
+        This function returns the move string of the empty tile moving to
+        each of the given positions in turn.
+
+        :param blank: The position of the empty tile before the first move.
+        :type blank: int
+        :param positions: The position the empty tile moves to in each move.
+        :type positions: list
+
+        :return : The move string (one of U, D, L or R for each move).
+        :rtype: str
+        """
+        names = []
+        for pos in positions:
+            names.append(self.directionNames[self.getDirection(blank, pos)])
+            blank = pos
+        return "".join(names)
+
+    def getPosition(self, blank : int, name : str) -> int:
+        """
+        This function returns the position the empty tile moves to for one
+        letter of a move string.
+
+        :param blank: The position of the empty tile.
+        :type blank: int
+        :param name: The letter of the move (U, D, L or R).
+        :type name: str
+
+        :return : The position the empty tile moves to.
+        :rtype: int
+        """
+        direction = self.directionNames.find(name)
+        if direction == -1 or self.steps[blank][direction] == None:
+            raise Exception(f"Error : The move '{name}' can not be made from position {blank}.")
+        return self.steps[blank][direction]
@@ -0,0 +1,177 @@
+"""
+LinearConflict.py
+=============================
+This module contains the code for a LinearConflict class which is a
+child of the HeuristicFunc class. It adds the linear conflicts of every
+row and column, read from precomputed tables, to the Manhattan distance.
+"""
+
+from HeuristicFunc import HeuristicFunc
+
+
+class LinearConflict(HeuristicFunc):
+    """
+    This class defines the heuristic function for Manhattan distance with
+    linear conflicts. Two tiles are in linear conflict when they are in
+    the line (row or column) their goal positions are in, but in the wrong
+    order, so one of them has to leave the line and come back, taking two
+    moves which the Manhattan distance does not count. For each line, the
+    fewest tiles which must leave it is the number of tiles in their goal
+    line minus the longest run of them already in order.
+
+    A line is described by a key, built from the goal index (plus one) in
+    the line of each tile which is in its goal line (0 for other tiles),
+    and the extra moves for every key are worked out once when the
+    heuristic is made. The empty tile is not counted, so the heuristic
+    never overestimates.
+    """
+
+    """
+    The tables of extra moves for lines of each length, keyed
+    by the length of the line.
+    """
+    tables = {}
+
+    """
+    The distance of each tile from its goal position, indexed
+    by tile and then by the position the tile is in.
+    """
+    distances = []
+
+    """
+    The lines (rows then columns), each a tuple of its positions, the part
+    of the key given by each tile at each of its positions (indexed by the
+    index in the line and then by tile) and its table of extra moves.
+    """
+    lines = []
+
+    """
+    The indexes of the lines (one row and one column)
+    each position is in, indexed by position.
+    """
+    linesAt = []
+
+    def __init__(self, goal) -> None:
+        #Docstrings inherited from HeuristicFunc
+        #See HeuristicFunc.py for further details
+        super().__init__(goal)
+
+        layout = self.layout
+        cols = layout.cols
+
+        self.distances = [[0] * layout.size]
+        for goalPos in self.goalPositions[1:]:
+            goalx, goaly = goalPos % cols, goalPos // cols
+            self.distances.append([abs(pos % cols - goalx) + abs(pos // cols - goaly) for pos in range(layout.size)])
+
+        rows = [[row * cols + col for col in range(cols)] for row in range(layout.rows)]
+        columns = [[row * cols + col for row in range(layout.rows)] for col in range(cols)]
+
+        self.lines = []
+        self.linesAt = [[] for pos in range(layout.size)]
+        for positions in rows + columns:
+            for pos in positions:
+                self.linesAt[pos].append(len(self.lines))
+            self.lines.append(self.getLine(positions))
+
+    @classmethod
+    def getTable(cls, length : int) -> list:
+        """
+        This classmethod returns the extra moves of every key of a line with
+        the given length, building the table the first time it is asked for.
+
+        :param length: The number of positions in the line.
+        :type length: int
+
+        :return : The extra moves of each key.
+        :rtype: list
+        """
+        if length not in cls.tables:
+            base = length + 1
+            table = []
+            for key in range(base ** length):
+                order = []
+                for i in range(length):
+                    key, index = divmod(key, base)
+                    if index != 0:
+                        order.append(index)
+
+                # the longest run of the tiles which are already in order.
+                longest = [1] * len(order)
+                for i in range(len(order)):
+                    for j in range(i):
+                        if order[j] < order[i] and longest[j] + 1 > longest[i]:
+                            longest[i] = longest[j] + 1
+
+                table.append(2 * (len(order) - max(longest, default=0)))
+            cls.tables[length] = table
+        return cls.tables[length]
+
+    def getLine(self, positions : list) -> tuple:
+        """
+        This function builds the key parts and finds the table of a line.
+
+        :param positions: The positions in the line, in order.
+        :type positions: list
+
+        :return : The positions, key parts and table of the line.
+        :rtype: tuple
+        """
+        length = len(positions)
+        parts = []
+        for i in range(length):
+            weight = (length + 1) ** i
+            indexParts = [0] * self.layout.size
+            for tile in range(1, self.layout.size):
+                goalPos = self.goalPositions[tile]
+                if goalPos in positions:
+                    indexParts[tile] = (positions.index(goalPos) + 1) * weight
+            parts.append(indexParts)
+        return tuple(positions), parts, self.getTable(length)
+
+    def getConflicts(self, state : int, line : int) -> int:
+        """
+        This function returns the extra moves needed for the linear
+        conflicts in one line of a packed state.
+
+        :param state: The packed state.
+        :type state: int
+        :param line: The index of the line.
+        :type line: int
+
+        :return : The number of extra moves.
+        :rtype: int
+        """
+        layout = self.layout
+        positions, parts, table = self.lines[line]
+        key = 0
+        for i in range(len(positions)):
+            key += parts[i][(state >> layout.shifts[positions[i]]) & layout.mask]
+        return table[key]
+
+    def calculateHScore(self, board):
+        #Docstrings inherited from HeuristicFunc
+        #See HeuristicFunc.py for further details
+        layout = self.layout
+        distance = 0
+
+        for pos in range(layout.size):
+            distance += self.distances[layout.tileAt(board.state, pos)][pos]
+
+        for line in range(len(self.lines)):
+            distance += self.getConflicts(board.state, line)
+
+        return distance
+
+    def delta(self, parent, move):
+        #Docstrings inherited from HeuristicFunc
+        #See HeuristicFunc.py for further details
+        layout = self.layout
+        tile = layout.tileAt(parent.state, move)
+        childState = layout.move(parent.state, parent.blank, move)
+
+        change = self.distances[tile][parent.blank] - self.distances[tile][move]
+        for line in set(self.linesAt[parent.blank] + self.linesAt[move]):
+            change += self.getConflicts(childState, line) - self.getConflicts(parent.state, line)
+
+        return change
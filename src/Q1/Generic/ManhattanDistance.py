@@ -12,27 +12,46 @@ class ManhattanDistance(HeuristicFunc):
     This class defined the heurstic function for 
     Manhattan distance which is the sum of distances
     each tile must move to reach its position in the goal.
+    The empty tile is not counted, so the heuristic never
+    overestimates and the searches which stop at the first
+    (or best meeting) path, IDA*, bidirectional A* and HDA*,
+    give optimal solutions with it.
     """
 
+    """
+    The distance of each tile from its goal position, indexed
+    by tile and then by the position the tile is in (always
+    0 for the empty tile).
+    """
+    distances = []
+
     def __init__(self, goal) -> None:
         #Docstrings inherited from HeuristicFunc
         #See HeuristicFunc.py for further details
         super().__init__(goal)
 
+        cols = self.layout.cols
+        self.distances = [[0] * self.layout.size]
+        for goalPos in self.goalPositions[1:]:
+            goalx, goaly = goalPos % cols, goalPos // cols
+            tileDistances = []
+            for pos in range(self.layout.size):
+                tileDistances.append(abs(pos % cols - goalx) + abs(pos // cols - goaly))
+            self.distances.append(tileDistances)
+
     def calculateHScore(self, board):
         #Docstrings inherited from HeuristicFunc
         #See HeuristicFunc.py for further details
         distance = 0
 
-        for num in range(1, 9, 1):
-            boardx, boardy = self.find(str(num), board.board)
-            goalx, goaly = self.find(str(num), self.goal)
+        for pos in range(self.layout.size):
+            distance += self.distances[self.layout.tileAt(board.state, pos)][pos]
 
-            distance += abs(boardx - goalx) + abs(boardy - goaly)
-        
-        boardx, boardy = self.find("*", board.board)
-        goalx, goaly = self.find("*", self.goal)
+        return distance
 
-        distance += abs(boardx - goalx) + abs(boardy - goaly)
+    def delta(self, parent, move):
+        #Docstrings inherited from HeuristicFunc
+        #See HeuristicFunc.py for further details
+        tileDistances = self.distances[self.layout.tileAt(parent.state, move)]
 
-        return distance
+        return tileDistances[parent.blank] - tileDistances[move]
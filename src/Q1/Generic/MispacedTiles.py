@@ -14,21 +14,41 @@ class MisplacedTiles(HeuristicFunc):
     in the correct location.
     """
 
+    """
+    Whether each tile is misplaced (1) or not (0), indexed by
+    tile and then by the position the tile is in. The empty
+    tile is never counted.
+    """
+    misplaced = []
+
     def __init__(self, goal) -> None:
         #Docstrings inherited from HeuristicFunc
         #See HeuristicFunc.py for further details
         super().__init__(goal)
+
+        self.misplaced = []
+        for tile in range(self.layout.size):
+            tileMisplaced = []
+            for pos in range(self.layout.size):
+                if tile != 0 and pos != self.goalPositions[tile]:
+                    tileMisplaced.append(1)
+                else:
+                    tileMisplaced.append(0)
+            self.misplaced.append(tileMisplaced)
     
     def calculateHScore(self, board):
         #Docstrings inherited from HeuristicFunc
         #See HeuristicFunc.py for further details
         distance = 0
 
-        for num in range(1, 9, 1):
-            boardx, boardy = self.find(str(num), board.board)
-            goalx, goaly = self.find(str(num), self.goal)
-
-            if (boardx != goalx) or (boardy != goaly):
-                distance += 1
+        for pos in range(self.layout.size):
+            distance += self.misplaced[self.layout.tileAt(board.state, pos)][pos]
             
-        return distance
\ No newline at end of file
+        return distance
+
+    def delta(self, parent, move):
+        #Docstrings inherited from HeuristicFunc
+        #See HeuristicFunc.py for further details
+        tileMisplaced = self.misplaced[self.layout.tileAt(parent.state, move)]
+
+        return tileMisplaced[parent.blank] - tileMisplaced[move]
\ No newline at end of file
@@ -0,0 +1,552 @@
+"""
+ParallelAStar.py
+========================
+This module contains the ParallelAStar class which runs a hash distributed
+A* search (HDA*) across several worker processes, the ParallelWorker class
+which runs the search in each process, and the runWorker function which is
+run by each worker's process.
+"""
+
+import heapq
+import multiprocessing
+import os
+import queue
+
+from Board import Board
+from HeuristicFunc import HeuristicFunc
+from Puzzel import Puzzel
+from SearchStats import SearchStats
+
+
+def getOwner(state : int, numWorkers : int) -> int:
+    """
+    This function returns the worker which owns a state. The packed state
+    is mixed (Fibonacci hashing) first, as its low bits only hold the first
+    few tiles.
+
+    :param state: The packed state.
+    :type state: int
+    :param numWorkers: The number of workers.
+    :type numWorkers: int
+
+    :return : The number of the worker which owns the state.
+    :rtype: int
+    """
+    return ((state * 0x9E3779B97F4A7C15) >> 32 & 0xFFFFFFFF) % numWorkers
+
+
+class ParallelWorker:
+    """
+    This class runs the part of the search owned by one worker. The worker
+    keeps the best known cost of, and the move into, every state it owns
+    and an open heap of them. Children owned by other workers are grouped
+    into batches before being sent, and the worker answers the main
+    process' probes (used to detect when the search has finished) and
+    questions about the path.
+    """
+
+    """
+    The number of this worker.
+    """
+    workerNum = 0
+
+    """
+    The number of workers.
+    """
+    numWorkers = 1
+
+    """
+    The heuristic function being used.
+    """
+    heuristic = None
+
+    """
+    The layout of the boards.
+    """
+    layout = None
+
+    """
+    The packed goal state.
+    """
+    goalState = 0
+
+    """
+    The queue of each worker, which messages are sent to.
+    """
+    inboxes = []
+
+    """
+    The queue replies are sent to the main process on.
+    """
+    results = None
+
+    """
+    The number of children grouped into each batch sent to another worker.
+    """
+    batchSize = 64
+
+    """
+    The number of boards expanded between checks of the inbox.
+    """
+    expandLimit = 64
+
+    """
+    The open heap of (f score, h score, state, blank, g score) entries.
+    """
+    open = []
+
+    """
+    The best known g score of each state owned by this worker and the
+    position the empty tile was in before the move into it, keyed by state.
+    """
+    best = {}
+
+    """
+    The children waiting to be sent to each worker.
+    """
+    outboxes = []
+
+    """
+    The cost of the best solution found so far (the incumbent).
+    """
+    bound = float("inf")
+
+    """
+    The number of batches of children sent to and received from other workers.
+    """
+    sent = 0
+    received = 0
+
+    """
+    The counters of the search, sent to the main process when it stops.
+    """
+    counters = {}
+
+    """
+    The board used to score children, which has its state set in place.
+    """
+    scratch = None
+
+    def __init__(self, workerNum : int, numWorkers : int, heuristic : HeuristicFunc, inboxes : list, results, batchSize : int) -> None:
+        """
+        This is the initialiser for a ParallelWorker.
+
+        :param workerNum: The number of this worker.
+        :type workerNum: int
+        :param numWorkers: The number of workers.
+        :type numWorkers: int
+        :param heuristic: The heuristic function being used.
+        :type heuristic: HeuristicFunc
+        :param inboxes: The queue of each worker.
+        :type inboxes: list
+        :param results: The queue replies are sent to the main process on.
+        :type results: multiprocessing.Queue
+        :param batchSize: The number of children grouped into each batch.
+        :type batchSize: int
+        """
+        self.workerNum = workerNum
+        self.numWorkers = numWorkers
+        self.heuristic = heuristic
+        self.inboxes = inboxes
+        self.results = results
+        self.batchSize = batchSize
+
+        self.scratch = Board(heuristic.goal, 0, heuristic.goal)
+        self.layout = self.scratch.layout
+        self.goalState = self.scratch.goalState
+
+        self.open = []
+        self.best = {}
+        self.outboxes = [[] for num in range(numWorkers)]
+        self.bound = float("inf")
+        self.sent = 0
+        self.received = 0
+        self.counters = {"expanded": 0, "generated": 0, "duplicates": 0, "stale": 0, "peakOpen": 0}
+
+    def addNode(self, state : int, blank : int, gScore : int, hScore : int, previous : int) -> None:
+        """
+        This function adds a state owned by this worker to the search, if it is
+        the best way found to reach it and could lead to a better solution than
+        the incumbent. Reaching the goal gives a new incumbent, which is sent
+        to every other worker so they can prune their own searches with it.
+
+        :param state: The packed state.
+        :type state: int
+        :param blank: The position of the empty tile.
+        :type blank: int
+        :param gScore: The number of moves made to reach the state.
+        :type gScore: int
+        :param hScore: The heuristic score of the state.
+        :type hScore: int
+        :param previous: The position of the empty tile before the move into the state.
+        :type previous: int
+        """
+        known = self.best.get(state)
+        if known != None and known[0] <= gScore:
+            self.counters["duplicates"] += 1
+            return
+
+        self.best[state] = (gScore, previous)
+
+        if state == self.goalState:
+            if gScore < self.bound:
+                self.bound = gScore
+                for num in range(self.numWorkers):
+                    if num != self.workerNum:
+                        self.inboxes[num].put({"type": "bound", "bound": gScore})
+        elif gScore + hScore < self.bound:
+            heapq.heappush(self.open, (gScore + hScore, hScore, state, blank, gScore))
+            if len(self.open) > self.counters["peakOpen"]:
+                self.counters["peakOpen"] = len(self.open)
+
+    def expand(self) -> None:
+        """
+        This function expands the boards at the top of the open heap, adding
+        the children this worker owns and batching the rest for their owners.
+        """
+        layout = self.layout
+        scratch = self.scratch
+
+        for num in range(self.expandLimit):
+            if not self.open or self.open[0][0] >= self.bound:
+                break
+
+            fScore, hScore, state, blank, gScore = heapq.heappop(self.open)
+            if self.best[state][0] < gScore:
+                self.counters["stale"] += 1
+                continue
+
+            self.counters["expanded"] += 1
+            previous = self.best[state][1]
+            scratch.state, scratch.blank, scratch.hScore = state, blank, hScore
+
+            for move in layout.neighbours[blank]:
+                if move == previous:
+                    continue
+                self.counters["generated"] += 1
+                child = layout.move(state, blank, move)
+                childH = hScore + self.heuristic.delta(scratch, move)
+                owner = getOwner(child, self.numWorkers)
+                if owner == self.workerNum:
+                    self.addNode(child, move, gScore + 1, childH, blank)
+                else:
+                    self.outboxes[owner].append((child, move, gScore + 1, childH, blank))
+                    if len(self.outboxes[owner]) >= self.batchSize:
+                        self.flush(owner)
+
+    def flush(self, owner : int) -> None:
+        """
+        This function sends the children waiting for a worker as one batch.
+
+        :param owner: The number of the worker.
+        :type owner: int
+        """
+        self.inboxes[owner].put({"type": "nodes", "nodes": self.outboxes[owner]})
+        self.outboxes[owner] = []
+        self.sent += 1
+
+    def isIdle(self) -> bool:
+        """
+        This function checks if the worker has nothing left to do, which is
+        when every board left in open could not beat the incumbent and every
+        batch of children has been sent.
+
+        :return : If the worker is idle.
+        :rtype: bool
+        """
+        if self.open and self.open[0][0] < self.bound:
+            return False
+        return not any(self.outboxes)
+
+    def handle(self, message : dict) -> bool:
+        """
+        This function acts on one message from the inbox.
+
+        :param message: The message.
+        :type message: dict
+
+        :return : If the worker should keep running.
+        :rtype: bool
+        """
+        if message["type"] == "nodes":
+            self.received += 1
+            for node in message["nodes"]:
+                self.addNode(*node)
+        elif message["type"] == "bound":
+            self.bound = min(self.bound, message["bound"])
+        elif message["type"] == "probe":
+            self.results.put({"type": "probe", "wave": message["wave"], "idle": self.isIdle(),
+                              "sent": self.sent, "received": self.received})
+        elif message["type"] == "parent":
+            gScore, previous = self.best.get(message["state"], (None, None))
+            self.results.put({"type": "parent", "state": message["state"], "gScore": gScore, "previous": previous})
+        elif message["type"] == "stop":
+            self.results.put({"type": "counters", "worker": self.workerNum, **self.counters})
+            return False
+        return True
+
+    def run(self) -> None:
+        """
+        This function runs the worker until it is told to stop. While it has
+        boards to expand it only checks its inbox between groups of them, and
+        once it is idle every waiting batch is sent and it waits for messages.
+        """
+        inbox = self.inboxes[self.workerNum]
+        running = True
+
+        while running:
+            if not self.open or self.open[0][0] >= self.bound:
+                for owner in range(self.numWorkers):
+                    if self.outboxes[owner]:
+                        self.flush(owner)
+                running = self.handle(inbox.get())
+            else:
+                self.expand()
+
+            while running:
+                try:
+                    message = inbox.get_nowait()
+                except queue.Empty:
+                    break
+                running = self.handle(message)
+
+
+def runWorker(workerNum : int, numWorkers : int, heuristicType : type, goal : list, inboxes : list, results, batchSize : int) -> None:
+    """
+    This function runs one worker of the search in its own process. The
+    heuristic is made again in the process (any tables are loaded from
+    their cache, as the main process has already built them).
+
+    :param workerNum: The number of this worker.
+    :type workerNum: int
+    :param numWorkers: The number of workers.
+    :type numWorkers: int
+    :param heuristicType: The class of the heuristic function being used.
+    :type heuristicType: type
+    :param goal: The goal board / state.
+    :type goal: list
+    :param inboxes: The queue of each worker.
+    :type inboxes: list
+    :param results: The queue replies are sent to the main process on.
+    :type results: multiprocessing.Queue
+    :param batchSize: The number of children grouped into each batch.
+    :type batchSize: int
+    """
+    ParallelWorker(workerNum, numWorkers, heuristicType(goal), inboxes, results, batchSize).run()
+
+
+class ParallelAStar(Puzzel):
+    """
+    This class runs a hash distributed A* search (HDA*). Every state is owned
+    by the worker process its hash picks, and each worker runs A* on the states
+    it owns, sending the children owned by other workers to them in batches.
+
+    A worker which reaches the goal shares its cost (the incumbent) with the
+    others, and boards which can not beat it are pruned. The search has finished
+    when every worker is idle and every batch sent has been received, which is
+    checked with probe waves from the main process: the counts of batches sent
+    and received must be equal, and unchanged over two waves in a row, so no
+    batch can still be on its way. As the heuristic never overestimates, the
+    incumbent is then an optimal solution, and its path is read back from the
+    workers which own each state on it.
+    """
+
+    """
+    The number of worker processes.
+    """
+    numWorkers = 1
+
+    """
+    The number of children grouped into each batch sent to another worker.
+    """
+    batchSize = 64
+
+    """
+    The number of seconds to wait for each worker process to exit once it
+    has been told to stop, after which it is terminated.
+    """
+    joinTimeout = 5.0
+
+    def __init__(self, board : Board, heuristic : HeuristicFunc, stats : SearchStats = None, workers : int = None, batchSize : int = 64) -> None:
+        """
+        This is the initialiser for the ParallelAStar.
+
+        :param board: The starting board (state).
+        :type board: Board
+        :param heuristic: The heuristic function being used.
+        :type board: HeuristicFunc
+        :param stats: The stats to record the search in, if any.
+        :type stats: SearchStats
+        :param workers: The number of worker processes, by default one per core.
+        :type workers: int
+        :param batchSize: The number of children grouped into each batch sent to another worker.
+        :type batchSize: int
+        """
+        super().__init__(board, heuristic, stats)
+        self.numWorkers = workers if workers != None else os.cpu_count()
+        self.batchSize = batchSize
+
+    def waitFor(self, results, messageType : str) -> dict:
+        """
+        This function waits for the next reply of the given type from the workers.
+
+        :param results: The queue replies are sent to the main process on.
+        :type results: multiprocessing.Queue
+        :param messageType: The type of the reply.
+        :type messageType: str
+
+        :return : The reply.
+        :rtype: dict
+        """
+        while True:
+            message = results.get()
+            if message["type"] == messageType:
+                return message
+
+    def drain(self, inboxes : list, results) -> None:
+        """
+        This function reads (and drops) every message left in the queues. A
+        process can not exit until the messages it has put in a queue have been
+        read, such as incumbents sent to workers which had already stopped.
+
+        :param inboxes: The queue of each worker.
+        :type inboxes: list
+        :param results: The queue replies are sent to the main process on.
+        :type results: multiprocessing.Queue
+        """
+        for messages in inboxes + [results]:
+            while True:
+                try:
+                    messages.get_nowait()
+                except queue.Empty:
+                    break
+
+    def waitUntilFinished(self, inboxes : list, results) -> None:
+        """
+        This function sends probe waves to the workers until every worker is
+        idle and the counts of batches sent and received are equal and have
+        not changed since the last wave.
+
+        :param inboxes: The queue of each worker.
+        :type inboxes: list
+        :param results: The queue replies are sent to the main process on.
+        :type results: multiprocessing.Queue
+        """
+        lastCounts = None
+        wave = 0
+
+        while True:
+            wave += 1
+            for inbox in inboxes:
+                inbox.put({"type": "probe", "wave": wave})
+
+            idle = True
+            # the initial board is sent by the main process.
+            sent, received = 1, 0
+            for num in range(self.numWorkers):
+                reply = self.waitFor(results, "probe")
+                while reply["wave"] != wave:
+                    reply = self.waitFor(results, "probe")
+                idle = idle and reply["idle"]
+                sent += reply["sent"]
+                received += reply["received"]
+
+            if idle and sent == received:
+                if lastCounts == (sent, received):
+                    return
+                lastCounts = (sent, received)
+            else:
+                lastCounts = None
+
+    def getPath(self, inboxes : list, results) -> list:
+        """
+        This function reads the positions of the empty tile on the way to the
+        goal, by asking the owner of each state for the move into it.
+
+        :param inboxes: The queue of each worker.
+        :type inboxes: list
+        :param results: The queue replies are sent to the main process on.
+        :type results: multiprocessing.Queue
+
+        :return : The position of the empty tile after each move, or None if the goal was not reached.
+        :rtype: list
+        """
+        layout = self.initial.layout
+        state = self.initial.goalState
+        blank = layout.pack(self.initial.goal)[1]
+        blanks = []
+
+        while state != self.initial.state:
+            inboxes[getOwner(state, self.numWorkers)].put({"type": "parent", "state": state})
+            reply = self.waitFor(results, "parent")
+            if reply["gScore"] == None:
+                return None
+            blanks.append(blank)
+            state = layout.move(state, blank, reply["previous"])
+            blank = reply["previous"]
+
+        blanks.reverse()
+        return blanks
+
+    def solve(self) -> str:
+        """
+        This function carries out the HDA* search and solves the
+        board to reach the end goal.
+
+        :return : The moves of the empty tile (U, D, L or R) to reach the goal, or None if it can not be reached.
+        :rtype: str
+        """
+        solution = ""
+
+        if self.stats != None:
+            self.stats.start()
+            self.stats.iterations += 1
+
+        if not self.initial.isSolved():
+            inboxes = [multiprocessing.Queue() for num in range(self.numWorkers)]
+            results = multiprocessing.Queue()
+            processes = [multiprocessing.Process(target=runWorker, args=(num, self.numWorkers, type(self.heuristic), self.heuristic.goal,
+                                                                          inboxes, results, self.batchSize))
+                         for num in range(self.numWorkers)]
+
+            for process in processes:
+                process.start()
+
+            try:
+                hScore = self.heuristic.calculateHScore(self.initial)
+                owner = getOwner(self.initial.state, self.numWorkers)
+                inboxes[owner].put({"type": "nodes", "nodes": [(self.initial.state, self.initial.blank, 0, hScore, None)]})
+
+                self.waitUntilFinished(inboxes, results)
+
+                blanks = self.getPath(inboxes, results)
+
+                for inbox in inboxes:
+                    inbox.put({"type": "stop"})
+                for num in range(self.numWorkers):
+                    counters = self.waitFor(results, "counters")
+                    self.expanded += counters["expanded"]
+                    if self.stats != None:
+                        self.stats.expanded += counters["expanded"]
+                        self.stats.generated += counters["generated"]
+                        self.stats.duplicates += counters["duplicates"]
+                        self.stats.stale += counters["stale"]
+                        self.stats.peakOpen = max(self.stats.peakOpen, counters["peakOpen"])
+
+                for process in processes:
+                    self.drain(inboxes, results)
+                    process.join(self.joinTimeout)
+            finally:
+                for process in processes:
+                    if process.is_alive():
+                        process.terminate()
+
+            if blanks != None:
+                solution = self.initial.layout.getMoveString(self.initial.blank, blanks)
+            else:
+                solution = None
+
+        if self.stats != None:
+            self.stats.stop()
+
+        return solution
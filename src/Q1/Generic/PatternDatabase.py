@@ -0,0 +1,288 @@
+"""
+PatternDatabase.py
+=============================
+This module contains the code for a PatternDatabase class which is a
+child of the HeuristicFunc class. It uses additive disjoint pattern
+databases which are built once and then cached on disk.
+"""
+
+import mmap
+import os
+from array import array
+from collections import deque
+
+from HeuristicFunc import HeuristicFunc
+
+
+class PatternDatabase(HeuristicFunc):
+    """
+    This class defines the heuristic function for additive disjoint
+    pattern databases. The tiles are split into groups and, for each
+    group, a database holds the number of moves of tiles in the group
+    needed to move them into their goal positions from every placement
+    of the group. As every move only moves one tile, the scores of the
+    groups can be added together and the total never overestimates.
+
+    A database is indexed by the positions of the tiles in its group,
+    sum(pos[i] * size ** i), and holds one byte per placement.
+    """
+
+    """
+    The number of tiles in each group for the board sizes
+    which have a default split, keyed by the number of positions
+    in the board. The tiles are taken in the order of their goal
+    positions so each group covers one area of the goal.
+    """
+    defaultGroupSizes = {9: [4, 4], 16: [5, 5, 5], 25: [4, 4, 4, 4, 4, 4]}
+
+    """
+    The directory the databases are cached in.
+    """
+    cacheDir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pdb")
+
+    """
+    The value used in a database for placements which are
+    never reached from the goal.
+    """
+    unreached = 255
+
+    """
+    The groups of tiles, each a list of tiles.
+    """
+    groups = []
+
+    """
+    The database (a memory mapped file) of each group.
+    """
+    databases = []
+
+    """
+    The index of the group each tile is in, indexed by tile.
+    """
+    groupOf = []
+
+    """
+    The index of each tile in its group, indexed by tile.
+    """
+    indexInGroup = []
+
+    """
+    The multiplier (size ** i) of each index in a group.
+    """
+    multipliers = []
+
+    def __init__(self, goal, groups : list = None, cacheDir : str = None) -> None:
+        """
+        This is the initialiser for a PatternDatabase and loads the database
+        of each group from the cache, building and caching any which have not
+        been built before.
+
+        :param goal: The goal state.
+        :type goal: list
+        :param groups: The groups of tiles, by default the tiles are split using defaultGroupSizes.
+        :type groups: list
+        :param cacheDir: The directory the databases are cached in.
+        :type cacheDir: str
+        """
+        super().__init__(goal)
+
+        if cacheDir != None:
+            self.cacheDir = cacheDir
+
+        if groups == None:
+            groups = self.getDefaultGroups()
+        self.groups = [[int(tile) for tile in group] for group in groups]
+
+        size = self.layout.size
+        self.multipliers = [size ** i for i in range(max(len(group) for group in self.groups) + 1)]
+
+        self.groupOf = [None] * size
+        self.indexInGroup = [None] * size
+        for groupNum in range(len(self.groups)):
+            for i in range(len(self.groups[groupNum])):
+                tile = self.groups[groupNum][i]
+                if tile <= 0 or tile >= size or self.groupOf[tile] != None:
+                    raise Exception("Error : Pattern database groups must not overlap and only contain tiles on the board.")
+                self.groupOf[tile] = groupNum
+                self.indexInGroup[tile] = i
+
+        if None in self.groupOf[1:]:
+            raise Exception("Error : Pattern database groups must contain every tile on the board.")
+
+        self.databases = [self.load(group) for group in self.groups]
+
+    def getDefaultGroups(self) -> list:
+        """
+        This function splits the tiles into groups by the order of their
+        goal positions, using defaultGroupSizes or, for board sizes without
+        a default, groups of at most five tiles (four for boards with more
+        than 16 positions, as a database takes size ** (tiles + 1) bytes
+        to build).
+
+        :return : The groups of tiles.
+        :rtype: list
+        """
+        tiles = sorted(range(1, self.layout.size), key=lambda tile: self.goalPositions[tile])
+
+        sizes = self.defaultGroupSizes.get(self.layout.size)
+        if sizes == None:
+            groupSize = 5
+            if self.layout.size > 16:
+                groupSize = 4
+            sizes = [groupSize] * (len(tiles) // groupSize)
+            if len(tiles) % groupSize != 0:
+                sizes.append(len(tiles) % groupSize)
+
+        groups = []
+        start = 0
+        for groupSize in sizes:
+            groups.append(tiles[start: start + groupSize])
+            start += groupSize
+        return groups
+
+    def getCachePath(self, group : list) -> str:
+        """
+        This function returns the path of the cache file for a group's database.
+        The file name holds the board size, goal and the tiles in the group.
+
+        :param group: The tiles in the group.
+        :type group: list
+
+        :return : The path of the cache file.
+        :rtype: str
+        """
+        goal = "-".join(str(self.layout.tileAt(self.layout.pack(self.goal)[0], pos)) for pos in range(self.layout.size))
+        tiles = "-".join(str(tile) for tile in group)
+        fileName = f"pdb_{self.layout.rows}x{self.layout.cols}_{goal}_{tiles}.bin"
+        return os.path.join(self.cacheDir, fileName)
+
+    def load(self, group : list) -> mmap.mmap:
+        """
+        This function memory maps the database of a group from its cache file,
+        building the database and writing the file first if it does not exist
+        or is not the size of the database (such as a file which was cut short).
+
+        :param group: The tiles in the group.
+        :type group: list
+
+        :return : The database of the group.
+        :rtype: mmap.mmap
+        """
+        path = self.getCachePath(group)
+
+        if not os.path.exists(path) or os.path.getsize(path) != self.layout.size ** len(group):
+            database = self.build(group)
+            os.makedirs(self.cacheDir, exist_ok=True)
+            tempPath = f"{path}.{os.getpid()}.tmp"
+            with open(tempPath, "wb") as file:
+                database.tofile(file)
+            os.replace(tempPath, path)
+
+        with open(path, "rb") as file:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def build(self, group : list) -> array:
+        """
+        This function builds the database for a group using a backwards breadth
+        first search from the goal. The search state is the positions of the tiles
+        in the group and of the empty tile, with all other tiles treated as being
+        the same. Moving a tile in the group costs 1 and moving any other tile
+        costs 0, so a deque is used with 0 cost states added to the front.
+
+        :param group: The tiles in the group.
+        :type group: list
+
+        :return : The database of the group.
+        :rtype: array
+        """
+        size = self.layout.size
+        neighbours = self.layout.neighbours
+        numTiles = len(group)
+        multipliers = [size ** (i + 1) for i in range(numTiles)]
+
+        database = array("B", [self.unreached]) * (size ** numTiles)
+        distances = bytearray([self.unreached]) * (size ** (numTiles + 1))
+
+        # search states are indexed by blank + size * (group index).
+        start = self.goalPositions[0]
+        for i in range(numTiles):
+            start += self.goalPositions[group[i]] * multipliers[i]
+        distances[start] = 0
+        queue = deque([start])
+
+        while queue:
+            index = queue.popleft()
+            distance = distances[index]
+
+            groupIndex, blank = divmod(index, size)
+            if database[groupIndex] == self.unreached:
+                database[groupIndex] = distance
+
+            positions = []
+            remaining = groupIndex
+            for i in range(numTiles):
+                remaining, pos = divmod(remaining, size)
+                positions.append(pos)
+
+            for move in neighbours[blank]:
+                if move in positions:
+                    i = positions.index(move)
+                    child = index - blank + move + (blank - move) * multipliers[i]
+                    childDistance = distance + 1
+                else:
+                    child = index - blank + move
+                    childDistance = distance
+
+                if childDistance < distances[child]:
+                    distances[child] = childDistance
+                    if childDistance == distance:
+                        queue.appendleft(child)
+                    else:
+                        queue.append(child)
+
+        return database
+
+    def getGroupIndexes(self, state : int) -> list:
+        """
+        This function returns the index into each group's database
+        for a packed board.
+
+        :param state: The packed board.
+        :type state: int
+
+        :return : The index of the board into each database.
+        :rtype: list
+        """
+        indexes = [0] * len(self.groups)
+        for pos in range(self.layout.size):
+            tile = self.layout.tileAt(state, pos)
+            if tile != 0:
+                indexes[self.groupOf[tile]] += pos * self.multipliers[self.indexInGroup[tile]]
+        return indexes
+
+    def calculateHScore(self, board):
+        #Docstrings inherited from HeuristicFunc
+        #See HeuristicFunc.py for further details
+        distance = 0
+
+        indexes = self.getGroupIndexes(board.state)
+        for groupNum in range(len(self.groups)):
+            distance += self.databases[groupNum][indexes[groupNum]]
+
+        return distance
+
+    def delta(self, parent, move):
+        #Docstrings inherited from HeuristicFunc
+        #See HeuristicFunc.py for further details
+        tile = self.layout.tileAt(parent.state, move)
+        groupNum = self.groupOf[tile]
+        database = self.databases[groupNum]
+
+        index = 0
+        for pos in range(self.layout.size):
+            groupTile = self.layout.tileAt(parent.state, pos)
+            if groupTile != 0 and self.groupOf[groupTile] == groupNum:
+                index += pos * self.multipliers[self.indexInGroup[groupTile]]
+        childIndex = index + (parent.blank - move) * self.multipliers[self.indexInGroup[tile]]
+
+        return database[childIndex] - database[index]
@@ -5,8 +5,14 @@ This module contains the Puzzel class which runs the A* search and
 finds the solution to the given Board and to reach the given goal.
 """
 
+import heapq
+import time
+from itertools import count
+
 from Board import Board
 from HeuristicFunc import HeuristicFunc
+from SearchStats import SearchStats
+from Solvability import Solvability
 
 class Puzzel():
     """
@@ -15,16 +21,29 @@ class Puzzel():
     """
 
     """
-    This contains all the possible boards and 
-    is ordered from min to max heuristic score.
+    This contains all the possible boards as a binary heap
+    of (heuristic score, order added, board) entries so the
+    board with the min heuristic score is always at the top.
     """
     open = []
 
     """
-    This contains all the boards / states which have
-    been traversed.
+    This contains the keys of all the boards / states which
+    have been traversed.
     """
-    closed = []
+    closed = set()
+
+    """
+    This is the counter used to order boards with the same
+    heuristic score by when they were added to open.
+    """
+    order = None
+
+    """
+    This is the number of boards which have been expanded
+    (had their children generated) by the search.
+    """
+    expanded = 0
 
     """
     This is the start state (starting board).
@@ -36,7 +55,13 @@ class Puzzel():
     """
     heuristic = None
 
-    def __init__(self, board : Board, heuristic : HeuristicFunc) -> None:
+    """
+    This is the stats of the search, which are only
+    recorded if a SearchStats object is given.
+    """
+    stats = None
+
+    def __init__(self, board : Board, heuristic : HeuristicFunc, stats : SearchStats = None) -> None:
         """
         This is the initaliser for the Puzzel and asigns the first board
         to the initail attribute and adds it to the list of open boards.
@@ -47,12 +72,49 @@ class Puzzel():
         :type board: Board
         :param heuristic: The heuristic function being used.
         :type board: HeuristicFunc
+        :param stats: The stats to record the search in, if any.
+        :type stats: SearchStats
         """
         self.initial = board
         self.heuristic = heuristic
+        self.stats = stats
+        self.open = []
+        self.closed = set()
+        self.order = count()
+        self.expanded = 0
         board.hValue = self.heuristic.calculate(board)
-        self.open.append(self.initial)
-    
+        self.addToOpen(self.initial)
+
+    def addToOpen(self, board : Board) -> None:
+        """
+        This function pushes a board onto the open heap, keyed by its
+        heuristic score and then by the order it was added in.
+
+        :param board: The board being added to open.
+        :type board: Board
+        """
+        heapq.heappush(self.open, (board.hValue, next(self.order), board))
+        if self.stats != None and len(self.open) > self.stats.peakOpen:
+            self.stats.peakOpen = len(self.open)
+
+    def popFromOpen(self) -> Board:
+        """
+        This function pops the board with the min heuristic score from
+        the open heap. Entries for boards which have since been added to
+        closed are skipped (lazy deletion) rather than being removed from
+        the heap when they are closed.
+
+        :return : The board with the min heuristic score, or None if open is empty.
+        :rtype: Board
+        """
+        while self.open:
+            board = heapq.heappop(self.open)[2]
+            if self.notInClosed(board):
+                return board
+            if self.stats != None:
+                self.stats.stale += 1
+        return None
+
     def notInClosed(self, board):
         """
         This function checks if a board is in the closed list,
@@ -64,11 +126,7 @@ class Puzzel():
         :return : If Board is in closed.
         :rtype: bool
         """
-        for item in self.closed:
-            if item.board == board.board:
-                return False
-        
-        return True
+        return board.getKey() not in self.closed
 
     def getMinHValue(self, children):
         """
@@ -94,76 +152,100 @@ class Puzzel():
             
         return minValue
 
-    def getEarlyCount(self) -> int:
+    def calculateScore(self, board : Board) -> int:
         """
-        This function calculates the number of early pairs in the initial
-        board, this is used to then calculate if the board is solvable
-        or impossible to solve.
+        This function calculates the heuristic score of a board,
+        timing the heuristic if the stats are timed.
+
+        :param board: The board being scored.
+        :type board: Board
 
-        :return : The number of early pairs.
+        :return : The heuristic score of the board.
         :rtype: int
         """
-        earlyCount = 0
-
-        combinedInitial = []
-
-        for row in self.initial.board:
-            for item in row:
-                combinedInitial.append(item)
+        if self.stats != None and self.stats.timed:
+            startTime = time.perf_counter()
+            score = self.heuristic.calculate(board)
+            self.stats.heuristicTime += time.perf_counter() - startTime
+            return score
+        return self.heuristic.calculate(board)
+
+    def getChildren(self, board : Board) -> list:
+        """
+        This function generates the children of a board, timing
+        the generation if the stats are timed.
 
-        for i in range(0, 9):
-            for j in range(i+1, 9):
-                if combinedInitial[j] != "*" and combinedInitial[i] != "*" and combinedInitial[i] > combinedInitial[j]:
-                    earlyCount += 1
+        :param board: The board being expanded.
+        :type board: Board
 
-        return earlyCount
+        :return : The child boards.
+        :rtype: list
+        """
+        if self.stats != None and self.stats.timed:
+            startTime = time.perf_counter()
+            children = board.getChildrenBoards()
+            self.stats.childTime += time.perf_counter() - startTime
+            return children
+        return board.getChildrenBoards()
 
     def checkSolvable(self) -> bool:
         """
-        This function is used to check if the intial board is solvable.
+        This function is used to check if the intial board is solvable,
+        see Solvability.py for further details.
 
         :return : If the initial board is solvable.
         :rtype: bool
         """
-        earlyCount = self.getEarlyCount()
-
-        return (earlyCount % 2 == 0)
+        return Solvability(self.initial.goal).isSolvable(self.initial)
 
-    def solve(self) -> None:
+    def solve(self) -> str:
         """
         This function carries out the A* search and solves the
         board to reach the end goal.
 
-        The function displays all the moves that it is making.
+        :return : The moves of the empty tile (U, D, L or R) to reach the goal, or None if it can not be reached.
+        :rtype: str
         """
-        solution = []
+        solution = None
+
+        if self.stats != None:
+            self.stats.start()
+            self.stats.iterations += 1
 
         while True:
-            curBoard = self.open[0]
+            curBoard = self.popFromOpen()
+
+            if curBoard == None:
+                break
 
             if curBoard.isSolved():
-                solution = curBoard.getParents()
+                solution = curBoard.getMoves()
                 break
 
-            children = curBoard.getChildrenBoards()
+            children = self.getChildren(curBoard)
+            self.expanded += 1
 
             validChildren = []
 
             for child in children:
                 if self.notInClosed(child):
-                    child.hValue = self.heuristic.calculate(child)
+                    child.hValue = self.calculateScore(child)
                     validChildren.append(child)
 
+            if self.stats != None:
+                self.stats.expanded += 1
+                self.stats.generated += len(children)
+                self.stats.duplicates += len(children) - len(validChildren)
+
             minHVal = self.getMinHValue(validChildren)
 
-            for child in children:
+            for child in validChildren:
                 if child.hValue == minHVal:
-                    self.open.append(child)
-
-            self.open.remove(curBoard)
+                    self.addToOpen(child)
 
-            self.closed.append(curBoard)
+            self.closed.add(curBoard.getKey())
 
-            self.open.sort(key=lambda b:b.hValue, reverse=False)
+        if self.stats != None:
+            self.stats.stop()
 
         return solution
@@ -0,0 +1,144 @@
+"""
+SearchStats.py
+========================
+This module contains the SearchStats class which records counters and
+timings of a search, so solvers and heuristics can be compared.
+"""
+
+import time
+
+class SearchStats:
+    """
+    This class holds the counters (and optionally the timings) of one
+    search. It is passed to a solver when it is made, and the solver
+    only records anything if it has been given one.
+    """
+
+    """
+    The number of boards which have been expanded.
+    """
+    expanded = 0
+
+    """
+    The number of child boards which have been generated.
+    """
+    generated = 0
+
+    """
+    The largest number of entries in the open list (for IDA*,
+    the deepest path searched).
+    """
+    peakOpen = 0
+
+    """
+    The number of child boards which were dropped because
+    their state had already been closed.
+    """
+    duplicates = 0
+
+    """
+    The number of open list entries which were skipped when
+    popped because their state had since been closed.
+    """
+    stale = 0
+
+    """
+    The number of searches run (for IDA*, the number of bounds tried).
+    """
+    iterations = 0
+
+    """
+    If the time spent in each phase of the search is recorded.
+    """
+    timed = False
+
+    """
+    The seconds spent calculating heuristic scores (when timed).
+    """
+    heuristicTime = 0.0
+
+    """
+    The seconds spent generating child boards (when timed).
+    """
+    childTime = 0.0
+
+    """
+    The seconds the whole search took.
+    """
+    totalTime = 0.0
+
+    """
+    The time the search started, used to work out totalTime.
+    """
+    startTime = None
+
+    def __init__(self, timed : bool = False) -> None:
+        """
+        This is the initialiser for SearchStats.
+
+        :param timed: If the time spent in each phase of the search is recorded.
+        :type timed: bool
+        """
+        self.timed = timed
+
+    def start(self) -> None:
+        """
+        This function is called by a solver when its search starts.
+        """
+        self.startTime = time.perf_counter()
+
+    def stop(self) -> None:
+        """
+        This function is called by a solver when its search ends.
+        """
+        self.totalTime += time.perf_counter() - self.startTime
+
+    def add(self, other) -> None:
+        """
+        This function adds the counters and timings of another search to these stats.
+
+        :param other: The stats of the other search.
+        :type other: SearchStats
+        """
+        self.expanded += other.expanded
+        self.generated += other.generated
+        self.peakOpen = max(self.peakOpen, other.peakOpen)
+        self.duplicates += other.duplicates
+        self.stale += other.stale
+        self.iterations += other.iterations
+        self.heuristicTime += other.heuristicTime
+        self.childTime += other.childTime
+        self.totalTime += other.totalTime
+
+    def getNodesPerSecond(self) -> float:
+        """
+        This function returns the number of boards expanded per second.
+
+        :return : The number of boards expanded per second.
+        :rtype: float
+        """
+        if self.totalTime == 0:
+            return 0.0
+        return self.expanded / self.totalTime
+
+    def toDict(self) -> dict:
+        """
+        This function returns the stats as a dict, for example to be written as JSON.
+
+        :return : The stats.
+        :rtype: dict
+        """
+        stats = {
+            "expanded": self.expanded,
+            "generated": self.generated,
+            "peakOpen": self.peakOpen,
+            "duplicates": self.duplicates,
+            "stale": self.stale,
+            "iterations": self.iterations,
+            "totalTime": self.totalTime,
+            "nodesPerSecond": self.getNodesPerSecond()
+        }
+        if self.timed:
+            stats["heuristicTime"] = self.heuristicTime
+            stats["childTime"] = self.childTime
+        return stats
@@ -0,0 +1,137 @@
+"""
+Solvability.py
+========================
+This module contains the Solvability class which is used to check if
+boards can be solved to reach a given goal before they are searched.
+"""
+
+from Board import Board
+from Layout import Layout
+
+class Solvability:
+    """
+    This class checks if boards can reach a goal. Every tile (including
+    the empty tile) is relabelled by its position in the goal, so the board
+    becomes a permutation which is the identity at the goal. Each move swaps
+    the empty tile with one next to it, which changes both the parity of the
+    permutation and the parity of the distance of the empty tile from its goal
+    position. A board is therefore solvable exactly when the two parities match.
+
+    The number of early pairs (inversions) in the permutation is counted in
+    O(n log n) with a Fenwick tree, so large boards can be checked in bulk.
+    """
+
+    """
+    The layout of the goal board.
+    """
+    layout = None
+
+    """
+    The position of each tile in the goal, indexed
+    by tile (0 for the empty tile).
+    """
+    goalPositions = []
+
+    def __init__(self, goal : list) -> None:
+        """
+        This is the initialiser for Solvability and works out the position
+        of every tile in the goal.
+
+        :param goal: The goal state.
+        :type goal: list
+        """
+        self.layout = Layout.get(len(goal), len(goal[0]))
+        goalState = self.layout.pack(goal)[0]
+        self.goalPositions = [0] * self.layout.size
+        for pos in range(self.layout.size):
+            self.goalPositions[self.layout.tileAt(goalState, pos)] = pos
+
+    def countEarlyPairs(self, values : list) -> int:
+        """
+        This function counts the number of early pairs (pairs where the larger
+        value comes first) in a list of the distinct integers 0 to len(values) - 1,
+        using a Fenwick tree of how many of each value have been seen so far.
+
+        :param values: The list of values.
+        :type values: list
+
+        :return : The number of early pairs.
+        :rtype: int
+        """
+        size = len(values)
+        tree = [0] * (size + 1)
+        earlyCount = 0
+
+        for seen in range(size):
+            # count the values seen so far which are no larger than this one.
+            i = values[seen] + 1
+            notLarger = 0
+            while i > 0:
+                notLarger += tree[i]
+                i -= i & -i
+            earlyCount += seen - notLarger
+
+            i = values[seen] + 1
+            while i <= size:
+                tree[i] += 1
+                i += i & -i
+
+        return earlyCount
+
+    def getParity(self, state : int, blank : int) -> int:
+        """
+        This function calculates the parity of a packed board relative to the
+        goal, which is the parity of the number of early pairs once the tiles
+        are relabelled by their goal positions plus the distance of the empty
+        tile from its goal position. It is 0 for every board which can reach the goal.
+
+        :param state: The packed board.
+        :type state: int
+        :param blank: The position of the empty tile in the board.
+        :type blank: int
+
+        :return : The parity (0 or 1) of the board.
+        :rtype: int
+        """
+        relabelled = []
+        for pos in range(self.layout.size):
+            relabelled.append(self.goalPositions[self.layout.tileAt(state, pos)])
+
+        goalBlank = self.goalPositions[0]
+        cols = self.layout.cols
+        distance = abs(blank % cols - goalBlank % cols) + abs(blank // cols - goalBlank // cols)
+
+        return (self.countEarlyPairs(relabelled) + distance) % 2
+
+    def isSolvable(self, board : Board) -> bool:
+        """
+        This function checks if a board can reach the goal.
+
+        :param board: The board being checked.
+        :type board: Board
+
+        :return : If the board is solvable.
+        :rtype: bool
+        """
+        return self.getParity(board.state, board.blank) == 0
+
+    def checkAll(self, boards : list) -> list:
+        """
+        This function checks if each board in a list can reach the goal, so that
+        a batch of boards can be screened before any of them are searched. The
+        boards can be given either as Board objects or as lists of rows.
+
+        :param boards: The boards being checked.
+        :type boards: list
+
+        :return : If each board is solvable, in the same order as the boards.
+        :rtype: list
+        """
+        results = []
+        for board in boards:
+            if isinstance(board, Board):
+                state, blank = board.state, board.blank
+            else:
+                state, blank = self.layout.pack(board)
+            results.append(self.getParity(state, blank) == 0)
+        return results
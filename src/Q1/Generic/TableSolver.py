@@ -0,0 +1,78 @@
+"""
+TableSolver.py
+========================
+This module contains the TableSolver class which solves a board by
+following the best next moves held in a DistanceTable, with no search.
+"""
+
+from Board import Board
+from HeuristicFunc import HeuristicFunc
+from DistanceTable import DistanceTable
+from Puzzel import Puzzel
+from SearchStats import SearchStats
+
+class TableSolver(Puzzel):
+    """
+    This class solves a board with at most nine positions by looking up
+    its best next move in a DistanceTable and making it until the goal is
+    reached, so an optimal solution is found in one lookup per move.
+    """
+
+    """
+    The distance table being followed.
+    """
+    table = None
+
+    def __init__(self, board : Board, heuristic : HeuristicFunc, stats : SearchStats = None) -> None:
+        """
+        This is the initialiser for the TableSolver. If the heuristic is not a
+        DistanceTable, the table for the board's goal is loaded (or built) instead.
+
+        :param board: The starting board (state).
+        :type board: Board
+        :param heuristic: The heuristic function being used.
+        :type board: HeuristicFunc
+        :param stats: The stats to record the search in, if any.
+        :type stats: SearchStats
+        """
+        super().__init__(board, heuristic, stats)
+
+        if isinstance(heuristic, DistanceTable):
+            self.table = heuristic
+        else:
+            self.table = DistanceTable(board.goal)
+
+    def solve(self) -> str:
+        """
+        This function follows the best next moves in the table from the
+        initial board to the goal.
+
+        :return : The moves of the empty tile (U, D, L or R) to reach the goal, or None if it can not be reached.
+        :rtype: str
+        """
+        if self.stats != None:
+            self.stats.start()
+            self.stats.iterations += 1
+
+        layout = self.initial.layout
+        names = None
+        state, blank = self.initial.state, self.initial.blank
+        entry = self.table.lookup(state)
+
+        if entry != None:
+            names = []
+            for step in range(entry[0]):
+                direction = self.table.lookup(state)[1]
+                names.append(layout.directionNames[direction])
+                move = layout.steps[blank][direction]
+                state, blank = layout.move(state, blank, move), move
+                self.expanded += 1
+
+        if self.stats != None:
+            self.stats.expanded += self.expanded
+            self.stats.stop()
+
+        if names == None:
+            return None
+
+        return "".join(names)
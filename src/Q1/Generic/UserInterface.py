@@ -11,22 +11,40 @@ class UserInterface:
         This initialised the UserInterface"""
         pass 
     
-    def getBoard(self, boardName : str) -> list:
+    def getDimensions(self) -> tuple:
+        """
+        This function is used to get the number of rows and columns
+        of the boards from the user.
+
+        :return : The number of rows and columns.
+        :rtype: tuple
+        """
+        dimensions = input("Enter the number of rows and columns of the board (e.g. 3 3) :").split()
+        if len(dimensions) != 2:
+            raise Exception("Error : Enter the number of rows and the number of columns.")
+        return int(dimensions[0]), int(dimensions[1])
+
+    def getBoard(self, boardName : str, numRow : int = 3, numCol : int = 3) -> list:
         """
         This function is used to get a board from the user.
 
         :param boardName: This is the name of the board you are requesting.
         :type boardName: str
+        :param numRow: This is the number of rows in the board.
+        :type numRow: int
+        :param numCol: This is the number of columns in the board.
+        :type numCol: int
 
         :return : The board entered by the user as a list.
         :rtype: list
         """
         print(f"Enter your {boardName} Board")
         print("Enter with one space between each value and represent the empty tile as a '*'")
-        numRow = 3
         board = []
         for i in range(numRow):
             row = input().split()
+            if len(row) != numCol:
+                raise Exception(f"Error : Each row must have {numCol} values.")
             board.append(row)
         return board
     
@@ -38,38 +56,54 @@ class UserInterface:
         :return : The identifier of chosen heuristic.
         :rtype: str
         """
-        return input("Would you like to use Manhattan Distance (MD) or Misplaced Tiles (MT) :")
+        return input("Would you like to use Manhattan Distance (MD), Misplaced Tiles (MT), Linear Conflict (LC), Walking Distance (WD, 4x4 or smaller), Pattern Database (PDB) or Distance Table (DT, 3x3 or smaller) :")
 
-    def printSolution(self, solution : list, goal : list):
+    def getSolverMethod(self):
+        """"
+        This functions gets the identifier of the search algorithm the user
+        wants to use to solve the puzzle.
+
+        :return : The identifier of chosen search algorithm.
+        :rtype: str
+        """
+        return input("Would you like to use A* (AS), Iterative Deepening A* (IDA), Bidirectional A* (BI), Parallel A* (HDA) or Table Lookup (TB, 3x3 or smaller) :")
+
+    def printSolution(self, solution : str, initial):
         """
         This function prints out the solution in a formated and easy
         to follow way. This allows the user to easily follow the steps
-        being taken.
+        being taken. The boards are made from the move string one at a
+        time as they are printed.
+
+        :param solution: The moves of the empty tile (U, D, L or R), or None if no solution was found.
+        :type solution: str
+        :param initial: The initial board.
+        :type initial: Board
         """
 
+        if solution == None:
+            print("No solution was found from the given Initial State to the Goal State.")
+            return
+
         print("Solution to given Initial and Goal States")
 
         print("Moves to reach Goal: ", len(solution))
 
-        for move in solution:
-            print(move.toString())
-
-            print(" | ")
-            print(" | ")
-            print(" | ")
-            print(" V \n")
-
-        print("---")
-        for row in goal:
-            print("|", end=" ")
-            for num in row:
-                print(num, "|", end=" ")
-            print("")
-        print("---")
+        print("Moves of the empty tile: ", solution)
+
+        for step, board in enumerate(initial.replay(solution)):
+            if step > 0:
+                print(" | ")
+                print(" | ")
+                print(" | ")
+                print(" V \n")
+
+            print(board.toString())
     
     def puzzleNotSolvable(self):
         """
         This function informs the user that the initial state they entered is not solvable.
         """
         print("The Initial State you have entered is not solvable.")
-        print("The number of early pairs is odd, see report for further details.")
\ No newline at end of file
+        print("The parity of the number of early pairs (relative to the goal) does not match the parity")
+        print("of the distance of the empty tile from its goal position, see report for further details.")
\ No newline at end of file
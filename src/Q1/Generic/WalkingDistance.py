@@ -0,0 +1,246 @@
+"""
+WalkingDistance.py
+=============================
+This module contains the code for a WalkingDistance class which is a
+child of the HeuristicFunc class. It counts the up/down and left/right
+moves needed using tables built once with a breadth first search.
+"""
+
+from collections import deque
+
+from HeuristicFunc import HeuristicFunc
+
+
+class WalkingDistance(HeuristicFunc):
+    """
+    This class defines the heuristic function for walking distance. For
+    the up/down moves, a board is reduced to how many tiles in each row
+    belong in each row of the goal, along with the row of the empty tile.
+    An up/down move swaps the empty tile with any tile in the row above or
+    below, so the fewest up/down moves needed to reach the goal from every
+    such reduced board can be found with one breadth first search. The same
+    is done for columns and left/right moves, and as every move is either
+    up/down or left/right the two counts can be added together.
+
+    A reduced board is stored as a key which is the sum of a part for each
+    tile in each position (and for the empty tile in each line), so the key
+    of a board is read like the Manhattan distance and is changed by a move
+    in one step.
+    """
+
+    """
+    The tables of moves needed, keyed by the number of lines, the
+    number of positions in each line and the goal line of the empty tile.
+    """
+    tables = {}
+
+    """
+    The largest number of rows or columns a board may have, as the
+    tables grow too quickly to build for boards with five or more.
+    """
+    maxLines = 4
+
+    """
+    The number of bits used for each count in a key.
+    """
+    countBits = 3
+
+    """
+    The part of the row key given by each tile in each position,
+    indexed by tile (0 for the empty tile) and then by position.
+    """
+    rowParts = []
+
+    """
+    The part of the column key given by each tile in each position,
+    indexed by tile (0 for the empty tile) and then by position.
+    """
+    colParts = []
+
+    """
+    The moves needed for each row key.
+    """
+    rowTable = {}
+
+    """
+    The moves needed for each column key.
+    """
+    colTable = {}
+
+    """
+    The row and column keys of the states scored most recently, keyed by
+    state, so delta can change the keys of the parent in one step rather
+    than reading them from every position.
+    """
+    keys = {}
+
+    """
+    The largest number of states kept in keys, after which it is emptied.
+    """
+    maxKeys = 1 << 16
+
+    def __init__(self, goal) -> None:
+        #Docstrings inherited from HeuristicFunc
+        #See HeuristicFunc.py for further details
+        super().__init__(goal)
+
+        layout = self.layout
+        rows, cols = layout.rows, layout.cols
+
+        if max(rows, cols) > self.maxLines:
+            raise Exception(f"Error : Walking distance can only be used for boards with at most {self.maxLines} rows and columns.")
+
+        self.countBits = max(rows, cols).bit_length()
+
+        goalRows = [goalPos // cols for goalPos in self.goalPositions]
+        goalCols = [goalPos % cols for goalPos in self.goalPositions]
+        positionRows = [pos // cols for pos in range(layout.size)]
+        positionCols = [pos % cols for pos in range(layout.size)]
+
+        self.rowParts = self.getParts(positionRows, goalRows, rows)
+        self.colParts = self.getParts(positionCols, goalCols, cols)
+        self.rowTable = self.getTable(rows, cols, goalRows[0])
+        self.colTable = self.getTable(cols, rows, goalCols[0])
+        self.keys = {}
+
+    def getParts(self, positionLines : list, goalLines : list, numLines : int) -> list:
+        """
+        This function builds the part of a key given by each tile in each position.
+
+        :param positionLines: The line each position is in.
+        :type positionLines: list
+        :param goalLines: The goal line of each tile.
+        :type goalLines: list
+        :param numLines: The number of lines.
+        :type numLines: int
+
+        :return : The part of the key, indexed by tile and then by position.
+        :rtype: list
+        """
+        blankShift = numLines * numLines * self.countBits
+        parts = [[line << blankShift for line in positionLines]]
+        for tile in range(1, len(goalLines)):
+            parts.append([1 << ((line * numLines + goalLines[tile]) * self.countBits) for line in positionLines])
+        return parts
+
+    def getTable(self, numLines : int, lineLength : int, blankLine : int) -> dict:
+        """
+        This function returns the moves needed from every reduced board with the
+        given shape, building the table with a breadth first search from the goal
+        the first time it is asked for.
+
+        :param numLines: The number of lines.
+        :type numLines: int
+        :param lineLength: The number of positions in each line.
+        :type lineLength: int
+        :param blankLine: The goal line of the empty tile.
+        :type blankLine: int
+
+        :return : The moves needed, keyed by the key of the reduced board.
+        :rtype: dict
+        """
+        key = (numLines, lineLength, blankLine)
+        if key in self.tables:
+            return self.tables[key]
+
+        bits = self.countBits
+        blankShift = numLines * numLines * bits
+
+        goalKey = blankLine << blankShift
+        for line in range(numLines):
+            count = lineLength - 1 if line == blankLine else lineLength
+            goalKey += count << ((line * numLines + line) * bits)
+
+        table = {goalKey: 0}
+        queue = deque([goalKey])
+        countMask = (1 << bits) - 1
+
+        while queue:
+            state = queue.popleft()
+            blank = state >> blankShift
+            distance = table[state]
+            for line in (blank - 1, blank + 1):
+                if line < 0 or line >= numLines:
+                    continue
+                for goalLine in range(numLines):
+                    shift = (line * numLines + goalLine) * bits
+                    if (state >> shift) & countMask == 0:
+                        continue
+                    # a tile bound for goalLine swaps lines with the empty tile.
+                    child = (state - (1 << shift) + (1 << ((blank * numLines + goalLine) * bits))
+                             + ((line - blank) << blankShift))
+                    if child not in table:
+                        table[child] = distance + 1
+                        queue.append(child)
+
+        self.tables[key] = table
+        return table
+
+    def storeKeys(self, state : int, rowKey : int, colKey : int) -> None:
+        """
+        This function keeps the keys of a state for later calls to delta.
+
+        :param state: The packed state.
+        :type state: int
+        :param rowKey: The row key of the state.
+        :type rowKey: int
+        :param colKey: The column key of the state.
+        :type colKey: int
+        """
+        if len(self.keys) >= self.maxKeys:
+            self.keys.clear()
+        self.keys[state] = (rowKey, colKey)
+
+    def getKeys(self, state : int) -> tuple:
+        """
+        This function returns the row and column keys of a state, reading
+        them from every position if they have not been kept.
+
+        :param state: The packed state.
+        :type state: int
+
+        :return : The row key and column key.
+        :rtype: tuple
+        """
+        keys = self.keys.get(state)
+        if keys == None:
+            layout = self.layout
+            rowKey = 0
+            colKey = 0
+
+            for pos in range(layout.size):
+                tile = layout.tileAt(state, pos)
+                rowKey += self.rowParts[tile][pos]
+                colKey += self.colParts[tile][pos]
+
+            keys = (rowKey, colKey)
+            self.storeKeys(state, rowKey, colKey)
+        return keys
+
+    def calculateHScore(self, board):
+        #Docstrings inherited from HeuristicFunc
+        #See HeuristicFunc.py for further details
+        rowKey, colKey = self.getKeys(board.state)
+        return self.rowTable[rowKey] + self.colTable[colKey]
+
+    def delta(self, parent, move):
+        #Docstrings inherited from HeuristicFunc
+        #See HeuristicFunc.py for further details
+        layout = self.layout
+        rowKey, colKey = self.getKeys(parent.state)
+        tile = layout.tileAt(parent.state, move)
+        childState = layout.move(parent.state, parent.blank, move)
+
+        # only the key of the direction the empty tile moves in changes.
+        if layout.getDirection(parent.blank, move) < 2:
+            parts = self.rowParts
+            childRowKey = (rowKey - parts[tile][move] + parts[tile][parent.blank]
+                           - parts[0][parent.blank] + parts[0][move])
+            self.storeKeys(childState, childRowKey, colKey)
+            return self.rowTable[childRowKey] - self.rowTable[rowKey]
+
+        parts = self.colParts
+        childColKey = (colKey - parts[tile][move] + parts[tile][parent.blank]
+                       - parts[0][parent.blank] + parts[0][move])
+        self.storeKeys(childState, rowKey, childColKey)
+        return self.colTable[childColKey] - self.colTable[colKey]
@@ -0,0 +1,335 @@
+"""
+batch.py
+====================
+This module contains the runner methods which solve many boards from a file
+at once, spread across a pool of worker processes. Each line of the file
+holds one initial board, either as the tiles separated by spaces or (for
+boards with fewer than 10 positions) as one string of digits, with the empty
+tile as '*', '0' or '_'. Blank lines and lines starting with '#' are skipped.
+
+A line of JSON is written for every board, in the same order as the file:
+
+    python batch.py boards.txt --goal "* 1 2 3 4 5 6 7 8" --workers 8 --timeout 10
+"""
+
+import argparse
+import json
+import math
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from Board import Board
+from ManhattanDistance import ManhattanDistance
+from MispacedTiles import MisplacedTiles
+from LinearConflict import LinearConflict
+from WalkingDistance import WalkingDistance
+from PatternDatabase import PatternDatabase
+from DistanceTable import DistanceTable
+from Puzzel import Puzzel
+from IDAStar import IDAStar
+from BidirectionalAStar import BidirectionalAStar
+from TableSolver import TableSolver
+from ParallelAStar import ParallelAStar
+from Solvability import Solvability
+from SearchStats import SearchStats
+from GoalRelabeling import GoalRelabeling
+
+"""
+The heuristic functions which can be chosen, keyed by
+the same identifiers as the interactive runner.
+"""
+heuristics = {"MD": ManhattanDistance, "MT": MisplacedTiles, "LC": LinearConflict, "WD": WalkingDistance,
+              "PDB": PatternDatabase, "DT": DistanceTable}
+
+"""
+The search algorithms which can be chosen, keyed by
+the same identifiers as the interactive runner.
+"""
+solvers = {"AS": Puzzel, "IDA": IDAStar, "BI": BidirectionalAStar, "HDA": ParallelAStar, "TB": TableSolver}
+
+"""
+The goal, heuristic, solver and timeout used by this worker
+process, set up once by initWorker.
+"""
+workerSettings = {}
+
+
+class SolveTimeout(Exception):
+    """
+    This exception is raised inside a worker when a board
+    takes longer than the timeout to solve.
+    """
+    pass
+
+
+def parseBoard(line : str, numRow : int = None, numCol : int = None) -> list:
+    """
+    This function turns one line of the file into a board, as a list of rows.
+    If the dimensions are not given the board is taken to be square.
+
+    :param line: The line holding the board.
+    :type line: str
+    :param numRow: The number of rows in the board.
+    :type numRow: int
+    :param numCol: The number of columns in the board.
+    :type numCol: int
+
+    :return : The board as a list of rows.
+    :rtype: list
+    """
+    tiles = line.split()
+    if len(tiles) == 1:
+        tiles = list(tiles[0])
+    tiles = ["*" if tile in ("0", "_") else tile for tile in tiles]
+
+    if numRow == None or numCol == None:
+        numRow = numCol = math.isqrt(len(tiles))
+
+    if numRow * numCol != len(tiles):
+        raise Exception(f"Error : Board '{line}' does not have {numRow}x{numCol} tiles.")
+
+    return [tiles[row * numCol: (row + 1) * numCol] for row in range(numRow)]
+
+
+def readBoards(fileName : str):
+    """
+    This generator reads the file one line at a time and yields the
+    line number and line of every board in it.
+
+    :param fileName: The path to the file of boards.
+    :type fileName: str
+
+    :return : The line number and line of each board.
+    :rtype: generator
+    """
+    with open(fileName, "r") as file:
+        for lineNum, line in enumerate(file, 1):
+            line = line.strip()
+            if line != "" and not line.startswith("#"):
+                yield lineNum, line
+
+
+def readChunks(fileName : str, chunkSize : int):
+    """
+    This generator groups the boards in the file into lists of chunkSize
+    boards, so each worker is sent a chunk at a time.
+
+    :param fileName: The path to the file of boards.
+    :type fileName: str
+    :param chunkSize: The number of boards in each chunk.
+    :type chunkSize: int
+
+    :return : The chunks of (line number, line) pairs.
+    :rtype: generator
+    """
+    chunk = []
+    for item in readBoards(fileName):
+        chunk.append(item)
+        if len(chunk) == chunkSize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def raiseTimeout(signum, frame):
+    """
+    This function is the alarm signal handler used to stop a solve.
+    """
+    raise SolveTimeout()
+
+
+def initWorker(goal : list, heuristicMeth : str, solverMeth : str, timeout : float, searchWorkers : int = 1) -> None:
+    """
+    This function sets up a worker process, building the heuristic for the
+    canonical goal once so that every board the worker solves uses the same one.
+    Solutions are also kept by the relabeling, so a board which is the same as
+    one already solved (once its tiles are renamed) is not solved again.
+
+    :param goal: The goal board / state.
+    :type goal: list
+    :param heuristicMeth: The identifier of the heuristic to use.
+    :type heuristicMeth: str
+    :param solverMeth: The identifier of the search algorithm to use.
+    :type solverMeth: str
+    :param timeout: The number of seconds a board may take to solve, or None for no limit.
+    :type timeout: float
+    :param searchWorkers: The number of processes a parallel search (HDA) may use.
+    :type searchWorkers: int
+    """
+    workerSettings["goal"] = goal
+    workerSettings["relabeling"] = GoalRelabeling(goal)
+    workerSettings["heuristic"] = heuristics[heuristicMeth]
+    workerSettings["relabeling"].getHeuristic(heuristics[heuristicMeth])
+    workerSettings["solver"] = solvers[solverMeth]
+    workerSettings["options"] = {"workers": searchWorkers} if solvers[solverMeth] == ParallelAStar else {}
+    workerSettings["solvability"] = Solvability(goal)
+    workerSettings["timeout"] = timeout
+    signal.signal(signal.SIGALRM, raiseTimeout)
+
+
+def solveBoard(lineNum : int, line : str) -> dict:
+    """
+    This function solves one board in a worker process.
+
+    :param lineNum: The line number of the board in the file.
+    :type lineNum: int
+    :param line: The line holding the board.
+    :type line: str
+
+    :return : The result of solving the board.
+    :rtype: dict
+    """
+    goal = workerSettings["goal"]
+    result = {"line": lineNum, "board": line}
+    startTime = time.perf_counter()
+
+    try:
+        board = Board(parseBoard(line, len(goal), len(goal[0])), 0, goal)
+
+        if not workerSettings["solvability"].isSolvable(board):
+            result["status"] = "unsolvable"
+        else:
+            stats = SearchStats()
+            try:
+                if workerSettings["timeout"] != None:
+                    signal.setitimer(signal.ITIMER_REAL, workerSettings["timeout"])
+                solution = workerSettings["relabeling"].solve(workerSettings["solver"], board, workerSettings["heuristic"], stats,
+                                                                  workerSettings["options"])
+                if solution == None:
+                    result["status"] = "unsolved"
+                else:
+                    result["status"] = "solved"
+                    result["moves"] = len(solution)
+                    result["solution"] = solution
+            except SolveTimeout:
+                result["status"] = "timeout"
+            finally:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+            result["expanded"] = stats.expanded
+
+    except Exception as error:
+        result["status"] = "error"
+        result["error"] = str(error)
+
+    result["time"] = time.perf_counter() - startTime
+    return result
+
+
+def solveChunk(chunk : list) -> list:
+    """
+    This function solves a chunk of boards in a worker process.
+
+    :param chunk: The (line number, line) pairs of the boards.
+    :type chunk: list
+
+    :return : The result of each board in the chunk.
+    :rtype: list
+    """
+    return [solveBoard(lineNum, line) for lineNum, line in chunk]
+
+
+def getArguments(args : list = None) -> argparse.Namespace:
+    """
+    This function reads the command line arguments.
+
+    :param args: The arguments, by default those given to the program.
+    :type args: list
+
+    :return : The parsed arguments.
+    :rtype: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description="Solve a file of sliding puzzles, one initial board per line.")
+    parser.add_argument("boards", help="the file of initial boards")
+    parser.add_argument("--goal", default=None, help="the goal board in the same format as the file (default '* 1 2 ... n-1')")
+    parser.add_argument("--rows", type=int, default=None, help="the number of rows (default: square boards)")
+    parser.add_argument("--cols", type=int, default=None, help="the number of columns (default: square boards)")
+    parser.add_argument("--heuristic", choices=sorted(heuristics), default="MD", help="the heuristic function to use")
+    parser.add_argument("--solver", choices=sorted(solvers), default="AS", help="the search algorithm to use")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="the number of worker processes (for HDA, the number used by each search)")
+    parser.add_argument("--chunksize", type=int, default=16, help="the number of boards sent to a worker at once")
+    parser.add_argument("--timeout", type=float, default=None, help="the number of seconds each board may take to solve")
+    parser.add_argument("--output", default=None, help="the file to write the JSON lines to (default: stdout)")
+    return parser.parse_args(args)
+
+
+def getGoal(arguments : argparse.Namespace) -> list:
+    """
+    This function gets the goal board from the arguments, defaulting to the
+    empty tile followed by the tiles in order. The size of the default goal
+    is taken from the dimensions or else from the first board in the file.
+
+    :param arguments: The parsed arguments.
+    :type arguments: argparse.Namespace
+
+    :return : The goal board as a list of rows.
+    :rtype: list
+    """
+    if arguments.goal != None:
+        return parseBoard(arguments.goal, arguments.rows, arguments.cols)
+
+    numRow, numCol = arguments.rows, arguments.cols
+    if numRow == None or numCol == None:
+        for lineNum, line in readBoards(arguments.boards):
+            board = parseBoard(line)
+            numRow, numCol = len(board), len(board[0])
+            break
+
+    if numRow == None or numCol == None:
+        raise Exception("Error : The size of the goal can not be worked out as the file has no boards, give --goal or --rows and --cols.")
+
+    tiles = ["*"] + [str(tile) for tile in range(1, numRow * numCol)]
+    return [tiles[row * numCol: (row + 1) * numCol] for row in range(numRow)]
+
+
+def run(arguments : argparse.Namespace) -> None:
+    """
+    This function solves every board in the file across the worker pool and
+    writes the results as they finish, in the order of the file. Only a few
+    chunks per worker are read ahead, so the file is streamed rather than
+    loaded all at once.
+
+    :param arguments: The parsed arguments.
+    :type arguments: argparse.Namespace
+    """
+    goal = getGoal(arguments)
+
+    # build the heuristic once here so any tables are cached before the workers load them.
+    GoalRelabeling(goal).getHeuristic(heuristics[arguments.heuristic])
+
+    if arguments.output != None:
+        output = open(arguments.output, "w")
+    else:
+        output = sys.stdout
+
+    # a parallel search already uses a process per worker, so its boards are
+    # solved one at a time rather than starting workers in every pool process.
+    if solvers[arguments.solver] == ParallelAStar:
+        poolWorkers, searchWorkers = 1, arguments.workers
+    else:
+        poolWorkers, searchWorkers = arguments.workers, 1
+
+    initArgs = (goal, arguments.heuristic, arguments.solver, arguments.timeout, searchWorkers)
+
+    try:
+        with ProcessPoolExecutor(max_workers=poolWorkers, initializer=initWorker, initargs=initArgs) as executor:
+            pending = []
+            for chunk in readChunks(arguments.boards, arguments.chunksize):
+                pending.append(executor.submit(solveChunk, chunk))
+                if len(pending) >= poolWorkers * 2:
+                    for result in pending.pop(0).result():
+                        output.write(json.dumps(result) + "\n")
+            for future in pending:
+                for result in future.result():
+                    output.write(json.dumps(result) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+
+    run(getArguments())
@@ -0,0 +1,282 @@
+"""
+benchmark.py
+====================
+This module contains the runner methods which benchmark every chosen
+heuristic and search algorithm on the same set of boards. The boards are
+random (but seeded, so every run uses the same boards) solvable boards,
+grouped by the length of their optimal solution:
+
+    python benchmark.py --rows 3 --cols 3 --depths 8 14 20 26 --per-depth 5 --seed 0
+
+A summary table is printed and each run can also be written as a line of JSON.
+"""
+
+import argparse
+import json
+import random
+import signal
+import tracemalloc
+
+from Board import Board
+from IDAStar import IDAStar
+from PatternDatabase import PatternDatabase
+from SearchStats import SearchStats
+from batch import heuristics, solvers, SolveTimeout, raiseTimeout
+
+
+def getGoal(numRow : int, numCol : int) -> list:
+    """
+    This function returns the goal used by the benchmark, which is the
+    empty tile followed by the tiles in order.
+
+    :param numRow: The number of rows in the board.
+    :type numRow: int
+    :param numCol: The number of columns in the board.
+    :type numCol: int
+
+    :return : The goal board as a list of rows.
+    :rtype: list
+    """
+    tiles = ["*"] + [str(tile) for tile in range(1, numRow * numCol)]
+    return [tiles[row * numCol: (row + 1) * numCol] for row in range(numRow)]
+
+
+def getBoards(goal : list, depths : list, perDepth : int, seed : int, maxAttempts : int) -> dict:
+    """
+    This function makes the boards to benchmark with. Each board is made by a
+    seeded random walk of the empty tile from the goal (which never undoes the
+    last move), and its optimal solution length is then found with IDA* and a
+    pattern database. Boards are kept until there are perDepth boards for every
+    depth, or maxAttempts boards have been tried.
+
+    :param goal: The goal board.
+    :type goal: list
+    :param depths: The optimal solution lengths to make boards for.
+    :type depths: list
+    :param perDepth: The number of boards to make for each depth.
+    :type perDepth: int
+    :param seed: The seed of the random walks.
+    :type seed: int
+    :param maxAttempts: The largest number of random walks to try.
+    :type maxAttempts: int
+
+    :return : The boards (as lists of rows) for each depth.
+    :rtype: dict
+    """
+    rnd = random.Random(seed)
+    exact = PatternDatabase(goal)
+    goalBoard = Board(goal, 0, goal)
+    layout = goalBoard.layout
+
+    boards = {depth: [] for depth in depths}
+    attempts = 0
+
+    while attempts < maxAttempts and any(len(boards[depth]) < perDepth for depth in depths):
+        attempts += 1
+        target = rnd.choice([depth for depth in depths if len(boards[depth]) < perDepth])
+
+        walk = Board(goal, 0, goal)
+        previous = None
+        for step in range(target + rnd.randint(0, target)):
+            moves = [move for move in layout.neighbours[walk.blank] if move != previous]
+            previous = walk.blank
+            walk.moveBlank(rnd.choice(moves))
+
+        depth = len(IDAStar(walk, exact).solve())
+        if depth in boards and len(boards[depth]) < perDepth:
+            boards[depth].append(walk.board)
+
+    return boards
+
+
+def runBoard(solverMeth : str, heuristic, grid : list, goal : list, timeout : float, memory : bool) -> dict:
+    """
+    This function solves one board with one search algorithm and heuristic and
+    returns the stats of the search. If memory is True the board is solved a
+    second time with tracemalloc running, so tracing does not slow down the
+    timed run, and the peak memory of that run is also returned (for HDA
+    this is only the main process, not its workers). A search
+    algorithm which can not be used for the board is given an error status.
+
+    :param solverMeth: The identifier of the search algorithm.
+    :type solverMeth: str
+    :param heuristic: The heuristic function to use.
+    :type heuristic: HeuristicFunc
+    :param grid: The board to solve.
+    :type grid: list
+    :param goal: The goal board.
+    :type goal: list
+    :param timeout: The number of seconds the board may take to solve, or None for no limit.
+    :type timeout: float
+    :param memory: If the peak memory of the search is measured.
+    :type memory: bool
+
+    :return : The result of the run.
+    :rtype: dict
+    """
+    stats = SearchStats(timed=True)
+    result = {}
+
+    try:
+        if timeout != None:
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        solution = solvers[solverMeth](Board(grid, 0, goal), heuristic, stats=stats).solve()
+        if solution == None:
+            result["status"] = "unsolved"
+        else:
+            result["status"] = "solved"
+            result["moves"] = len(solution)
+
+        if memory and solution != None:
+            # the measured run is given its own timeout, and no peak is kept if it runs out.
+            if timeout != None:
+                signal.setitimer(signal.ITIMER_REAL, timeout)
+            tracemalloc.start()
+            try:
+                solvers[solverMeth](Board(grid, 0, goal), heuristic).solve()
+                result["peakMemory"] = tracemalloc.get_traced_memory()[1]
+            except SolveTimeout:
+                pass
+            finally:
+                tracemalloc.stop()
+
+    except SolveTimeout:
+        result["status"] = "timeout"
+    except Exception as error:
+        result["status"] = "error"
+        result["error"] = str(error)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+    result.update(stats.toDict())
+    return result
+
+
+def summarise(results : list) -> list:
+    """
+    This function groups the results by search algorithm, heuristic and
+    depth and works out the totals and means of each group.
+
+    :param results: The result of every run.
+    :type results: list
+
+    :return : One row of the summary per group.
+    :rtype: list
+    """
+    groups = {}
+    for result in results:
+        key = (result["solver"], result["heuristic"], result["depth"])
+        groups.setdefault(key, []).append(result)
+
+    rows = []
+    for (solverMeth, heuristicMeth, depth), group in sorted(groups.items()):
+        solved = [result for result in group if result["status"] == "solved"]
+        expanded = sum(result["expanded"] for result in solved)
+        totalTime = sum(result["totalTime"] for result in solved)
+        row = {
+            "solver": solverMeth,
+            "heuristic": heuristicMeth,
+            "depth": depth,
+            "runs": len(group),
+            "solved": len(solved),
+            "errors": sum(1 for result in group if result["status"] == "error"),
+            "meanMoves": sum(result["moves"] for result in solved) / max(len(solved), 1),
+            "meanExpanded": expanded / max(len(solved), 1),
+            "meanTime": totalTime / max(len(solved), 1),
+            "nodesPerSecond": expanded / totalTime if totalTime > 0 else 0.0
+        }
+        peaks = [result["peakMemory"] for result in solved if "peakMemory" in result]
+        if peaks:
+            row["peakMemory"] = max(peaks)
+        rows.append(row)
+    return rows
+
+
+def printSummary(rows : list) -> None:
+    """
+    This function prints the summary as a table.
+
+    :param rows: The rows of the summary.
+    :type rows: list
+    """
+    print(f"{'solver':<7}{'heur':<6}{'depth':>6}{'solved':>9}{'errors':>7}{'moves':>8}{'expanded':>12}{'time (s)':>11}{'nodes/s':>11}{'peak KiB':>10}")
+    for row in rows:
+        peak = f"{row['peakMemory'] / 1024:.0f}" if "peakMemory" in row else "-"
+        print(f"{row['solver']:<7}{row['heuristic']:<6}{row['depth']:>6}{row['solved']:>4}/{row['runs']:<4}{row['errors']:>7}"
+              f"{row['meanMoves']:>8.1f}{row['meanExpanded']:>12.0f}{row['meanTime']:>11.4f}{row['nodesPerSecond']:>11.0f}{peak:>10}")
+
+
+def getArguments(args : list = None) -> argparse.Namespace:
+    """
+    This function reads the command line arguments.
+
+    :param args: The arguments, by default those given to the program.
+    :type args: list
+
+    :return : The parsed arguments.
+    :rtype: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the heuristics and search algorithms on seeded random boards.")
+    parser.add_argument("--rows", type=int, default=3, help="the number of rows in the boards")
+    parser.add_argument("--cols", type=int, default=3, help="the number of columns in the boards")
+    parser.add_argument("--depths", type=int, nargs="+", default=[8, 14, 20, 26], help="the optimal solution lengths to group boards by")
+    parser.add_argument("--per-depth", type=int, default=5, help="the number of boards for each depth")
+    parser.add_argument("--seed", type=int, default=0, help="the seed used to make the boards")
+    parser.add_argument("--max-attempts", type=int, default=10000, help="the largest number of random boards to try")
+    parser.add_argument("--heuristics", nargs="+", choices=sorted(heuristics), default=sorted(heuristics), help="the heuristics to benchmark")
+    parser.add_argument("--solvers", nargs="+", choices=sorted(solvers), default=sorted(solvers), help="the search algorithms to benchmark")
+    parser.add_argument("--timeout", type=float, default=60, help="the number of seconds each board may take to solve")
+    parser.add_argument("--memory", action="store_true", help="also measure the peak memory of each search (runs each board twice, and for HDA only the main process is measured)")
+    parser.add_argument("--output", default=None, help="the file to write the result of each run to as JSON lines")
+    return parser.parse_args(args)
+
+
+def run(arguments : argparse.Namespace) -> list:
+    """
+    This function runs the benchmark and prints the summary.
+
+    :param arguments: The parsed arguments.
+    :type arguments: argparse.Namespace
+
+    :return : The rows of the summary.
+    :rtype: list
+    """
+    signal.signal(signal.SIGALRM, raiseTimeout)
+
+    goal = getGoal(arguments.rows, arguments.cols)
+    boards = getBoards(goal, arguments.depths, arguments.per_depth, arguments.seed, arguments.max_attempts)
+
+    results = []
+    for heuristicMeth in arguments.heuristics:
+        # some heuristics can only be built for small boards, so every run with them is an error.
+        try:
+            heuristic = heuristics[heuristicMeth](goal)
+            error = None
+        except Exception as exception:
+            heuristic = None
+            error = str(exception)
+
+        for solverMeth in arguments.solvers:
+            for depth in arguments.depths:
+                for grid in boards[depth]:
+                    if error != None:
+                        result = {"status": "error", "error": error}
+                        result.update(SearchStats(timed=True).toDict())
+                    else:
+                        result = runBoard(solverMeth, heuristic, grid, goal, arguments.timeout, arguments.memory)
+                    result.update({"solver": solverMeth, "heuristic": heuristicMeth, "depth": depth, "board": grid})
+                    results.append(result)
+
+    if arguments.output != None:
+        with open(arguments.output, "w") as output:
+            for result in results:
+                output.write(json.dumps(result) + "\n")
+
+    rows = summarise(results)
+    printSummary(rows)
+    return rows
+
+
+if __name__ == "__main__":
+
+    run(getArguments())
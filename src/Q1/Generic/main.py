@@ -7,35 +7,73 @@ This module contains the runner methods which run the entire system.
 from Board import Board
 from ManhattanDistance import ManhattanDistance
 from MispacedTiles import MisplacedTiles
+from PatternDatabase import PatternDatabase
+from LinearConflict import LinearConflict
+from WalkingDistance import WalkingDistance
+from DistanceTable import DistanceTable
 from UserInterface import UserInterface
 from Puzzel import Puzzel
+from IDAStar import IDAStar
+from BidirectionalAStar import BidirectionalAStar
+from TableSolver import TableSolver
+from ParallelAStar import ParallelAStar
+from GoalRelabeling import GoalRelabeling
+from Solvability import Solvability
 
 if __name__ == "__main__":
 
     ui = UserInterface()
 
-    board = ui.getBoard("Initial")
+    numRow, numCol = ui.getDimensions()
 
-    goal = ui.getBoard("Goal")
+    board = ui.getBoard("Initial", numRow, numCol)
+
+    goal = ui.getBoard("Goal", numRow, numCol)
 
     board = Board(board, 0, goal)
 
+    # the tiles are renamed so the goal is a canonical one, letting the heuristic
+    # tables be shared by every goal with the empty tile in the same place.
+    relabeling = GoalRelabeling(goal)
+
     heuristicMeth = ui.getHeuristicMethod()
 
     if heuristicMeth == "MD":
-        heuristic = ManhattanDistance(goal)
+        heuristicType = ManhattanDistance
     elif heuristicMeth == "MT":
-        heuristic = MisplacedTiles(goal)
+        heuristicType = MisplacedTiles
+    elif heuristicMeth == "LC":
+        heuristicType = LinearConflict
+    elif heuristicMeth == "WD":
+        heuristicType = WalkingDistance
+    elif heuristicMeth == "PDB":
+        heuristicType = PatternDatabase
+    elif heuristicMeth == "DT":
+        heuristicType = DistanceTable
     else:
         raise Exception("Error : Entered value does not relate to one of the given options.")
 
-    puzzel = Puzzel(board, heuristic)
+    solverMeth = ui.getSolverMethod()
+
+    if solverMeth == "AS":
+        solverType = Puzzel
+    elif solverMeth == "IDA":
+        solverType = IDAStar
+    elif solverMeth == "BI":
+        solverType = BidirectionalAStar
+    elif solverMeth == "HDA":
+        solverType = ParallelAStar
+    elif solverMeth == "TB":
+        solverType = TableSolver
+    else:
+        raise Exception("Error : Entered value does not relate to one of the given options.")
 
-    if puzzel.checkSolvable():
+    if Solvability(goal).isSolvable(board):
 
-        solution = puzzel.solve()
+        # the moves of the empty tile are the same for the canonical and original boards.
+        solution = relabeling.solve(solverType, board, heuristicType)
 
-        ui.printSolution(solution, goal)
+        ui.printSolution(solution, board)
     
     else:
 
@@ -0,0 +1,65 @@
+"""
+testParallelAStar.py
+========================
+This module checks the ParallelAStar class against IDAStar on a fixed set
+of 3x3 boards. Run it from this directory with:
+
+    python -m unittest testParallelAStar
+"""
+
+import unittest
+
+from Board import Board
+from LinearConflict import LinearConflict
+from IDAStar import IDAStar
+from ParallelAStar import ParallelAStar
+
+
+class TestParallelAStar(unittest.TestCase):
+    """
+    This class checks that the parallel search finds optimal solutions
+    (the same length as IDA*) which really reach the goal.
+    """
+
+    """
+    The goal of every board.
+    """
+    goal = [["*", "1", "2"], ["3", "4", "5"], ["6", "7", "8"]]
+
+    """
+    The initial boards, written left to right and top to bottom.
+    """
+    boards = ["1*2345678", "312*45678", "*13425678", "8*6543721", "8672543*1", "*87654321"]
+
+    def getBoard(self, tiles : str) -> Board:
+        """
+        This function makes a board from its tiles.
+
+        :param tiles: The tiles left to right and top to bottom.
+        :type tiles: str
+
+        :return : The board.
+        :rtype: Board
+        """
+        return Board([list(tiles[row * 3: (row + 1) * 3]) for row in range(3)], 0, self.goal)
+
+    def testMatchesIDAStar(self):
+        heuristic = LinearConflict(self.goal)
+        for tiles in self.boards:
+            board = self.getBoard(tiles)
+            expected = IDAStar(board, heuristic).solve()
+            for workers in (1, 3):
+                with self.subTest(board=tiles, workers=workers):
+                    solution = ParallelAStar(board, heuristic, workers=workers).solve()
+                    self.assertEqual(len(solution), len(expected))
+                    final = list(board.replay(solution))[-1]
+                    self.assertTrue(final.isSolved())
+
+    def testSolvedBoard(self):
+        board = self.getBoard("*12345678")
+        self.assertEqual(ParallelAStar(board, LinearConflict(self.goal), workers=2).solve(), "")
+
+
+if __name__ == "__main__":
+
+    unittest.main()
@@ -194,20 +194,34 @@ class Board:
             copy.append(newRow)
         return copy
 
-    
+    def getKey(self) -> tuple:
+        """
+        This function returns an immutable copy of the data in the
+        board, which can be hashed and so used to store the board
+        in a set or as a key in a dict.
+
+        :return : The data in the board as a tuple of tuples.
+        :rtype: tuple
+        """
+        return tuple(tuple(row) for row in self.board)
+
     def getParents(self) -> list:
         """
-        This function recursively returns all the parent nodes
-        which have come before this current one. It is used to get
-        all the moves to reach the solved puzzle.
+        This function returns all the parent nodes which have come
+        before this current one, from the first board onwards. The
+        parents are followed in a loop rather than recursively, so
+        long paths do not hit the recursion limit.
         
         :return : The list of how to solve the board.
         :rtype: list
         """
-        if self.parent == None:
-            return []
-        else:
-            return self.parent.getParents() + [self.parent]
+        parents = []
+        board = self.parent
+        while board != None:
+            parents.append(board)
+            board = board.parent
+        parents.reverse()
+        return parents
 
     def toString(self) -> None:
         """
@@ -5,6 +5,9 @@ This module contains the Puzzel class which runs the A* search and
 finds the solution to the given Board and to reach the given goal.
 """
 
+import heapq
+from itertools import count
+
 from Board import Board
 from HeuristicFunc import HeuristicFunc
 
@@ -15,16 +18,23 @@ class Puzzel():
     """
 
     """
-    This contains all the possible boards and 
-    is ordered from min to max heuristic score.
+    This contains all the possible boards as a binary heap
+    of (heuristic score, order added, board) entries so the
+    board with the min heuristic score is always at the top.
     """
     open = []
 
     """
-    This contains all the boards / states which have
-    been traversed.
+    This contains the keys of all the boards / states which
+    have been traversed.
     """
-    closed = []
+    closed = set()
+
+    """
+    This is the counter used to order boards with the same
+    heuristic score by when they were added to open.
+    """
+    order = None
 
     """
     This is the start state (starting board).
@@ -50,9 +60,38 @@ class Puzzel():
         """
         self.initial = board
         self.heuristic = heuristic
+        self.open = []
+        self.closed = set()
+        self.order = count()
         board.hValue = self.heuristic.calculate(board)
-        self.open.append(self.initial)
-    
+        self.addToOpen(self.initial)
+
+    def addToOpen(self, board : Board) -> None:
+        """
+        This function pushes a board onto the open heap, keyed by its
+        heuristic score and then by the order it was added in.
+
+        :param board: The board being added to open.
+        :type board: Board
+        """
+        heapq.heappush(self.open, (board.hValue, next(self.order), board))
+
+    def popFromOpen(self) -> Board:
+        """
+        This function pops the board with the min heuristic score from
+        the open heap. Entries for boards which have since been added to
+        closed are skipped (lazy deletion) rather than being removed from
+        the heap when they are closed.
+
+        :return : The board with the min heuristic score, or None if open is empty.
+        :rtype: Board
+        """
+        while self.open:
+            board = heapq.heappop(self.open)[2]
+            if self.notInClosed(board):
+                return board
+        return None
+
     def notInClosed(self, board):
         """
         This function checks if a board is in the closed list,
@@ -64,11 +103,7 @@ class Puzzel():
         :return : If Board is in closed.
         :rtype: bool
         """
-        for item in self.closed:
-            if item.board == board.board:
-                return False
-        
-        return True
+        return board.getKey() not in self.closed
 
     def getMinHValue(self, children):
         """
@@ -104,7 +139,10 @@ class Puzzel():
         solution = []
 
         while True:
-            curBoard = self.open[0]
+            curBoard = self.popFromOpen()
+
+            if curBoard == None:
+                break
 
             if curBoard.isSolved():
                 solution = curBoard.getParents()
@@ -121,14 +159,10 @@ class Puzzel():
 
             minHVal = self.getMinHValue(validChildren)
 
-            for child in children:
+            for child in validChildren:
                 if child.hValue == minHVal:
-                    self.open.append(child)
-
-            self.open.remove(curBoard)
-
-            self.closed.append(curBoard)
+                    self.addToOpen(child)
 
-            self.open.sort(key=lambda b:b.hValue, reverse=False)
+            self.closed.add(curBoard.getKey())
 
         return solution
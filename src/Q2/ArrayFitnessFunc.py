@@ -0,0 +1,76 @@
+"""
+ArrayFitnessFunc.py
+=======================
+This module is used to define the ArrayFitnessFunc class which evaluates the
+fitness values of a whole population of Suduku grids at once using NumPy.
+"""
+
+import numpy as np
+
+from Grid import Grid, UNITS
+from FitnessFunc import FitnessFunc
+
+"""
+The flat (row * 9 + column) indexes of the cells in each of the 27 units,
+the nine rows, then the nine columns, then the nine squares.
+"""
+UNIT_CELLS = np.array([[row * 9 + col for row, col in unit] for unit in UNITS], dtype=np.intp)
+
+class ArrayFitnessFunc(FitnessFunc):
+    """
+    This class gives the same fitness value as FitnessFunc, but scores a
+    population held as one (P, 9, 9) uint8 array in one go. The number of
+    duplicates in a unit is 9 minus the number of different values in it,
+    so every unit of every grid is counted with one bincount.
+    """
+
+    def toArray(self, grids : list) -> np.ndarray:
+        """
+        This function turns a list of grids into a (P, 9, 9) uint8 array.
+
+        :param grids: The grids to convert.
+        :type grids: list
+
+        :return : The grids as one array.
+        :rtype: np.ndarray
+        """
+        return np.array([grid.grid for grid in grids], dtype=np.uint8).reshape(len(grids), 9, 9)
+
+    def evaluatePopulation(self, grids : np.ndarray) -> np.ndarray:
+        """
+        This function evaluates the fitness value of every grid in a population.
+
+        :param grids: The population as a (P, 9, 9) array of digits 0 to 9.
+        :type grids: np.ndarray
+
+        :return : The fitness value of each grid.
+        :rtype: np.ndarray
+        """
+        numGrids = grids.shape[0]
+        units = grids.reshape(numGrids, 81)[:, UNIT_CELLS].astype(np.intp)
+
+        # give every (grid, unit, value) its own bin.
+        offsets = np.arange(numGrids * 27, dtype=np.intp).reshape(numGrids, 27, 1) * 10
+        counts = np.bincount((units + offsets).ravel(), minlength=numGrids * 270).reshape(numGrids, 27, 10)
+
+        return 27 * 9 - np.count_nonzero(counts, axis=(1, 2))
+
+    def evaluate(self, grid : Grid):
+        #Docstrings inherited from FitnessFunc
+        #See FitnessFunc.py for further details
+        return int(self.evaluatePopulation(self.toArray([grid]))[0])
+
+    def compareWithScalar(self, grids : list) -> list:
+        """
+        This function checks the fitness values given by evaluatePopulation against
+        those given by the scalar FitnessFunc.evaluate for a list of grids.
+
+        :param grids: The grids to check.
+        :type grids: list
+
+        :return : The indexes of any grids where the two fitness values differ.
+        :rtype: list
+        """
+        scalar = FitnessFunc()
+        vectorised = self.evaluatePopulation(self.toArray(grids))
+        return [i for i in range(len(grids)) if scalar.evaluate(grids[i]) != vectorised[i]]
@@ -0,0 +1,267 @@
+"""
+ArrayGenetic.py
+=========================
+This module contains the ArrayGeneticAlg class which carries out the same
+evolutionary algorithm as GeneticAlg on a population held as one NumPy array.
+"""
+
+import numpy as np
+
+from Grid import Grid, BOX_CELLS, BIT_COUNT
+from FitnessFunc import FitnessFunc
+from ArrayFitnessFunc import ArrayFitnessFunc
+from Genetic import GeneticAlg
+from Population import Population
+from UserInterface import UserInterface
+
+"""
+The number of digits in each candidate mask (see Grid.py).
+"""
+BIT_COUNTS = np.array(BIT_COUNT, dtype=np.intp)
+
+"""
+The digits in each candidate mask, smallest first and padded with 0,
+indexed by mask then position.
+"""
+MASK_DIGITS = np.array([[num for num in range(1, 10) if mask & (1 << (num - 1))] + [0] * (9 - BIT_COUNT[mask])
+                        for mask in range(len(BIT_COUNT))], dtype=np.intp)
+
+class ArrayGeneticAlg(GeneticAlg):
+    """
+    This class carries out the evolutionary algorithm of GeneticAlg with the
+    population held as a Population (one (P, 9, 9) array). Selection, crossover,
+    putting back the initial values and mutation are each done for the whole
+    population at once with array operations, so no Grid objects are made
+    until the result is returned.
+
+    A mutation swaps two cells in a 3x3 square which were not given in the
+    initial grid, and fitness values are worked out after mutating. As each
+    row of a child is made from both of its parents, the children are scored
+    from scratch with one evaluatePopulation rather than updated one cell at
+    a time from the parents (as FitnessFunc.swap does for GeneticAlg).
+    """
+
+    """
+    The random number generator used by the algorithm.
+    """
+    rng = None
+
+    """
+    The initial grid as a (9, 9) uint8 array.
+    """
+    givens = None
+
+    """
+    A (9, 9) bool array which is True for cells given in the initial grid.
+    """
+    fixedMask = None
+
+    """
+    A (9, 9) array of the flat indexes of the cells in each square which
+    were not given in the initial grid (padded with 0).
+    """
+    freeCells = None
+
+    """
+    The number of cells in each square which were not given in the initial grid.
+    """
+    freeCounts = None
+
+    def __init__(self, selectionRate : float, mutationProb : float, restartThreshold : int, maxRestarts : int, fitnessFunc : FitnessFunc, initialGrid : Grid, seed : int = None) -> None:
+        """
+        This is the initialiser for an ArrayGeneticAlg. It takes the same parameters as a
+        GeneticAlg (see Genetic.py for further details) and a seed for its random number
+        generator. As the scores are the same, an ArrayFitnessFunc is used in place of
+        any other FitnessFunc.
+
+        :param seed: The seed of the random number generator, or None for a random seed.
+        :type seed: int
+        """
+        if not isinstance(fitnessFunc, ArrayFitnessFunc):
+            fitnessFunc = ArrayFitnessFunc()
+        super().__init__(selectionRate, mutationProb, restartThreshold, maxRestarts, fitnessFunc, initialGrid)
+
+        self.rng = np.random.default_rng(seed)
+        self.givens = np.array(initialGrid.grid, dtype=np.uint8)
+        self.fixedMask = self.givens != 0
+
+        self.freeCells = np.zeros((9, 9), dtype=np.intp)
+        self.freeCounts = np.zeros(9, dtype=np.intp)
+        for sqrId in range(9):
+            free = [row * 9 + col for row, col in BOX_CELLS[sqrId] if not self.fixedMask[row, col]]
+            self.freeCells[sqrId, :len(free)] = free
+            self.freeCounts[sqrId] = len(free)
+
+    def getPopulation(self, numPopulation : int) -> Population:
+        """
+        This functions returns a population where every row of the initial grid has its
+        0s replaced by a random ordering of the digits missing from the row, where each
+        cell is only given one of its candidates (as in GeneticAlg.fillRow). Each cell
+        is filled for the whole population at once, with the cells of a row with the
+        fewest candidates first.
+
+        :param numPopulation: The size of the population.
+        :type numPopulation: int
+
+        :return : The population.
+        :rtype: Population
+        """
+        grids = np.repeat(self.givens[np.newaxis], numPopulation, axis=0)
+        candidates = np.array(self.candidates, dtype=np.intp)
+
+        for row in range(9):
+            emptyCols = np.flatnonzero(self.givens[row] == 0)
+            if len(emptyCols) == 0:
+                continue
+            missing = sum(1 << (num - 1) for num in range(1, 10) if num not in self.givens[row])
+
+            numOptions = BIT_COUNTS[candidates[row, emptyCols] & missing]
+            order = emptyCols[np.lexsort((self.rng.random(len(emptyCols)), numOptions))]
+
+            remaining = np.full(numPopulation, missing, dtype=np.intp)
+            for col in order:
+                options = candidates[row, col] & remaining
+                options = np.where(options == 0, remaining, options)
+                picks = (self.rng.random(numPopulation) * BIT_COUNTS[options]).astype(np.intp)
+                digits = MASK_DIGITS[options, picks]
+                grids[:, row, col] = digits
+                remaining &= ~(1 << (digits - 1))
+
+        return Population(grids, self.fitnessFunc.evaluatePopulation(grids))
+
+    def select(self, population : Population, numSelected : int) -> np.ndarray:
+        """
+        This function selects the indexes of parents from the population, where
+        (as in GeneticAlg.select) the chance of selecting a grid is its share of the
+        total fitness of the population.
+
+        :param population: The population to select from.
+        :type population: Population
+        :param numSelected: The number of parents to select.
+        :type numSelected: int
+
+        :return : The indexes of the selected parents.
+        :rtype: np.ndarray
+        """
+        weights = population.fitness / population.fitness.sum()
+        return self.rng.choice(len(population), size=numSelected, p=weights)
+
+    def reproduce(self, x : np.ndarray, y : np.ndarray) -> tuple:
+        """
+        This function creates two children from each pair of parents. For every
+        row a random crossover point is picked, and the first child takes the
+        start of the row from x and the rest from y (and the second child the
+        other way round). Any initial values are then put back.
+
+        :param x: The X parents as a (N, 9, 9) array.
+        :type x: np.ndarray
+        :param y: The Y parents as a (N, 9, 9) array.
+        :type y: np.ndarray
+
+        :return : The first and second children as (N, 9, 9) arrays.
+        :rtype: tuple
+        """
+        cuts = self.rng.integers(0, 9, size=(x.shape[0], 9))
+        fromX = np.arange(9)[np.newaxis, np.newaxis, :] < cuts[:, :, np.newaxis]
+
+        child1 = np.where(fromX, x, y)
+        child2 = np.where(fromX, y, x)
+
+        child1 = np.where(self.fixedMask, self.givens, child1)
+        child2 = np.where(self.fixedMask, self.givens, child2)
+        return child1, child2
+
+    def mutate(self, grids : np.ndarray, mutating : np.ndarray) -> None:
+        """
+        This function carries out mutations on the chosen grids, where each
+        grid has a random number (0 to 8) of swaps of two cells in a random
+        square. Initial values are never swapped.
+
+        :param grids: The grids as a (P, 9, 9) array, which is changed in place.
+        :type grids: np.ndarray
+        :param mutating: A (P,) bool array of the grids to mutate.
+        :type mutating: np.ndarray
+        """
+        cells = grids.reshape(grids.shape[0], 81)
+        indexes = np.flatnonzero(mutating)
+        numMutations = self.rng.integers(0, 9, size=len(indexes))
+
+        for i in range(8):
+            sqrIds = self.rng.integers(0, 9, size=len(indexes))
+            counts = self.freeCounts[sqrIds]
+            active = (numMutations > i) & (counts > 0)
+
+            posA = (self.rng.random(len(indexes)) * counts).astype(np.intp)
+            posB = (self.rng.random(len(indexes)) * counts).astype(np.intp)
+
+            rows = indexes[active]
+            cellA = self.freeCells[sqrIds, posA][active]
+            cellB = self.freeCells[sqrIds, posB][active]
+
+            temp = cells[rows, cellA]
+            cells[rows, cellA] = cells[rows, cellB]
+            cells[rows, cellB] = temp
+
+    def rankPopulation(self, population : Population) -> None:
+        #Docstrings inherited from GeneticAlg
+        #See Genetic.py for further details
+        population.sort()
+
+    def getFitnessRange(self, population : Population) -> tuple:
+        #Docstrings inherited from GeneticAlg
+        #See Genetic.py for further details
+        return int(population.fitness[0]), int(population.fitness[-1])
+
+    def getBestGrid(self, population : Population) -> Grid:
+        #Docstrings inherited from GeneticAlg
+        #See Genetic.py for further details
+        return population.toGrid(0)
+
+    def getMigrants(self, population : Population, numMigrants : int) -> Population:
+        #Docstrings inherited from GeneticAlg
+        #See Genetic.py for further details
+        return Population(population.grids[:numMigrants].copy(), population.fitness[:numMigrants].copy())
+
+    def addMigrants(self, population : Population, migrants : Population) -> None:
+        #Docstrings inherited from GeneticAlg
+        #See Genetic.py for further details
+        numMigrants = min(len(migrants), len(population))
+        population.grids[len(population)-numMigrants:] = migrants.grids[:numMigrants]
+        population.fitness[len(population)-numMigrants:] = migrants.fitness[:numMigrants]
+        self.rankPopulation(population)
+
+    def nextGeneration(self, population : Population, ui : UserInterface) -> Population:
+        """
+        This function makes the next generation from a sorted population, using the
+        top percentage (defined by selectionRate) as parents. A pair of parents is
+        never the same grid.
+
+        :param population: The current population, sorted by fitness value.
+        :type population: Population
+        :param ui: This is the user interface object being used.
+        :type ui: UserInterface
+
+        :return : The next population.
+        :rtype: Population
+        """
+        numParents = int(len(population) * self.selectionRate)
+        if numParents <= 1:
+            ui.error("Selection Rate too small for given population size. (Must produce at least 2 children).")
+
+        parents = Population(population.grids[:numParents], population.fitness[:numParents])
+        numPairs = int(len(population) / 2)
+
+        x = self.select(parents, numPairs)
+        y = self.select(parents, numPairs)
+        same = x == y
+        while same.any():
+            y[same] = self.select(parents, int(same.sum()))
+            same = x == y
+
+        child1, child2 = self.reproduce(parents.grids[x], parents.grids[y])
+        children = np.stack([child1, child2], axis=1).reshape(numPairs * 2, 9, 9)
+
+        mutating = np.repeat(self.rng.random(numPairs) < self.mutationProb, 2)
+        self.mutate(children, mutating)
+
+        return Population(children, self.fitnessFunc.evaluatePopulation(children))
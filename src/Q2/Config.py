@@ -0,0 +1,268 @@
+"""
+Config.py
+=========================
+This module contains the Config class which holds the parameters of a run
+of the evolutionary algorithm, read from a TOML or JSON profile and the
+command line rather than being fixed in the code.
+"""
+
+import argparse
+import json
+import os
+
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
+"""
+The type and description of every parameter, keyed by its name. On the
+command line each name is written in lower case with dashes, so
+mutationRate is set with --mutation-rate.
+"""
+FIELDS = {
+    "population": (int, "the size of the population"),
+    "mutationRate": (float, "the probability of a child mutating"),
+    "selectionRate": (float, "the percentage of the population used as parents"),
+    "restartThreshold": (int, "the number of generations before a restart is forced"),
+    "maxRestarts": (int, "the maximum number of restarts"),
+    "seed": (int, "the seed of the random number generator"),
+    "workers": (int, "the number of processes (islands) to use (default: the number of cores)"),
+    "timeBudget": (float, "the number of seconds a grid may take to solve"),
+    "migrationInterval": (int, "the number of generations between migrations of the island model"),
+    "migrants": (int, "the number of grids sent to the next island in each migration"),
+    "propagate": (bool, "if the predeterminable values are filled in before solving"),
+    "nakedPairs": (bool, "if naked pairs are used when filling in the predeterminable values"),
+    "mode": (str, "how the grid is solved, GA, EXACT or HYBRID (asked for if not given)")
+}
+
+"""
+The ways a grid can be solved, the values mode may take.
+"""
+MODES = ["GA", "EXACT", "HYBRID"]
+
+
+def getOptionName(name : str) -> str:
+    """
+    This function returns the command line option of a parameter.
+
+    :param name: The name of the parameter.
+    :type name: str
+
+    :return : The option, such as --mutation-rate.
+    :rtype: str
+    """
+    return "--" + "".join("-" + char.lower() if char.isupper() else char for char in name)
+
+
+class Config:
+    """
+    This class holds every parameter of a run. The defaults are the values
+    which used to be constants in main.py, and any of them can be changed by
+    a profile file and then by the command line.
+    """
+
+    """
+    The size of the population.
+    """
+    population = 1000
+
+    """
+    The probability of a child mutating.
+    """
+    mutationRate = 0.025
+
+    """
+    The percentage of the top of the population used as parents.
+    """
+    selectionRate = 0.2
+
+    """
+    The number of generations allowed before a restart is forced.
+    """
+    restartThreshold = 50
+
+    """
+    The maximum number of restarts allowed.
+    """
+    maxRestarts = 5
+
+    """
+    The seed of the random number generator, or None for a random seed.
+    """
+    seed = None
+
+    """
+    The number of processes to use, or None for one per core.
+    """
+    workers = None
+
+    """
+    The number of seconds a grid may take to solve, or None for no limit.
+    """
+    timeBudget = None
+
+    """
+    The number of generations between migrations of the island model.
+    """
+    migrationInterval = 10
+
+    """
+    The number of grids sent to the next island in each migration.
+    """
+    migrants = 20
+
+    """
+    If the predeterminable values are filled in before solving.
+    """
+    propagate = True
+
+    """
+    If naked pairs are used when filling in the predeterminable values.
+    """
+    nakedPairs = True
+
+    """
+    How the grid is solved (GA, EXACT or HYBRID), or None to ask the user.
+    """
+    mode = None
+
+    def __init__(self, **values) -> None:
+        """
+        This is the initialiser for a Config, which sets any parameters given.
+
+        :param values: The parameters to set, keyed by name.
+        :type values: dict
+        """
+        self.update(values)
+
+    def update(self, values : dict) -> None:
+        """
+        This function sets the given parameters, converting each value to the type
+        of the parameter. None leaves a parameter unset (its default).
+
+        :param values: The parameters to set, keyed by name.
+        :type values: dict
+        """
+        for name, value in values.items():
+            if name not in FIELDS:
+                raise ValueError(f"Unknown parameter '{name}', expected one of {', '.join(FIELDS)}.")
+            if value == None:
+                continue
+            fieldType = FIELDS[name][0]
+            if fieldType == bool and not isinstance(value, bool):
+                raise ValueError(f"Parameter '{name}' must be true or false, not {value!r}.")
+            setattr(self, name, fieldType(value))
+
+    def getWorkers(self) -> int:
+        """
+        This function returns the number of processes to use.
+
+        :return : The number of processes.
+        :rtype: int
+        """
+        if self.workers != None:
+            return self.workers
+        return os.cpu_count() or 1
+
+    def toDict(self) -> dict:
+        """
+        This function returns every parameter as a dict, for example to be written as JSON.
+
+        :return : The parameters, keyed by name.
+        :rtype: dict
+        """
+        return {name: getattr(self, name) for name in FIELDS}
+
+    @staticmethod
+    def readProfile(fileName : str, profile : str = None) -> dict:
+        """
+        This function reads the parameters in a TOML (.toml) or JSON file. The parameters
+        at the top of the file are used as the defaults, and the file can also hold named
+        profiles in a 'profiles' table, whose parameters are used over the defaults:
+
+            population = 1000
+
+            [profiles.quick]
+            population = 300
+            maxRestarts = 1
+
+        :param fileName: The path to the file.
+        :type fileName: str
+        :param profile: The name of the profile to use, or None for only the defaults.
+        :type profile: str
+
+        :return : The parameters (and any other tables, such as 'sweep'), keyed by name.
+        :rtype: dict
+        """
+        if fileName.endswith(".toml"):
+            if tomllib == None:
+                raise ValueError("Reading TOML profiles needs Python 3.11 or later, use a JSON profile instead.")
+            with open(fileName, "rb") as file:
+                data = tomllib.load(file)
+        else:
+            with open(fileName, "r") as file:
+                data = json.load(file)
+
+        profiles = data.pop("profiles", {})
+        if profile != None:
+            if profile not in profiles:
+                raise ValueError(f"{fileName} has no profile '{profile}', expected one of {', '.join(profiles)}.")
+            data.update(profiles[profile])
+        return data
+
+    @classmethod
+    def fromFile(cls, fileName : str, profile : str = None):
+        """
+        This classmethod makes a Config from a profile file (see readProfile).
+
+        :param fileName: The path to the file.
+        :type fileName: str
+        :param profile: The name of the profile to use, or None for only the defaults.
+        :type profile: str
+
+        :return : The config.
+        :rtype: Config
+        """
+        values = cls.readProfile(fileName, profile)
+        values.pop("sweep", None)
+        return cls(**values)
+
+    @staticmethod
+    def addArguments(parser) -> None:
+        """
+        This function adds the options of a config to a command line parser: --config
+        and --profile to choose a profile, and an option for every parameter.
+
+        :param parser: The parser to add the options to.
+        :type parser: argparse.ArgumentParser
+        """
+        parser.add_argument("--config", default=None, help="a TOML or JSON file of parameters")
+        parser.add_argument("--profile", default=None, help="the profile in the config file to use")
+        for name, (fieldType, description) in FIELDS.items():
+            if fieldType == bool:
+                parser.add_argument(getOptionName(name), dest=name, action=argparse.BooleanOptionalAction, default=None, help=description)
+            else:
+                parser.add_argument(getOptionName(name), dest=name, type=fieldType, default=None, help=description)
+
+    @classmethod
+    def fromArguments(cls, arguments):
+        """
+        This classmethod makes a Config from parsed command line arguments (see addArguments).
+        The defaults are changed by the profile and then by any options given.
+
+        :param arguments: The parsed arguments.
+        :type arguments: argparse.Namespace
+
+        :return : The config.
+        :rtype: Config
+        """
+        if arguments.config != None:
+            config = cls.fromFile(arguments.config, arguments.profile)
+        elif arguments.profile != None:
+            raise ValueError("A profile can only be chosen with --config.")
+        else:
+            config = cls()
+
+        config.update({name: getattr(arguments, name) for name in FIELDS})
+        return config
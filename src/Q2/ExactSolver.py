@@ -0,0 +1,193 @@
+"""
+ExactSolver.py
+=========================
+This module contains the ExactSolver class which solves a Suduku grid
+exactly with a backtracking search over bitmask candidates.
+"""
+
+from Grid import Grid, CELL_BOX, UNITS, ALL_DIGITS, BIT_COUNT
+from UserInterface import UserInterface
+
+class ExactSolver:
+    """
+    This class solves a Suduku grid exactly, rather than searching for one with
+    an evolutionary algorithm. It keeps a 9-bit mask of the digits in every row,
+    column and square and repeatedly fills the empty cell with the fewest
+    candidates (the minimum remaining values heuristic), backtracking when a
+    cell has no candidates left. A grid which can be solved is always solved.
+    """
+
+    """
+    This is the starting Grid.
+    """
+    initialGrid = None
+
+    """
+    The number of cells filled during the last search, including those
+    later undone by backtracking.
+    """
+    nodes = 0
+
+    def __init__(self, initialGrid : Grid) -> None:
+        """
+        This is the initialiser for an ExactSolver.
+
+        :param initialGrid: This is the starting Grid.
+        :type initialGrid: Grid
+        """
+        self.initialGrid = initialGrid
+
+    def search(self, grid : list, masks : tuple) -> bool:
+        """
+        This function fills the empty cells of a grid by a depth first search,
+        always choosing the empty cell with the fewest candidates next.
+
+        :param grid: The grid data, which is filled in place.
+        :type grid: list
+        :param masks: The masks of the digits in every row, column and square, which are kept up to date.
+        :type masks: tuple
+
+        :return : If the grid was filled in.
+        :rtype: bool
+        """
+        rowMasks, colMasks, boxMasks = masks
+
+        bestCell = None
+        bestMask = 0
+        bestCount = 10
+        for row in range(9):
+            for col in range(9):
+                if grid[row][col] == 0:
+                    mask = ALL_DIGITS & ~(rowMasks[row] | colMasks[col] | boxMasks[CELL_BOX[row][col]])
+                    if BIT_COUNT[mask] < bestCount:
+                        bestCell = (row, col)
+                        bestMask = mask
+                        bestCount = BIT_COUNT[mask]
+                        if bestCount <= 1:
+                            break
+            if bestCount <= 1:
+                break
+
+        if bestCell == None:
+            return True
+
+        row, col = bestCell
+        box = CELL_BOX[row][col]
+        while bestMask:
+            bit = bestMask & -bestMask
+            bestMask &= ~bit
+
+            grid[row][col] = bit.bit_length()
+            rowMasks[row] |= bit
+            colMasks[col] |= bit
+            boxMasks[box] |= bit
+            self.nodes += 1
+
+            if self.search(grid, masks):
+                return True
+
+            rowMasks[row] &= ~bit
+            colMasks[col] &= ~bit
+            boxMasks[box] &= ~bit
+
+        grid[row][col] = 0
+        return False
+
+    def solveGrid(self, grid : Grid) -> Grid:
+        """
+        This function returns a solved copy of a grid, or None if it cannot be
+        solved (including when the values already in it break the rules).
+
+        :param grid: The grid to solve, which is not changed.
+        :type grid: Grid
+
+        :return : The solved grid, with a fitness value of 0.
+        :rtype: Grid
+        """
+        result = Grid([list(row) for row in grid.grid])
+        self.nodes = 0
+
+        for unit in UNITS:
+            values = [result.grid[row][col] for row, col in unit if result.grid[row][col] != 0]
+            if len(values) != len(set(values)):
+                return None
+
+        if not self.search(result.grid, result.getUsedMasks()):
+            return None
+
+        result.fitnessVal = 0
+        return result
+
+    def getConsistentCells(self, grid : Grid) -> Grid:
+        """
+        This function returns a copy of a filled grid (such as the best grid found by
+        the evolutionary algorithm) keeping only the given values and the cells whose
+        value occurs once in their row, column and square. Every other cell is set to 0.
+
+        :param grid: The filled grid.
+        :type grid: Grid
+
+        :return : The grid of consistent cells.
+        :rtype: Grid
+        """
+        consistent = Grid([list(row) for row in grid.grid])
+        counts = [[0] * 10 for unit in UNITS]
+        for unitIndex in range(len(UNITS)):
+            for row, col in UNITS[unitIndex]:
+                counts[unitIndex][grid.grid[row][col]] += 1
+
+        for row in range(9):
+            for col in range(9):
+                value = grid.grid[row][col]
+                if self.initialGrid.grid[row][col] != 0:
+                    consistent.grid[row][col] = self.initialGrid.grid[row][col]
+                elif any(counts[unitIndex][value] > 1 for unitIndex in (row, 9 + col, 18 + CELL_BOX[row][col])):
+                    consistent.grid[row][col] = 0
+        return consistent
+
+    def solve(self, ui : UserInterface) -> Grid:
+        """
+        This function solves the initial grid.
+
+        :param ui: This is the user interface object being used.
+        :type ui: UserInterface
+
+        :return : The solution to the sodoku board (or the initial grid if it has no solution).
+        :rtype: Grid
+        """
+        result = self.solveGrid(self.initialGrid)
+        if result == None:
+            ui.outputExactNotSolved()
+            return self.initialGrid
+
+        ui.outputExactSolved()
+        return result
+
+    def solveFrom(self, grid : Grid, ui : UserInterface) -> Grid:
+        """
+        This function finishes a filled grid which is not a solution, such as the best
+        grid found by the evolutionary algorithm. The consistent cells of the grid are
+        kept and the rest are solved exactly. If the kept cells cannot be part of a
+        solution the initial grid is solved instead.
+
+        :param grid: The filled grid to finish.
+        :type grid: Grid
+        :param ui: This is the user interface object being used.
+        :type ui: UserInterface
+
+        :return : The solution to the sodoku board (or the given grid if it has no solution).
+        :rtype: Grid
+        """
+        if grid.fitnessVal == 0:
+            return grid
+
+        result = self.solveGrid(self.getConsistentCells(grid))
+        if result == None:
+            result = self.solveGrid(self.initialGrid)
+
+        if result == None:
+            ui.outputExactNotSolved()
+            return grid
+
+        ui.outputExactSolved()
+        return result
@@ -5,12 +5,16 @@ This module is used to define the FitnessFunc class which evaluates the
 fitness value of a Suduku grid.
 """
 
-from Grid import Grid
+from Grid import Grid, CELL_BOX
 
 class FitnessFunc:
     """
     This class contains all methods required to determine the
     fitness value of a soduku board.
+
+    The methods which change a grid in place (changeCell, swap and
+    evaluateFrom) are used by the scalar GeneticAlg. ArrayGeneticAlg scores
+    every child of a generation together with an ArrayFitnessFunc instead.
     """
 
     def __init__(self) -> None:
@@ -19,27 +23,28 @@ class FitnessFunc:
         but does not have any attributes."""
         pass
 
-    def getDuplicates(self, totals : dict) -> int:
+    def getUnitDuplicates(self, counts : list) -> int:
         """
-        This function gets the number of duplicates, it does this by
-        searching through the values of the totals dict and for every
-        value greater than 1 it increases.
+        This function gets the number of duplicates in a unit (row, column or
+        square) from the number of times each value occurs in it.
 
-        :param totals: This is the dict of the number of occurances of each digit.
-        :type totals: dict
+        :param counts: The number of occurances of each value.
+        :type counts: list
 
         :return : The number of duplicates.
         :rtype: int
         """
         numDuplicates = 0
-        for value in totals.values():
-            if value > 1:
-                numDuplicates += value-1
+        for count in counts:
+            if count > 1:
+                numDuplicates += count-1
         return numDuplicates
 
     def evaluate(self, grid : Grid):
         """
-        This function evaluates the fitness value of a given grid.
+        This function evaluates the fitness value of a given grid, counting
+        the digits of every row, column and square of the grid as it does
+        so, so that later changes can be scored with changeCell and swap.
 
         :param grid: The grid to evaluate a fitness score for.
         :type grid: Grid
@@ -47,34 +52,90 @@ class FitnessFunc:
         :return : The fitness value of the grid.
         :rtype: int
         """
+        grid.countDigits()
+
         numDuplicates = 0
+        for counts in grid.rowCounts + grid.colCounts + grid.boxCounts:
+            numDuplicates += self.getUnitDuplicates(counts)
 
-        for row in grid.grid:
-            totals = {}
-            for item in row:
-                if item in totals.keys():
-                    totals[item] += 1
-                else:
-                    totals[item] = 1
-            
-            numDuplicates += self.getDuplicates(totals)
-        
-        for column in grid.getColumns():
-            totals = {}
-            for item in column:
-                if item in totals.keys():
-                    totals[item] += 1
-                else:
-                    totals[item] = 1
-            numDuplicates += self.getDuplicates(totals)
-
-        for sqr in grid.getSquares():
-            totals = {}
-            for item in sqr:
-                if item in totals.keys():
-                    totals[item] += 1
-                else:
-                    totals[item] = 1
-            numDuplicates += self.getDuplicates(totals)
-        
         return numDuplicates
+
+    def changeCell(self, grid : Grid, rowIndex : int, colIndex : int, value : int) -> None:
+        """
+        This function sets a cell of a grid to a new value and updates its fitness
+        value and digit counts in constant time. Taking a value out of a unit
+        removes a duplicate if the value occured more than once, and putting
+        one in adds a duplicate if the value was already there.
+
+        :param grid: The grid to change, which must have its fitness value and digit counts set.
+        :type grid: Grid
+        :param rowIndex: The row index of the cell.
+        :type rowIndex: int
+        :param colIndex: The column index of the cell.
+        :type colIndex: int
+        :param value: The new value of the cell.
+        :type value: int
+        """
+        old = grid.grid[rowIndex][colIndex]
+        if old == value:
+            return
+
+        change = 0
+        for counts in (grid.rowCounts[rowIndex], grid.colCounts[colIndex], grid.boxCounts[CELL_BOX[rowIndex][colIndex]]):
+            counts[old] -= 1
+            if counts[old] > 0:
+                change -= 1
+            if counts[value] > 0:
+                change += 1
+            counts[value] += 1
+
+        grid.grid[rowIndex][colIndex] = value
+        grid.fitnessVal += change
+
+    def swap(self, grid : Grid, cellA : tuple, cellB : tuple) -> None:
+        """
+        This function swaps the values of two cells of a grid and updates its
+        fitness value in constant time. When both cells are in the same square
+        only their rows and columns can change.
+
+        :param grid: The grid to change. Its digit counts are made if it does not have them.
+        :type grid: Grid
+        :param cellA: The (row index, column index) of the first cell.
+        :type cellA: tuple
+        :param cellB: The (row index, column index) of the second cell.
+        :type cellB: tuple
+        """
+        if grid.rowCounts == None:
+            grid.fitnessVal = self.evaluate(grid)
+
+        valueA = grid.grid[cellA[0]][cellA[1]]
+        valueB = grid.grid[cellB[0]][cellB[1]]
+        self.changeCell(grid, cellA[0], cellA[1], valueB)
+        self.changeCell(grid, cellB[0], cellB[1], valueA)
+
+    def evaluateFrom(self, grid : Grid, parent : Grid, changedCells : list) -> int:
+        """
+        This function evaluates the fitness value of a grid which only differs from
+        a parent grid in the given cells, such as a child made by crossover, by
+        starting from the parent's digit counts and only rescoring those cells.
+
+        :param grid: The grid to evaluate a fitness score for.
+        :type grid: Grid
+        :param parent: The parent grid, which must have its fitness value and digit counts set.
+        :type parent: Grid
+        :param changedCells: The (row index, column index) of every cell which may differ from the parent.
+        :type changedCells: list
+
+        :return : The fitness value of the grid.
+        :rtype: int
+        """
+        values = grid.grid
+        grid.grid = [list(row) for row in parent.grid]
+        grid.copyCounts(parent)
+        grid.fitnessVal = parent.fitnessVal
+
+        for rowIndex, colIndex in changedCells:
+            self.changeCell(grid, rowIndex, colIndex, values[rowIndex][colIndex])
+
+        grid.grid = values
+        return grid.fitnessVal
@@ -6,8 +6,9 @@ to carry out the evolutional algorithm to solve the solution.
 """
 
 import random
+import time
 
-from Grid import Grid
+from Grid import Grid, BOX_CELLS, BIT_COUNT
 from FitnessFunc import FitnessFunc
 from UserInterface import UserInterface
 
@@ -38,6 +39,12 @@ class GeneticAlg:
     """
     initialGrid = None
 
+    """
+    The candidate mask of every cell of the initial grid (see Grid.py), which
+    the initial populations are drawn from.
+    """
+    candidates = None
+
     """
     The number of generations to allow before forcing a restart.
     """
@@ -63,6 +70,22 @@ class GeneticAlg:
     """
     restarts = 0
 
+    """
+    The number of generations run since evolve was started, over every restart.
+    """
+    totalGenerations = 0
+
+    """
+    The current population. Only this and the next population
+    are kept while the GA runs.
+    """
+    population = None
+
+    """
+    The grid with a fitness value of 0, once one has been found.
+    """
+    solution = None
+
     def __init__(self, selectionRate : int, mutationProb : int, restartThreshold : int, maxRestarts : int, fitnessFunc : FitnessFunc, initialGrid : Grid) -> None:
         """
         This is the initialiser for a GeneticAlg and asigns all of the
@@ -90,11 +113,13 @@ class GeneticAlg:
         self.fitnessFunc = fitnessFunc
         self.initialGrid = initialGrid
         self.restartThreshold = restartThreshold
+        self.candidates = initialGrid.candidates if initialGrid.candidates != None else initialGrid.getCandidates()
 
     def getPopulation(self, numPopulation : int) -> list[Grid]:
         """
         This functions returns a population, which is a list of randomly filled version of the
-        initial board where any 0 is replaced by a digit from 1 to 9.
+        initial board where the 0s in each row are replaced by the digits missing from the row
+        (see fillRow).
 
         :param numPopulation: The size of the population.
         :type numPopulation: int
@@ -107,22 +132,47 @@ class GeneticAlg:
 
         for i in range(numPopulation):
             newGrid = []
-            for row in self.initialGrid.grid:
-                allDigits = [num for num in [1, 2, 3, 4, 5, 6, 7, 8, 9] if num not in row]
-                newRow = []
-                for item in row:
-                    if item == 0:
-                        newItem = random.choice(allDigits)
-                        newRow.append(newItem)
-                        allDigits.remove(newItem)
-                    else:
-                        newRow.append(item)
-                newGrid.append(newRow)
+            for rowIndex in range(len(self.initialGrid.grid)):
+                newGrid.append(self.fillRow(self.initialGrid.grid[rowIndex], self.candidates[rowIndex]))
 
             newGridObj = Grid(newGrid)
             newGridObj.fitnessVal = self.fitnessFunc.evaluate(newGridObj)
             population.append(newGridObj)
         return population
+
+    def fillRow(self, row : list[int], rowCandidates : list[int]) -> list[int]:
+        """
+        This function replaces the 0s in a row with a random ordering of the digits missing
+        from the row, where each cell is only given one of its candidates. The cells with the
+        fewest candidates are filled first, and if none of a cell's candidates are left it is
+        given any of the digits left.
+
+        :param row: The row of the initial grid.
+        :type row: list
+        :param rowCandidates: The candidate mask of each cell in the row.
+        :type rowCandidates: list
+
+        :return : The filled row.
+        :rtype: list
+        """
+        newRow = list(row)
+        missing = 0
+        for num in [1, 2, 3, 4, 5, 6, 7, 8, 9]:
+            if num not in row:
+                missing |= 1 << (num - 1)
+
+        emptyCols = [col for col in range(len(row)) if row[col] == 0]
+        random.shuffle(emptyCols)
+        emptyCols.sort(key=lambda col:BIT_COUNT[rowCandidates[col] & missing])
+
+        for col in emptyCols:
+            options = rowCandidates[col] & missing
+            if options == 0:
+                options = missing
+            newItem = random.choice([num for num in [1, 2, 3, 4, 5, 6, 7, 8, 9] if options & (1 << (num - 1))])
+            newRow[col] = newItem
+            missing &= ~(1 << (newItem - 1))
+        return newRow
     
     def getTotalFitness(self, population : list[Grid]) -> int:
         """
@@ -181,8 +231,10 @@ class GeneticAlg:
         n = len(x.grid)
         child1 = []
         child2 = []
+        changedCells = []
         for i in range(len(x.grid)):
             c = random.randint(0, n-1)
+            changedCells += [(i, j) for j in range(c)]
             child1Row = x.grid[i][: c] + y.grid[i][c: ]
             child2Row = y.grid[i][: c] + x.grid[i][c: ]
             # Check none of the initial values have been changed.
@@ -195,9 +247,14 @@ class GeneticAlg:
             child2.append(child2Row)
         
         child1Obj = Grid(child1)
-        child1Obj.fitnessVal = self.fitnessFunc.evaluate(child1Obj)
         child2Obj = Grid(child2)
-        child2Obj.fitnessVal = self.fitnessFunc.evaluate(child2Obj)
+        # Each child only differs from one parent before the crossover points.
+        if x.rowCounts != None and y.rowCounts != None:
+            self.fitnessFunc.evaluateFrom(child1Obj, y, changedCells)
+            self.fitnessFunc.evaluateFrom(child2Obj, x, changedCells)
+        else:
+            child1Obj.fitnessVal = self.fitnessFunc.evaluate(child1Obj)
+            child2Obj.fitnessVal = self.fitnessFunc.evaluate(child2Obj)
         return child1Obj, child2Obj
 
     def getIndexToSwap(self, childSquare : Grid) -> list[int]:
@@ -205,7 +262,7 @@ class GeneticAlg:
         This function is used to get the two index's of the items in a child
         which are to be swapped when a mutation occurs.
 
-        :param childSquare: The square the mutation is happening on.
+        :param childSquare: The square of the initial grid the mutation is happening on.
         :type childSquare: Grid
 
         :return : A list of lenth 2 with the two indexs' to be swapped.
@@ -234,6 +291,7 @@ class GeneticAlg:
         This function carries out mutations on a child on a random number of 
         subgrids, a mutation is where two elements in a 3x3 subgrid are swapped.
         Initial values cannot be affected by a mutation, only numbers in the gene.
+        The fitness value of the child is updated with each swap.
 
         :param child: The grid being mutated.
         :type child: Grid
@@ -241,66 +299,67 @@ class GeneticAlg:
         :return : There is nothing returned as the child calling the method is modified.
         :rtype: None
         """
-        squares = child.getSquares()
+        squares = self.initialGrid.getSquares()
 
         numMutations = random.randint(0, len(squares)-1)
         
         for i in range(numMutations):
             sqrId = random.randint(0, len(squares)-1)
 
+            # Only the cells which are 0 in the initial grid can be swapped.
             swapIndex = self.getIndexToSwap(squares[sqrId])
 
             if swapIndex != None:
-                temp = squares[sqrId][swapIndex[0]]
-                child.updateSquare(squares.index(squares[sqrId]), swapIndex[0], squares[sqrId][swapIndex[1]])
-                child.updateSquare(squares.index(squares[sqrId]), swapIndex[1], temp)
+                self.fitnessFunc.swap(child, BOX_CELLS[sqrId][swapIndex[0]], BOX_CELLS[sqrId][swapIndex[1]])
 
-    def solve(self, population : list[Grid], ui : UserInterface) -> Grid:
+    def rankPopulation(self, population : list[Grid]) -> None:
         """
-        This function uses the given population of possible solutions to produce a solution 
-        to the soduku board. 
-
-        If the population contains a solution with a fitness value of 0 then this solution solves
-        the board hence is returned. Else a new population is made using the given population which
-        is then recursivley used on this function. This new population is made by selecting the top
-        percentage (defined by selectionRate) then creating children and possibly (probability defined
-        by mutationRate) mutating them  which populate the new population.
+        This function sorts the population in place from the smallest (best)
+        to the largest fitness value.
 
-        :param population: This is the population of solutions which contains the solution or will be
-        used to make the new population.
+        :param population: The population to sort.
         :type population: list
-        :param ui: This is the user interface object being used and defines all the methods which involve
-        interactions with the user. (Must have a outputGenerationDetails method).
-        :type ui: UserInterface
+        """
+        population.sort(key=lambda grid:grid.fitnessVal, reverse=False)
 
-        :return : The solution to the sodoku board.
-        :rtype: Grid
+    def getFitnessRange(self, population : list[Grid]) -> tuple[int, int]:
         """
+        This function returns the best and worst fitness values of a sorted population.
 
-        if self.generation > self.restartThreshold:
+        :param population: The sorted population.
+        :type population: list
 
-            if self.restarts >= self.maxRestarts:
-                ui.outputNotSolved()
-                return self.bestState
+        :return : The best and worst fitness values.
+        :rtype: tuple
+        """
+        return population[0].fitnessVal, population[len(population)-1].fitnessVal
 
-            self.generation = 0
-            self.restarts += 1
-            restartPop = self.getPopulation(len(population))
-            return self.solve(restartPop, ui)
+    def getBestGrid(self, population : list[Grid]) -> Grid:
+        """
+        This function returns the grid with the best fitness value from a sorted population.
 
-        population.sort(key=lambda grid:grid.fitnessVal, reverse=False)
+        :param population: The sorted population.
+        :type population: list
 
-        ui.outputGenerationDetails(self.restarts, self.generation, population[0].fitnessVal, population[len(population)-1].fitnessVal)
+        :return : The best grid.
+        :rtype: Grid
+        """
+        return population[0]
 
-        if population[0].fitnessVal == 0:
-            ui.outputSolved()
-            return population[0]
-        
-        if self.bestState == None:
-            self.bestState = population[0]
-        elif population[0].fitnessVal < self.bestState.fitnessVal:
-            self.bestState = population[0]
+    def nextGeneration(self, population : list[Grid], ui : UserInterface) -> list[Grid]:
+        """
+        This function makes the next generation from a sorted population by selecting
+        the top percentage (defined by selectionRate) then creating children and possibly
+        (probability defined by mutationRate) mutating them.
+
+        :param population: The current population, sorted by fitness value.
+        :type population: list
+        :param ui: This is the user interface object being used.
+        :type ui: UserInterface
 
+        :return : The next population.
+        :rtype: list
+        """
         populationSize = len(population)
 
         newPopulation = []
@@ -323,9 +382,138 @@ class GeneticAlg:
             
             newPopulation.append(child1)
             newPopulation.append(child2)
-        
-        self.generation += 1
 
-        solution = self.solve(newPopulation, ui)
+        return newPopulation
+
+    def getMigrants(self, population : list[Grid], numMigrants : int) -> list[Grid]:
+        """
+        This function returns copies of the best grids of a sorted population, which
+        are sent to another population when populations are run as islands.
+
+        :param population: The sorted population.
+        :type population: list
+        :param numMigrants: The number of grids to return.
+        :type numMigrants: int
+
+        :return : The best grids.
+        :rtype: list
+        """
+        migrants = []
+        for grid in population[: numMigrants]:
+            migrant = Grid([list(row) for row in grid.grid])
+            migrant.fitnessVal = grid.fitnessVal
+            migrants.append(migrant)
+        return migrants
+
+    def addMigrants(self, population : list[Grid], migrants : list[Grid]) -> None:
+        """
+        This function replaces the worst grids of a sorted population with grids
+        from another population, keeping the population sorted.
+
+        :param population: The sorted population, which is changed in place.
+        :type population: list
+        :param migrants: The grids from the other population.
+        :type migrants: list
+        """
+        numMigrants = min(len(migrants), len(population))
+        population[len(population)-numMigrants:] = migrants[: numMigrants]
+        self.rankPopulation(population)
+
+    def evolve(self, population : list[Grid], ui : UserInterface):
+        """
+        This generator runs the evolutionary algorithm one generation at a time from
+        the given population, yielding the details of each generation after it has been
+        ranked. The caller can stop at any point by no longer asking for generations.
+
+        A restart (a new random population) is forced after restartThreshold generations
+        and the generator finishes once a grid with a fitness value of 0 is found (which
+        is then held in solution) or once maxRestarts restarts have been used. The best
+        grid found so far is always held in bestState.
+
+        :param population: This is the first population.
+        :type population: list
+        :param ui: This is the user interface object being used.
+        :type ui: UserInterface
+
+        :return : A dict of the restart, generation and best and worst fitness values of each generation.
+        :rtype: generator
+        """
+        self.population = population
+        self.generation = 0
+        self.restarts = 0
+        self.totalGenerations = 0
+        self.bestState = None
+        self.solution = None
+
+        populationSize = len(population)
+
+        # only self.population is kept, so the first population can be freed once replaced.
+        population = None
+
+        while True:
+
+            if self.generation > self.restartThreshold:
+
+                if self.restarts >= self.maxRestarts:
+                    return
+
+                self.generation = 0
+                self.restarts += 1
+                self.population = self.getPopulation(populationSize)
+
+            self.rankPopulation(self.population)
+
+            bestFitness, worstFitness = self.getFitnessRange(self.population)
+
+            if bestFitness == 0:
+                self.solution = self.getBestGrid(self.population)
+            elif self.bestState == None or bestFitness < self.bestState.fitnessVal:
+                self.bestState = self.getBestGrid(self.population)
+
+            self.totalGenerations += 1
+
+            yield {"restart": self.restarts, "generation": self.generation, "bestFitness": bestFitness, "worstFitness": worstFitness}
+
+            if self.solution != None:
+                return
+
+            self.population = self.nextGeneration(self.population, ui)
+
+            self.generation += 1
+
+    def solve(self, population : list[Grid], ui : UserInterface, timeBudget : float = None) -> Grid:
+        """
+        This function uses the given population of possible solutions to produce a solution 
+        to the soduku board, running evolve until it finishes (or the time budget has been
+        used) and outputting the details of every generation.
+
+        :param population: This is the first population.
+        :type population: list
+        :param ui: This is the user interface object being used and defines all the methods which involve
+        interactions with the user. (Must have a outputGenerationDetails method).
+        :type ui: UserInterface
+        :param timeBudget: The number of seconds the GA may run for, or None for no limit.
+        :type timeBudget: float
+
+        :return : The solution to the sodoku board (or the best grid found).
+        :rtype: Grid
+        """
+        startTime = time.perf_counter()
+
+        generations = self.evolve(population, ui)
+
+        # evolve keeps the population it is working on, so the first population can be freed once replaced.
+        population = None
+
+        for details in generations:
+            ui.outputGenerationDetails(details["restart"], details["generation"], details["bestFitness"], details["worstFitness"])
+
+            if timeBudget != None and time.perf_counter() - startTime > timeBudget:
+                break
+
+        if self.solution != None:
+            ui.outputSolved()
+            return self.solution
 
-        return solution
+        ui.outputNotSolved()
+        return self.bestState
@@ -5,6 +5,37 @@ This module contains the Grid class which defines what a grid (Sodoku Board)
 should look like and all methods related to handling a Grid object.
 """
 
+"""
+The index of the square (0 to 8, left to right then top to bottom) each
+cell is in, indexed by row index then column index.
+"""
+CELL_BOX = [[(row // 3) * 3 + col // 3 for col in range(9)] for row in range(9)]
+
+"""
+The (row index, column index) of each position (0 to 8, left to right
+then top to bottom) in each square, indexed by square then position.
+"""
+BOX_CELLS = [[((box // 3) * 3 + pos // 3, (box % 3) * 3 + pos % 3) for pos in range(9)] for box in range(9)]
+
+"""
+The (row index, column index) of the cells in each of the 27 units, the
+nine rows, then the nine columns, then the nine squares.
+"""
+UNITS = ([[(row, col) for col in range(9)] for row in range(9)]
+         + [[(row, col) for row in range(9)] for col in range(9)]
+         + BOX_CELLS)
+
+"""
+The candidate mask with every digit as a candidate. In a candidate mask
+bit (digit - 1) is set if the digit can go in the cell.
+"""
+ALL_DIGITS = 0x1FF
+
+"""
+The number of digits in each candidate mask.
+"""
+BIT_COUNT = [bin(mask).count("1") for mask in range(ALL_DIGITS + 1)]
+
 class Grid:
     """
     This class defined a Grid which represents a Sodoku Board
@@ -23,6 +54,30 @@ class Grid:
     """
     fitnessVal = None
 
+    """
+    The number of times each value (0 to 9) occurs in each row, as nine
+    lists of ten counts. Set by countDigits and kept up to date by the
+    fitness function when cells are changed.
+    """
+    rowCounts = None
+
+    """
+    The number of times each value (0 to 9) occurs in each column.
+    """
+    colCounts = None
+
+    """
+    The number of times each value (0 to 9) occurs in each square.
+    """
+    boxCounts = None
+
+    """
+    The candidate mask of every cell, as nine lists of nine masks, worked
+    out by fillPredetermined. A cell with a value has only that value as a
+    candidate.
+    """
+    candidates = None
+
     def __init__(self, grid : list) -> None:
         """
         This is the initialiser for a Grid object, it asigns the given grid data
@@ -58,56 +113,306 @@ class Grid:
         :return : A grid object containing the grid specified in the file.
         :rtype: Grid
 """
-        grid = []
         with open(gridFile, "r") as f:
-            for line in f.readlines():
-                row = []
-                for char in line.strip():
-                    if (char != "!") and (char != "-"):
-                        if char == ".":
-                            row.append(0)
-                        else:
-                            row.append(int(char))
-                if row != []:
-                    grid.append(row)
-        return cls(grid)
-
-    def fillPredetermined(self):
+            for lineNum, grid in cls.iterFromLines(f):
+                return grid
+        raise ValueError(f"{gridFile} does not hold a grid.")
+
+    @classmethod
+    def iterFromLines(cls, lines, skipErrors : bool = False):
+        """
+        This classmethod lazily reads grids from lines of text (such as an open file),
+        yielding each grid as soon as its last line has been read. Each grid is either
+        in the form read by fromFileName or on one line as 81 characters, with a '.' or
+        '0' for unknown values:
+
+            4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......
+
+        Blank lines and lines starting with '#' are skipped, so grids in either form
+        can be mixed in one file. A malformed grid raises a ValueError, unless errors
+        are skipped, in which case the error is yielded in place of the grid and
+        reading carries on from the next line.
+
+        :param lines: The lines to read.
+        :type lines: iterable
+        :param skipErrors: If the error of a malformed grid is yielded rather than raised.
+        :type skipErrors: bool
+
+        :return : The line number of the first line of each grid and the grid (or its error).
+        :rtype: generator
+        """
+        rows = []
+        firstLine = None
+        for lineNum, line in enumerate(lines, 1):
+            line = line.strip()
+            if line == "" or line.startswith("#"):
+                continue
+
+            cells = [char for char in line if char not in "!-|+ "]
+            if cells == []:
+                continue
+
+            if len(cells) == 81 and rows == []:
+                try:
+                    grid = cls([cls.parseRow(cells[row * 9: (row + 1) * 9], lineNum) for row in range(9)])
+                except ValueError as error:
+                    if not skipErrors:
+                        raise
+                    grid = error
+                yield lineNum, grid
+                continue
+
+            if rows == []:
+                firstLine = lineNum
+
+            try:
+                if len(cells) != 9:
+                    raise ValueError(f"Line {lineNum} is not a row of 9 cells or a grid of 81 cells.")
+                rows.append(cls.parseRow(cells, lineNum))
+            except ValueError as error:
+                if not skipErrors:
+                    raise
+                # the rows read so far belong to the malformed grid, so they are dropped.
+                yield firstLine, error
+                rows = []
+                continue
+
+            if len(rows) == 9:
+                yield firstLine, cls(rows)
+                rows = []
+
+        if rows != []:
+            error = ValueError(f"The grid starting on line {firstLine} only has {len(rows)} rows.")
+            if not skipErrors:
+                raise error
+            yield firstLine, error
+
+    @classmethod
+    def iterFromFile(cls, gridFile : str):
+        """
+        This classmethod lazily reads every grid in a file (see iterFromLines), so a
+        large file of grids is never loaded all at once.
+
+        :param gridFile: The filename / path to file holding the grids.
+        :type gridFile: str
+
+        :return : Each grid in the file.
+        :rtype: generator
+        """
+        with open(gridFile, "r") as f:
+            for lineNum, grid in cls.iterFromLines(f):
+                yield grid
+
+    @staticmethod
+    def parseRow(cells : list, lineNum : int) -> list[int]:
+        """
+        This function turns the characters of a row into its values.
+
+        :param cells: The character of each cell.
+        :type cells: list
+        :param lineNum: The line the row is on, used in errors.
+        :type lineNum: int
+
+        :return : The values of the row, with 0 for unknown values.
+        :rtype: list
+        """
+        row = []
+        for char in cells:
+            if char == "." or char == "0":
+                row.append(0)
+            elif char.isdigit():
+                row.append(int(char))
+            else:
+                raise ValueError(f"Line {lineNum} has the unknown value '{char}'.")
+        return row
+
+    def getUsedMasks(self) -> tuple[list, list, list]:
+        """
+        This function returns masks of the digits already in every row, column
+        and square of the grid.
+
+        :return : The masks of the rows, columns and squares.
+        :rtype: tuple
+        """
+        rowMasks = [0] * 9
+        colMasks = [0] * 9
+        boxMasks = [0] * 9
+        for row in range(9):
+            for col in range(9):
+                if self.grid[row][col] != 0:
+                    bit = 1 << (self.grid[row][col] - 1)
+                    rowMasks[row] |= bit
+                    colMasks[col] |= bit
+                    boxMasks[CELL_BOX[row][col]] |= bit
+        return rowMasks, colMasks, boxMasks
+
+    def getCandidates(self, masks : tuple = None, eliminated : list = None) -> list[list[int]]:
+        """
+        This function returns the candidate mask of every cell. An empty cell can
+        have any digit which is not already in its row, column or square (and has
+        not been eliminated), and a cell with a value only has that value.
+
+        :param masks: The masks of the rows, columns and squares, by default from getUsedMasks.
+        :type masks: tuple
+        :param eliminated: The mask of digits which have been ruled out of each cell.
+        :type eliminated: list
+
+        :return : The candidate masks, as nine lists of nine masks.
+        :rtype: list
+        """
+        rowMasks, colMasks, boxMasks = masks if masks != None else self.getUsedMasks()
+        candidates = []
+        for row in range(9):
+            rowCandidates = []
+            for col in range(9):
+                if self.grid[row][col] != 0:
+                    rowCandidates.append(1 << (self.grid[row][col] - 1))
+                else:
+                    used = rowMasks[row] | colMasks[col] | boxMasks[CELL_BOX[row][col]]
+                    if eliminated != None:
+                        used |= eliminated[row][col]
+                    rowCandidates.append(ALL_DIGITS & ~used)
+            candidates.append(rowCandidates)
+        return candidates
+
+    def placeDigit(self, row : int, col : int, digit : int, masks : tuple) -> bool:
+        """
+        This function puts a digit in an empty cell if it is not already in the
+        cell's row, column or square, and updates the masks.
+
+        :param row: The row index of the cell.
+        :type row: int
+        :param col: The column index of the cell.
+        :type col: int
+        :param digit: The digit to put in the cell.
+        :type digit: int
+        :param masks: The masks of the rows, columns and squares.
+        :type masks: tuple
+
+        :return : If the digit was put in the cell.
+        :rtype: bool
+        """
+        rowMasks, colMasks, boxMasks = masks
+        bit = 1 << (digit - 1)
+        box = CELL_BOX[row][col]
+        if self.grid[row][col] != 0 or (rowMasks[row] | colMasks[col] | boxMasks[box]) & bit:
+            return False
+        self.grid[row][col] = digit
+        rowMasks[row] |= bit
+        colMasks[col] |= bit
+        boxMasks[box] |= bit
+        return True
+
+    def fillNakedSingles(self, masks : tuple) -> int:
+        """
+        This function fills every empty cell which has only one candidate.
+
+        :param masks: The masks of the rows, columns and squares.
+        :type masks: tuple
+
+        :return : The number of cells filled.
+        :rtype: int
+        """
+        numChanges = 0
+        for row in range(9):
+            for col in range(9):
+                mask = self.candidates[row][col]
+                if self.grid[row][col] == 0 and BIT_COUNT[mask] == 1:
+                    if self.placeDigit(row, col, mask.bit_length(), masks):
+                        numChanges += 1
+        return numChanges
+
+    def fillHiddenSingles(self, masks : tuple) -> int:
+        """
+        This function fills every cell which is the only place in a row, column
+        or square a missing digit can go. For each unit the digits which are a
+        candidate of exactly one empty cell are found by building masks of the
+        digits seen once and seen more than once.
+
+        :param masks: The masks of the rows, columns and squares.
+        :type masks: tuple
+
+        :return : The number of cells filled.
+        :rtype: int
+        """
+        numChanges = 0
+        for unit in UNITS:
+            used = 0
+            once = 0
+            twice = 0
+            for row, col in unit:
+                mask = self.candidates[row][col]
+                if self.grid[row][col] != 0:
+                    used |= mask
+                else:
+                    twice |= once & mask
+                    once |= mask
+            hidden = once & ~twice & ~used
+            if hidden == 0:
+                continue
+            for row, col in unit:
+                mask = self.candidates[row][col] & hidden
+                if self.grid[row][col] == 0 and mask != 0:
+                    if self.placeDigit(row, col, mask.bit_length(), masks):
+                        numChanges += 1
+        return numChanges
+
+    def removeNakedPairs(self, eliminated : list) -> int:
+        """
+        This function finds pairs of empty cells in a unit which both have the
+        same two candidates. As those two digits must go in those two cells, they
+        are ruled out of every other cell in the unit.
+
+        :param eliminated: The mask of digits which have been ruled out of each cell, which is updated.
+        :type eliminated: list
+
+        :return : The number of cells which lost a candidate.
+        :rtype: int
+        """
+        numChanges = 0
+        for unit in UNITS:
+            pairs = {}
+            for row, col in unit:
+                mask = self.candidates[row][col]
+                if self.grid[row][col] == 0 and BIT_COUNT[mask] == 2:
+                    pairs.setdefault(mask, []).append((row, col))
+            for mask, cells in pairs.items():
+                if len(cells) != 2:
+                    continue
+                for row, col in unit:
+                    if self.grid[row][col] == 0 and (row, col) not in cells and self.candidates[row][col] & mask:
+                        eliminated[row][col] |= mask
+                        self.candidates[row][col] &= ~mask
+                        numChanges += 1
+        return numChanges
+
+    def fillPredetermined(self, nakedPairs : bool = False):
         """
         This function is used to fill in any predeterminable values in the
         grid when it is first initialised before the Evolutional Algorithm
         starts. This helps to give the best possible initial state.
 
-        It does this by for every cell in the grid, removing the digits in its
-        row, column and square from the avaliable digits (1 to 9) and therefore
-        after this has finnished if only one digit is avaliable, that digit has to
-        belong in the cell. This loops until no changes are made and hence all cells
-        which have the ability to be predetermined have been calculated and asigned.
-        """
-
-        numChanges = 1
-
-        while numChanges != 0:
-            numChanges = 0
-            for row in self.grid:
-                for numIndex in range(len(row)):
-                    avaliableDigits = [1, 2, 3, 4, 5, 6, 7, 8, 9]
-                    # remove all digits in row
-                    for digit in row:
-                        if digit != 0:
-                            avaliableDigits.remove(digit)
-                    # remove all digits in column
-                    for digit in self.getColumns()[numIndex]:
-                        if digit != 0 and digit in avaliableDigits:
-                            avaliableDigits.remove(digit)
-                    # remove all digits in square
-                    for digit in self.getSquares()[self.getSquareDigitIn(self.grid.index(row), numIndex)]:
-                        if digit != 0 and digit in avaliableDigits:
-                            avaliableDigits.remove(digit)
-
-                    if len(avaliableDigits) == 1 and row[numIndex] == 0:
-                        row[numIndex] = avaliableDigits[0]
-                        numChanges += 1
+        It does this by keeping a 9-bit mask of the digits in every row, column
+        and square, so the candidates of a cell are the digits in none of its
+        masks. Cells with only one candidate (naked singles) and digits which can
+        only go in one cell of a unit (hidden singles) are filled in, and if
+        nakedPairs is True, naked pairs are used to rule out candidates. This
+        loops until no changes are made, and the candidate masks of every cell
+        are left in the candidates attribute.
+
+        :param nakedPairs: If naked pairs are used to rule out candidates.
+        :type nakedPairs: bool
+        """
+        masks = self.getUsedMasks()
+        eliminated = [[0] * 9 for i in range(9)]
+
+        while True:
+            self.candidates = self.getCandidates(masks, eliminated)
+            if self.fillNakedSingles(masks) or self.fillHiddenSingles(masks):
+                continue
+            if nakedPairs and self.removeNakedPairs(eliminated):
+                continue
+            break
 
     def getSquareDigitIn(self, digitRIndex : int, digitCIndex : int) -> int:
         """
@@ -122,15 +427,7 @@ class Grid:
         :return : The index of the square the cell is in.
         :rtype: int
         """
-        squareNum = 0
-        for y in range(3):
-            for x in range(3):
-                for squareRow in range(y*3, (y+1)*3, 1):
-                    for i in range(x*3, (x+1)*3, 1):
-                        if i == digitCIndex and squareRow == digitRIndex:
-                            squareIndex = squareNum
-                squareNum += 1
-        return squareIndex
+        return CELL_BOX[digitRIndex][digitCIndex]
 
     def updateSquare(self, squareID : int, posID : int, value : int):
         """
@@ -144,14 +441,9 @@ class Grid:
         :param value: The value itself.
         :type value: int
         """
-        for y in range(3):
-            for x in range(3):
-                if (x+y) == squareID:
-                    for squareRow in range(y*3, (y+1)*3, 1):
-                        for i in range(x*3, (x+1)*3, 1):
-                            if (squareRow + i) == posID:
-                                self.grid[squareRow][i] = value
-                       
+        row, col = BOX_CELLS[squareID][posID]
+        self.grid[row][col] = value
+
     def getColumns(self) -> list[int]:
         """
         This function returns a list of all the columns.
@@ -159,13 +451,19 @@ class Grid:
         :return : A list of all columns.
         :rtype: list
         """
-        columns = []
-        for num in range(len(self.grid)):
-            column = []
-            for row in self.grid:
-                column.append(row[num])
-            columns.append(column)
-        return columns
+        return [self.getColumn(colIndex) for colIndex in range(9)]
+
+    def getColumn(self, colIndex : int) -> list[int]:
+        """
+        This function returns one column.
+
+        :param colIndex: The index of the column.
+        :type colIndex: int
+
+        :return : The values in the column.
+        :rtype: list
+        """
+        return [row[colIndex] for row in self.grid]
 
     def getSquares(self) -> list[int]:
         """
@@ -174,15 +472,58 @@ class Grid:
         :return : A list of all squares.
         :rtype: list
         """
-        squares = []
-        for y in range(3):
-            for x in range(3):
-                square = []
-                for squareRow in range(y*3, (y+1)*3, 1):
-                    for i in range(x*3, (x+1)*3, 1):
-                        square.append(self.grid[squareRow][i])
-                squares.append(square)
-        return squares
+        return [self.getSquare(squareID) for squareID in range(9)]
+
+    def getSquare(self, squareID : int) -> list[int]:
+        """
+        This function returns one subgrid (square).
+
+        :param squareID: The index of the square.
+        :type squareID: int
+
+        :return : The values in the square.
+        :rtype: list
+        """
+        return [self.grid[row][col] for row, col in BOX_CELLS[squareID]]
+
+    def countDigits(self) -> None:
+        """
+        This function counts the number of times each value occurs in every
+        row, column and square of the grid and stores them in rowCounts,
+        colCounts and boxCounts.
+        """
+        self.rowCounts = [[0] * 10 for i in range(9)]
+        self.colCounts = [[0] * 10 for i in range(9)]
+        self.boxCounts = [[0] * 10 for i in range(9)]
+        for rowIndex in range(9):
+            row = self.grid[rowIndex]
+            for colIndex in range(9):
+                value = row[colIndex]
+                self.rowCounts[rowIndex][value] += 1
+                self.colCounts[colIndex][value] += 1
+                self.boxCounts[CELL_BOX[rowIndex][colIndex]][value] += 1
+
+    def copyCounts(self, other) -> None:
+        """
+        This function sets the digit counts of this grid to a copy of those
+        of another grid.
+
+        :param other: The grid to copy the counts from.
+        :type other: Grid
+        """
+        self.rowCounts = [list(counts) for counts in other.rowCounts]
+        self.colCounts = [list(counts) for counts in other.colCounts]
+        self.boxCounts = [list(counts) for counts in other.boxCounts]
+
+    def toLine(self) -> str:
+        """
+        This function returns a grid as one line of 81 characters, with a '.'
+        for unknown values.
+
+        :return : The grid on one line.
+        :rtype: str
+        """
+        return "".join(str(value) if value != 0 else "." for row in self.grid for value in row)
 
     def toString(self) -> str:
         """
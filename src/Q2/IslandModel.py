@@ -0,0 +1,203 @@
+"""
+IslandModel.py
+=========================
+This module contains the IslandModel class which runs several populations
+of the evolutionary algorithm at once, one process (island) per core, and
+the runIsland function which is run by each island's process.
+"""
+
+import multiprocessing
+import os
+import queue
+import time
+
+from Grid import Grid
+from ArrayGenetic import ArrayGeneticAlg
+from ArrayFitnessFunc import ArrayFitnessFunc
+from UserInterface import UserInterface
+
+
+def runIsland(islandNum : int, settings : dict, initialGrid : Grid, inbox, outbox, stopEvent, messages) -> None:
+    """
+    This function runs the evolutionary algorithm on one island. The details of every
+    generation are put on the messages queue, and every migrationInterval generations
+    the best grids are sent to the next island and the latest grids received from the
+    previous island replace the worst grids. The island stops when any island has set
+    stopEvent (or the time budget has been used), and its result is put on the messages queue.
+
+    :param islandNum: The number of the island.
+    :type islandNum: int
+    :param settings: The parameters of the GA and the island model.
+    :type settings: dict
+    :param initialGrid: This is the starting Grid.
+    :type initialGrid: Grid
+    :param inbox: The end of the pipe grids are received from.
+    :type inbox: multiprocessing.connection.Connection
+    :param outbox: The end of the pipe grids are sent to, or None if there is only one island.
+    :type outbox: multiprocessing.connection.Connection
+    :param stopEvent: The event set when an island has solved the grid.
+    :type stopEvent: multiprocessing.Event
+    :param messages: The queue details and results are sent to the main process on.
+    :type messages: multiprocessing.Queue
+    """
+    seed = settings["seed"]
+    if seed != None:
+        seed += islandNum
+
+    genetic = ArrayGeneticAlg(settings["selectionRate"], settings["mutationProb"], settings["restartThreshold"],
+                              settings["maxRestarts"], ArrayFitnessFunc(), initialGrid, seed=seed)
+
+    startTime = time.perf_counter()
+
+    for details in genetic.evolve(genetic.getPopulation(settings["population"]), UserInterface()):
+        messages.put({"type": "generation", "island": islandNum, **details})
+
+        if details["bestFitness"] == 0:
+            stopEvent.set()
+        if stopEvent.is_set():
+            break
+        if settings["timeBudget"] != None and time.perf_counter() - startTime > settings["timeBudget"]:
+            break
+
+        if outbox != None and details["generation"] > 0 and details["generation"] % settings["migrationInterval"] == 0:
+            try:
+                outbox.send(genetic.getMigrants(genetic.population, settings["numMigrants"]))
+            except (BrokenPipeError, OSError):
+                # the next island has finished.
+                outbox = None
+
+            migrants = None
+            while inbox.poll():
+                migrants = inbox.recv()
+            if migrants != None:
+                genetic.addMigrants(genetic.population, migrants)
+
+    if genetic.solution != None:
+        messages.put({"type": "result", "island": islandNum, "solved": True, "grid": genetic.solution})
+    else:
+        messages.put({"type": "result", "island": islandNum, "solved": False, "grid": genetic.bestState})
+
+
+class IslandModel:
+    """
+    This class runs the evolutionary algorithm of ArrayGeneticAlg on several
+    independent populations (islands) at once, each in its own process. The
+    islands are joined in a ring by pipes, and every migrationInterval
+    generations each island sends its best grids to the next island, where
+    they replace the worst grids. As soon as any island solves the grid every
+    island stops.
+    """
+
+    """
+    The number of islands (processes) to run.
+    """
+    numIslands = None
+
+    """
+    The number of generations between migrations.
+    """
+    migrationInterval = None
+
+    """
+    The number of grids sent to the next island in each migration.
+    """
+    numMigrants = None
+
+    """
+    The parameters given to every island.
+    """
+    settings = None
+
+    """
+    The starting Grid.
+    """
+    initialGrid = None
+
+    def __init__(self, selectionRate : float, mutationProb : float, restartThreshold : int, maxRestarts : int, initialGrid : Grid,
+                 population : int, numIslands : int = None, migrationInterval : int = 10, numMigrants : int = 20, seed : int = None,
+                 timeBudget : float = None) -> None:
+        """
+        This is the initialiser for an IslandModel. The parameters of the GA are the same as for
+        a GeneticAlg (see Genetic.py for further details) and are used by every island.
+
+        :param population: The size of the population on each island.
+        :type population: int
+        :param numIslands: The number of islands, by default the number of cores.
+        :type numIslands: int
+        :param migrationInterval: The number of generations between migrations.
+        :type migrationInterval: int
+        :param numMigrants: The number of grids sent to the next island in each migration.
+        :type numMigrants: int
+        :param seed: The seed of the first island (each island adds its number to it), or None for random seeds.
+        :type seed: int
+        :param timeBudget: The number of seconds each island may run for, or None for no limit.
+        :type timeBudget: float
+        """
+        self.numIslands = numIslands if numIslands != None else (os.cpu_count() or 1)
+        self.migrationInterval = migrationInterval
+        self.numMigrants = numMigrants
+        self.initialGrid = initialGrid
+        self.settings = {
+            "selectionRate": selectionRate,
+            "mutationProb": mutationProb,
+            "restartThreshold": restartThreshold,
+            "maxRestarts": maxRestarts,
+            "population": population,
+            "migrationInterval": migrationInterval,
+            "numMigrants": numMigrants,
+            "seed": seed,
+            "timeBudget": timeBudget
+        }
+
+    def solve(self, ui : UserInterface) -> Grid:
+        """
+        This function runs every island until one solves the grid or all of them have
+        used their restarts, outputting the details of every generation of every island.
+
+        :param ui: This is the user interface object being used. (Must have a outputIslandDetails method).
+        :type ui: UserInterface
+
+        :return : The solution to the sodoku board (or the best grid found on any island).
+        :rtype: Grid
+        """
+        stopEvent = multiprocessing.Event()
+        messages = multiprocessing.Queue()
+        pipes = [multiprocessing.Pipe(duplex=False) for i in range(self.numIslands)]
+
+        processes = []
+        for islandNum in range(self.numIslands):
+            inbox = pipes[islandNum][0]
+            outbox = pipes[(islandNum + 1) % self.numIslands][1] if self.numIslands > 1 else None
+            process = multiprocessing.Process(target=runIsland, args=(islandNum, self.settings, self.initialGrid, inbox, outbox, stopEvent, messages))
+            process.start()
+            processes.append(process)
+
+        # only the islands should hold the pipes, so sends fail once an island has finished.
+        for receiver, sender in pipes:
+            receiver.close()
+            sender.close()
+
+        results = []
+        while len(results) < self.numIslands:
+            try:
+                message = messages.get(timeout=1)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes):
+                    ui.error("An island stopped without returning a result.")
+                continue
+
+            if message["type"] == "generation":
+                ui.outputIslandDetails(message["island"], message["restart"], message["generation"], message["bestFitness"], message["worstFitness"])
+            else:
+                results.append(message)
+
+        for process in processes:
+            process.join()
+
+        solved = [result for result in results if result["solved"]]
+        if solved:
+            ui.outputSolved()
+            return solved[0]["grid"]
+
+        ui.outputNotSolved()
+        return min((result["grid"] for result in results), key=lambda grid:grid.fitnessVal)
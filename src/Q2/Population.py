@@ -0,0 +1,72 @@
+"""
+Population.py
+==================
+This module contains the Population class which holds a whole population
+of Suduku grids as one NumPy array.
+"""
+
+import numpy as np
+
+from Grid import Grid
+
+class Population:
+    """
+    This class defines a Population, which holds every grid in one
+    contiguous (P, 9, 9) uint8 array along with a (P,) array of their
+    fitness values. Grid objects are only made when a single grid is
+    needed, such as the result or to show to the user.
+    """
+
+    """
+    The grids in the population as a (P, 9, 9) uint8 array.
+    """
+    grids = None
+
+    """
+    The fitness value of each grid as a (P,) array.
+    """
+    fitness = None
+
+    def __init__(self, grids : np.ndarray, fitness : np.ndarray) -> None:
+        """
+        This is the initialiser for a Population object.
+
+        :param grids: The grids as a (P, 9, 9) uint8 array.
+        :type grids: np.ndarray
+        :param fitness: The fitness value of each grid.
+        :type fitness: np.ndarray
+        """
+        self.grids = grids
+        self.fitness = fitness
+
+    def __len__(self) -> int:
+        """
+        This function returns the number of grids in the population.
+
+        :return : The size of the population.
+        :rtype: int
+        """
+        return self.grids.shape[0]
+
+    def sort(self) -> None:
+        """
+        This function sorts the population from the smallest (best) to the
+        largest fitness value, keeping the order of grids with the same value.
+        """
+        order = np.argsort(self.fitness, kind="stable")
+        self.grids = self.grids[order]
+        self.fitness = self.fitness[order]
+
+    def toGrid(self, index : int) -> Grid:
+        """
+        This function makes a Grid object from one grid in the population.
+
+        :param index: The index of the grid.
+        :type index: int
+
+        :return : The grid with its fitness value set.
+        :rtype: Grid
+        """
+        grid = Grid(self.grids[index].tolist())
+        grid.fitnessVal = int(self.fitness[index])
+        return grid
@@ -28,6 +28,15 @@ class UserInterface:
         """
         return input("Enter path to grid file: ")
 
+    def getSolverMode(self):
+        """
+        This function gets the identifier of the way the user wants to solve the grid.
+
+        :return : The identifier of the chosen mode.
+        :rtype: str
+        """
+        return input("Would you like to use the Evolutionary Algorithm (GA), the Exact Solver (EXACT) or the EA finished by the Exact Solver (HYBRID) :")
+
     def outputParameters(self, POPULATION : int, MUTATION_RATE : float, SELECTION_RATE : float, RESTART_THRESHOLD : int, MAX_RESTARTS : int):
         """
         This function is used to diplay the parameters for the Evolutionary Algorithm to the user.
@@ -80,6 +89,22 @@ class UserInterface:
         :type worstFitness: int"""
         print(f"Restart {restartNum} - Generation {genNum}: best fitness value = {bestFitness} | worst fitness value = {worstFitness}")
 
+    def outputIslandDetails(self, islandNum : int, restartNum : int, genNum : int, bestFitness : int, worstFitness : int):
+        """
+        This function is used to output the current generation of one island with its best and worst fitness values.
+
+        :param islandNum: The island the generation is on.
+        :type islandNum: int
+        :param restartNum: The restart currently on.
+        :type restartNum: int
+        :param genNum: The generation currently on.
+        :type genNum: int
+        :param bestFitness: The best fitness value in the current generation's population.
+        :type bestFitness: int
+        :param worstFitness: The worst fitness value in the current generation's population.
+        :type worstFitness: int"""
+        print(f"Island {islandNum} - Restart {restartNum} - Generation {genNum}: best fitness value = {bestFitness} | worst fitness value = {worstFitness}")
+
     def error(self, errorMsg : str):
         """
         This function alerts the user there has been an arror in the EA.
@@ -96,4 +121,22 @@ class UserInterface:
         """
         A function to alert the user the initial grid could not be solved with given parameters..
         """
-        print("The EA was Unsuccessful, the board has been not solved.\nThe resulting grid is the closest the EA came to solving.")
\ No newline at end of file
+        print("The EA was Unsuccessful, the board has been not solved.\nThe resulting grid is the closest the EA came to solving.")
+
+    def outputExactSolved(self):
+        """
+        A function to alert the user the grid has been solved by the exact solver.
+        """
+        print("The Exact Solver was Successful, the board has been solved.")
+
+    def outputExactNotSolved(self):
+        """
+        A function to alert the user the exact solver found the grid has no solution.
+        """
+        print("The Exact Solver was Unsuccessful, the board has no solution.")
+
+    def outputFinishing(self):
+        """
+        A function to alert the user the best grid found by the EA is being finished by the exact solver.
+        """
+        print("Finishing the closest grid with the Exact Solver.")
@@ -0,0 +1,257 @@
+"""
+batch.py
+====================
+This module contains the runner methods which solve every grid in a file
+(or stdin) at once, spread across a pool of worker processes. The file can
+hold grids in the .ss form and grids on one line as 81 characters (see
+Grid.iterFromLines), and it is streamed so only a few chunks of grids are
+held in memory at a time.
+
+A line of JSON is written for every grid, in the same order as the file:
+
+    python batch.py puzzles.txt --mode HYBRID --workers 8 --time-budget 30
+
+The GA parameters are set in the same way as for main.py (see Config.py).
+"""
+
+import argparse
+import json
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from Grid import Grid
+from ArrayGenetic import ArrayGeneticAlg
+from ArrayFitnessFunc import ArrayFitnessFunc
+from ExactSolver import ExactSolver
+from Config import Config, MODES
+from UserInterface import UserInterface
+
+"""
+The mode, GA parameters and time budget used by this worker
+process, set up once by initWorker.
+"""
+workerSettings = {}
+
+
+class SolveTimeout(Exception):
+    """
+    This exception is raised inside a worker when a grid
+    takes longer than the time budget to solve.
+    """
+    pass
+
+
+class QuietInterface(UserInterface):
+    """
+    This class is the user interface used by the workers, which
+    outputs nothing so the only output is the JSON lines.
+    """
+
+    def outputGenerationDetails(self, restartNum : int, genNum : int, bestFitness : int, worstFitness : int):
+        #Docstrings inherited from UserInterface
+        #See UserInterface.py for further details
+        pass
+
+    def outputSolved(self):
+        #Docstrings inherited from UserInterface
+        #See UserInterface.py for further details
+        pass
+
+    def outputNotSolved(self):
+        #Docstrings inherited from UserInterface
+        #See UserInterface.py for further details
+        pass
+
+    def outputExactSolved(self):
+        #Docstrings inherited from UserInterface
+        #See UserInterface.py for further details
+        pass
+
+    def outputExactNotSolved(self):
+        #Docstrings inherited from UserInterface
+        #See UserInterface.py for further details
+        pass
+
+
+def readChunks(lines, chunkSize : int):
+    """
+    This generator groups the grids read from the lines into lists of
+    chunkSize grids, so each worker is sent a chunk at a time. A malformed
+    grid is passed on as its error, so it gets its own result rather than
+    stopping the batch.
+
+    :param lines: The lines of the file.
+    :type lines: iterable
+    :param chunkSize: The number of grids in each chunk.
+    :type chunkSize: int
+
+    :return : The chunks of (index, line number, grid or error) tuples.
+    :rtype: generator
+    """
+    chunk = []
+    for index, (lineNum, grid) in enumerate(Grid.iterFromLines(lines, skipErrors=True)):
+        chunk.append((index, lineNum, grid))
+        if len(chunk) == chunkSize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def raiseTimeout(signum, frame):
+    """
+    This function is the alarm signal handler used to stop a solve.
+    """
+    raise SolveTimeout()
+
+
+def initWorker(config : Config) -> None:
+    """
+    This function sets up a worker process.
+
+    :param config: The mode, GA parameters, seed and time budget to use.
+    :type config: Config
+    """
+    workerSettings["config"] = config
+    signal.signal(signal.SIGALRM, raiseTimeout)
+
+
+def solveGrid(index : int, lineNum : int, grid : Grid) -> dict:
+    """
+    This function solves one grid in a worker process. The predeterminable values
+    are filled in first, and the GA is only run if any cells are left.
+
+    :param index: The position of the grid in the file.
+    :type index: int
+    :param lineNum: The line number the grid starts on.
+    :type lineNum: int
+    :param grid: The grid to solve, or the error if the grid was malformed.
+    :type grid: Grid
+
+    :return : The result of solving the grid.
+    :rtype: dict
+    """
+    if isinstance(grid, ValueError):
+        return {"index": index, "line": lineNum, "status": "error", "error": str(grid), "time": 0.0}
+
+    config = workerSettings["config"]
+    result = {"index": index, "line": lineNum, "grid": grid.toLine()}
+    startTime = time.perf_counter()
+    ui = QuietInterface()
+    genetic = None
+
+    try:
+        if config.timeBudget != None:
+            signal.setitimer(signal.ITIMER_REAL, config.timeBudget)
+
+        if config.propagate:
+            grid.fillPredetermined(nakedPairs=config.nakedPairs)
+
+        if config.mode == "EXACT":
+            solution = ExactSolver(grid).solve(ui)
+        elif grid.toLine().count(".") == 0:
+            solution = grid
+            solution.fitnessVal = ArrayFitnessFunc().evaluate(solution)
+        else:
+            seed = config.seed + index if config.seed != None else None
+            genetic = ArrayGeneticAlg(config.selectionRate, config.mutationRate, config.restartThreshold,
+                                      config.maxRestarts, ArrayFitnessFunc(), grid, seed=seed)
+            solution = genetic.solve(genetic.getPopulation(config.population), ui)
+
+            if config.mode == "HYBRID" and solution.fitnessVal != 0:
+                solution = ExactSolver(grid).solveFrom(solution, ui)
+
+        result["status"] = "solved" if solution.fitnessVal == 0 else "unsolved"
+        result["fitness"] = solution.fitnessVal
+        result["solution"] = solution.toLine()
+
+    except SolveTimeout:
+        result["status"] = "timeout"
+        if genetic != None and genetic.bestState != None:
+            result["fitness"] = genetic.bestState.fitnessVal
+            result["solution"] = genetic.bestState.toLine()
+    except Exception as error:
+        result["status"] = "error"
+        result["error"] = str(error)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+    if genetic != None:
+        result["restarts"] = genetic.restarts
+        result["generations"] = genetic.totalGenerations
+    result["time"] = time.perf_counter() - startTime
+    return result
+
+
+def solveChunk(chunk : list) -> list:
+    """
+    This function solves a chunk of grids in a worker process.
+
+    :param chunk: The (index, line number, grid or error) tuples of the grids.
+    :type chunk: list
+
+    :return : The result of each grid in the chunk.
+    :rtype: list
+    """
+    return [solveGrid(index, lineNum, grid) for index, lineNum, grid in chunk]
+
+
+def getArguments(args : list = None) -> argparse.Namespace:
+    """
+    This function reads the command line arguments.
+
+    :param args: The arguments, by default those given to the program.
+    :type args: list
+
+    :return : The parsed arguments.
+    :rtype: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description="Solve a file of Suduku grids in the .ss or 81 character form.")
+    parser.add_argument("grids", help="the file of grids, or '-' to read stdin")
+    parser.add_argument("--chunksize", type=int, default=16, help="the number of grids sent to a worker at once")
+    parser.add_argument("--output", default=None, help="the file to write the JSON lines to (default: stdout)")
+    Config.addArguments(parser)
+    return parser.parse_args(args)
+
+
+def run(arguments : argparse.Namespace) -> None:
+    """
+    This function solves every grid in the file across the worker pool and
+    writes the results as they finish, in the order of the file. Only a few
+    chunks per worker are read ahead.
+
+    :param arguments: The parsed arguments.
+    :type arguments: argparse.Namespace
+    """
+    config = Config.fromArguments(arguments)
+    config.mode = config.mode.upper() if config.mode != None else "HYBRID"
+    if config.mode not in MODES:
+        raise ValueError(f"Unknown mode '{config.mode}', expected one of {', '.join(MODES)}.")
+    workers = config.getWorkers()
+
+    lines = sys.stdin if arguments.grids == "-" else open(arguments.grids, "r")
+    output = open(arguments.output, "w") if arguments.output != None else sys.stdout
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=initWorker, initargs=(config,)) as executor:
+            pending = []
+            for chunk in readChunks(lines, arguments.chunksize):
+                pending.append(executor.submit(solveChunk, chunk))
+                if len(pending) >= workers * 2:
+                    for result in pending.pop(0).result():
+                        output.write(json.dumps(result) + "\n")
+            for future in pending:
+                for result in future.result():
+                    output.write(json.dumps(result) + "\n")
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+
+    run(getArguments())
@@ -1,42 +1,71 @@
 """
 main.py
 =========================
-This is the main file for solving a Soduku using a Evolutionary Algorithm.
+This is the main file for solving a Soduku using a Evolutionary Algorithm,
+an exact solver, or the Evolutionary Algorithm finished by the exact solver.
+
+The parameters of the Evolutionary Algorithm are read from the command line
+and (optionally) a profile file, see Config.py:
+
+    python main.py Grid1.ss --config profiles.toml --profile quick --seed 1
 """
+import argparse
+
 from Grid import Grid
-from Genetic import GeneticAlg
-from FitnessFunc import FitnessFunc
+from ArrayGenetic import ArrayGeneticAlg
+from ArrayFitnessFunc import ArrayFitnessFunc
+from IslandModel import IslandModel
+from ExactSolver import ExactSolver
+from Config import Config, MODES
 from UserInterface import UserInterface
 
 if __name__ == "__main__":
 
-    # define the constants.
-    POPULATION = 1000
-    MUTATION_RATE = 0.025
-    SELECTION_RATE = 0.2
-    RESTART_THRESHOLD = 50
-    MAX_RESTARTS = 5
+    # define the parameters.
+    parser = argparse.ArgumentParser(description="Solve a Suduku grid with an Evolutionary Algorithm.")
+    parser.add_argument("grid", nargs="?", default=None, help="the grid file (asked for if not given)")
+    Config.addArguments(parser)
+    arguments = parser.parse_args()
+    config = Config.fromArguments(arguments)
 
     ui = UserInterface()
 
-    # display constants.
-    ui.outputParameters(POPULATION, MUTATION_RATE, SELECTION_RATE, RESTART_THRESHOLD, MAX_RESTARTS)
+    # display parameters.
+    ui.outputParameters(config.population, config.mutationRate, config.selectionRate, config.restartThreshold, config.maxRestarts)
 
     # define initial board.
-    suduko = Grid.fromFileName(ui.getFileLoc())
+    suduko = Grid.fromFileName(arguments.grid if arguments.grid != None else ui.getFileLoc())
 
     ui.outputGrid(suduko, "Initial (No Changes)")
 
-    suduko.fillPredetermined()
+    if config.propagate:
+        suduko.fillPredetermined(nakedPairs=config.nakedPairs)
+
+        ui.outputGrid(suduko, "Initial (With Predetermined Values)")
+
+    mode = (config.mode if config.mode != None else ui.getSolverMode()).upper()
+
+    if mode not in MODES:
+        raise Exception("Error : Entered value does not relate to one of the given options.")
+
+    if mode == "EXACT":
+        result = ExactSolver(suduko).solve(ui)
 
-    ui.outputGrid(suduko, "Initial (With Predetermined Values)")
+    elif config.getWorkers() > 1:
+        # run one population per core.
+        islands = IslandModel(config.selectionRate, config.mutationRate, config.restartThreshold, config.maxRestarts, suduko, config.population,
+                              config.getWorkers(), config.migrationInterval, config.migrants, config.seed, config.timeBudget)
 
-    fitnessFunc = FitnessFunc()
+        result = islands.solve(ui)
+    else:
+        fitnessFunc = ArrayFitnessFunc()
 
-    genetic = GeneticAlg(SELECTION_RATE, MUTATION_RATE, RESTART_THRESHOLD, MAX_RESTARTS, fitnessFunc, suduko)
+        genetic = ArrayGeneticAlg(config.selectionRate, config.mutationRate, config.restartThreshold, config.maxRestarts, fitnessFunc, suduko, seed=config.seed)
 
-    population = genetic.getPopulation(POPULATION)
+        result = genetic.solve(genetic.getPopulation(config.population), ui, config.timeBudget)
 
-    result = genetic.solve(population, ui)
+    if mode == "HYBRID" and result.fitnessVal != 0:
+        ui.outputFinishing()
+        result = ExactSolver(suduko).solveFrom(result, ui)
 
     ui.outputGrid(result, "Resulting")
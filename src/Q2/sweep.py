@@ -0,0 +1,227 @@
+"""
+sweep.py
+====================
+This module contains the runner methods which tune the Evolutionary
+Algorithm by running every combination of a grid of parameter values on a
+set of grids (by default Grid1.ss to Grid3.ss) across a pool of worker
+processes. The values can come from a 'sweep' table in a profile:
+
+    [profiles.tuning.sweep]
+    population = [500, 1000]
+    mutationRate = [0.025, 0.1]
+
+or from the command line, where they are used over the profile:
+
+    python sweep.py --config profiles.toml --profile tuning --set maxRestarts=1,3 --repeats 3
+
+For every combination and grid the success rate, mean number of generations
+to solve and mean wall time are printed, and each run can also be written as
+a line of JSON.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from Grid import Grid
+from ArrayGenetic import ArrayGeneticAlg
+from ArrayFitnessFunc import ArrayFitnessFunc
+from Config import Config, FIELDS
+from batch import QuietInterface
+
+"""
+The grids swept over when none are given.
+"""
+defaultGrids = [os.path.join(os.path.dirname(os.path.abspath(__file__)), f"Grid{num}.ss") for num in range(1, 4)]
+
+
+def parseSetting(setting : str) -> tuple:
+    """
+    This function reads one --set option, of the form name=value1,value2,...
+
+    :param setting: The option.
+    :type setting: str
+
+    :return : The name of the parameter and its values.
+    :rtype: tuple
+    """
+    name, found, values = setting.partition("=")
+    if not found or name not in FIELDS:
+        raise ValueError(f"'{setting}' is not of the form name=value1,value2 for a parameter in {', '.join(FIELDS)}.")
+    fieldType = FIELDS[name][0]
+    if fieldType == bool:
+        return name, [value.strip().lower() == "true" for value in values.split(",")]
+    return name, [fieldType(value) for value in values.split(",")]
+
+
+def getCombinations(sweep : dict) -> list:
+    """
+    This function returns every combination of the values being swept.
+
+    :param sweep: The values of each parameter being swept, keyed by name.
+    :type sweep: dict
+
+    :return : The parameters of each combination.
+    :rtype: list
+    """
+    names = list(sweep)
+    return [dict(zip(names, values)) for values in itertools.product(*(sweep[name] for name in names))]
+
+
+def runCase(config : Config, gridFile : str, repeat : int) -> dict:
+    """
+    This function solves one grid with one combination of parameters in a worker process.
+
+    :param config: The parameters of the run.
+    :type config: Config
+    :param gridFile: The path to the grid.
+    :type gridFile: str
+    :param repeat: The number of the repeat, added to the seed.
+    :type repeat: int
+
+    :return : The result of the run.
+    :rtype: dict
+    """
+    seed = (config.seed if config.seed != None else 0) + repeat
+    startTime = time.perf_counter()
+
+    grid = Grid.fromFileName(gridFile)
+    if config.propagate:
+        grid.fillPredetermined(nakedPairs=config.nakedPairs)
+
+    genetic = ArrayGeneticAlg(config.selectionRate, config.mutationRate, config.restartThreshold,
+                              config.maxRestarts, ArrayFitnessFunc(), grid, seed=seed)
+    result = genetic.solve(genetic.getPopulation(config.population), QuietInterface(), config.timeBudget)
+
+    return {
+        "grid": os.path.basename(gridFile),
+        "seed": seed,
+        "solved": result.fitnessVal == 0,
+        "fitness": result.fitnessVal,
+        "generations": genetic.totalGenerations,
+        "restarts": genetic.restarts,
+        "time": time.perf_counter() - startTime
+    }
+
+
+def summarise(results : list, names : list) -> list:
+    """
+    This function groups the results by combination and grid and works out
+    the success rate and means of each group.
+
+    :param results: The result of every run.
+    :type results: list
+    :param names: The names of the parameters being swept.
+    :type names: list
+
+    :return : One row of the summary per group.
+    :rtype: list
+    """
+    groups = {}
+    for result in results:
+        key = tuple(result["parameters"][name] for name in names) + (result["grid"],)
+        groups.setdefault(key, []).append(result)
+
+    rows = []
+    for key, group in groups.items():
+        solved = [result for result in group if result["solved"]]
+        rows.append({
+            "parameters": dict(zip(names, key[:-1])),
+            "grid": key[-1],
+            "runs": len(group),
+            "successRate": len(solved) / len(group),
+            "meanGenerations": sum(result["generations"] for result in solved) / len(solved) if solved else None,
+            "meanTime": sum(result["time"] for result in group) / len(group)
+        })
+    return rows
+
+
+def printSummary(rows : list, names : list) -> None:
+    """
+    This function prints the summary as a table.
+
+    :param rows: The rows of the summary.
+    :type rows: list
+    :param names: The names of the parameters being swept.
+    :type names: list
+    """
+    widths = [max(len(name), 8) + 2 for name in names]
+    print("".join(f"{name:<{width}}" for name, width in zip(names, widths)) + f"{'grid':<10}{'runs':>6}{'success':>9}{'gens':>8}{'time (s)':>10}")
+    for row in rows:
+        generations = f"{row['meanGenerations']:.1f}" if row["meanGenerations"] != None else "-"
+        print("".join(f"{str(row['parameters'][name]):<{width}}" for name, width in zip(names, widths))
+              + f"{row['grid']:<10}{row['runs']:>6}{row['successRate']:>9.0%}{generations:>8}{row['meanTime']:>10.2f}")
+
+
+def getArguments(args : list = None) -> argparse.Namespace:
+    """
+    This function reads the command line arguments.
+
+    :param args: The arguments, by default those given to the program.
+    :type args: list
+
+    :return : The parsed arguments.
+    :rtype: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description="Run a grid of GA parameters over a set of Suduku grids.")
+    parser.add_argument("grids", nargs="*", default=defaultGrids, help="the grid files (default: Grid1.ss to Grid3.ss)")
+    parser.add_argument("--set", action="append", default=[], help="a parameter to sweep, as name=value1,value2,... (can be given more than once)")
+    parser.add_argument("--repeats", type=int, default=1, help="the number of runs (seeds) of each combination on each grid")
+    parser.add_argument("--output", default=None, help="the file to write the result of each run to as JSON lines")
+    Config.addArguments(parser)
+    return parser.parse_args(args)
+
+
+def run(arguments : argparse.Namespace) -> list:
+    """
+    This function runs every combination on every grid across the worker pool
+    and prints the summary.
+
+    :param arguments: The parsed arguments.
+    :type arguments: argparse.Namespace
+
+    :return : The rows of the summary.
+    :rtype: list
+    """
+    config = Config.fromArguments(arguments)
+
+    sweep = {}
+    if arguments.config != None:
+        sweep.update(Config.readProfile(arguments.config, arguments.profile).get("sweep", {}))
+    for setting in arguments.set:
+        name, values = parseSetting(setting)
+        sweep[name] = values
+    names = list(sweep)
+
+    cases = []
+    for parameters in getCombinations(sweep):
+        caseConfig = Config(**config.toDict())
+        caseConfig.update(parameters)
+        for gridFile in arguments.grids:
+            for repeat in range(arguments.repeats):
+                cases.append((parameters, caseConfig, gridFile, repeat))
+
+    results = []
+    with ProcessPoolExecutor(max_workers=config.getWorkers()) as executor:
+        futures = [executor.submit(runCase, caseConfig, gridFile, repeat) for parameters, caseConfig, gridFile, repeat in cases]
+        for (parameters, caseConfig, gridFile, repeat), future in zip(cases, futures):
+            result = future.result()
+            result["parameters"] = parameters
+            results.append(result)
+
+    if arguments.output != None:
+        with open(arguments.output, "w") as output:
+            for result in results:
+                output.write(json.dumps(result) + "\n")
+
+    rows = summarise(results, names)
+    printSummary(rows, names)
+    return rows
+
+
+if __name__ == "__main__":
+
+    run(getArguments())